@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                             QTableWidget, QTableWidgetItem, QProgressBar, QHeaderView)
+
+
+class ExportQueueDialog(QDialog):
+    """批量导出队列对话框，显示每个任务和整体的进度与吞吐量"""
+
+    STATUS_TEXT = {
+        'pending': '等待中',
+        'running': '导出中',
+        'done': '已完成',
+        'failed': '失败'
+    }
+
+    def __init__(self, export_queue, parent=None):
+        super().__init__(parent)
+        self.export_queue = export_queue
+        self.rows = {}  # {job_id: 行号}
+        self.setWindowTitle("导出队列")
+        self.resize(760, 360)
+
+        layout = QVBoxLayout(self)
+
+        # 任务表格
+        self.table = QTableWidget(0, 5)
+        self.table.setHorizontalHeaderLabels(["视频", "输出", "状态", "进度", "速度"])
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        layout.addWidget(self.table)
+
+        # 整体统计
+        self.summary_label = QLabel("队列空闲")
+        layout.addWidget(self.summary_label)
+
+        # 按钮区域
+        button_layout = QHBoxLayout()
+        self.start_button = QPushButton("开始导出")
+        self.start_button.clicked.connect(self.export_queue.start_processing)
+        self.retry_button = QPushButton("重试失败任务")
+        self.retry_button.clicked.connect(self.export_queue.retry_failed)
+        self.clear_button = QPushButton("清除已完成")
+        self.clear_button.clicked.connect(self.export_queue.clear_finished)
+        button_layout.addWidget(self.start_button)
+        button_layout.addWidget(self.retry_button)
+        button_layout.addWidget(self.clear_button)
+        layout.addLayout(button_layout)
+
+        # 连接队列信号
+        self.export_queue.job_added_signal.connect(self.add_job_row)
+        self.export_queue.job_updated_signal.connect(self.update_job_row)
+        self.export_queue.job_removed_signal.connect(self.remove_job_row)
+        self.export_queue.queue_stats_signal.connect(self.update_summary)
+
+        for job in self.export_queue.get_jobs():
+            self.add_job_row(job)
+
+    def add_job_row(self, job):
+        """添加任务行"""
+        row = self.table.rowCount()
+        self.table.insertRow(row)
+        self.rows[job['id']] = row
+        self.table.setItem(row, 0, QTableWidgetItem(os.path.basename(job['video_path'])))
+        self.table.setItem(row, 1, QTableWidgetItem(os.path.basename(job['output_path'])))
+        self.table.setItem(row, 2, QTableWidgetItem())
+        self.table.setItem(row, 4, QTableWidgetItem())
+        progress_bar = QProgressBar()
+        progress_bar.setRange(0, 100)
+        self.table.setCellWidget(row, 3, progress_bar)
+        self.update_job_row(job)
+
+    def update_job_row(self, job):
+        """更新任务行的状态、进度和速度"""
+        row = self.rows.get(job['id'])
+        if row is None:
+            return
+        status = self.STATUS_TEXT.get(job['status'], job['status'])
+        self.table.item(row, 2).setText(status)
+        self.table.item(row, 2).setToolTip(job.get('message', ''))
+        self.table.cellWidget(row, 3).setValue(int(job['percent']))
+
+        speed_text = ""
+        if job['status'] == 'running' and job['speed'] > 0:
+            speed_text = f"{job['speed']:.1f}x"
+            if job['eta'] >= 0:
+                speed_text += f" 剩余 {int(job['eta'])}s"
+        elif job['status'] == 'done' and job['elapsed'] > 0:
+            speed_text = f"{job['throughput']:.1f}x 用时 {int(job['elapsed'])}s"
+        self.table.item(row, 4).setText(speed_text)
+
+    def remove_job_row(self, job_id):
+        """移除任务行，并更新后续行号"""
+        row = self.rows.pop(job_id, None)
+        if row is None:
+            return
+        self.table.removeRow(row)
+        for other_id, other_row in self.rows.items():
+            if other_row > row:
+                self.rows[other_id] = other_row - 1
+
+    def update_summary(self, stats):
+        """更新整体统计"""
+        self.summary_label.setText(
+            f"共 {stats['total']} 个任务，完成 {stats['done']}，失败 {stats['failed']}，"
+            f"进行中 {stats['running']} | 整体进度 {stats['percent']}% | "
+            f"吞吐量 {stats['throughput']:.1f}x 实时 | 已用时 {int(stats['elapsed'])}s"
+        )
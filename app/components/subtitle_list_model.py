@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex
+
+
+class SubtitleListModel(QAbstractListModel):
+    """字幕列表模型
+
+    行文本在视图需要显示时才生成；过滤使用预先计算的小写文本，
+    在上一次过滤结果上继续输入时只在已匹配的行中查找。
+    """
+
+    # 行对应的字幕下标
+    SubtitleIndexRole = Qt.ItemDataRole.UserRole + 1
+
+    def __init__(self, format_time, parent=None):
+        """初始化
+
+        Args:
+            format_time: 时间格式化函数（毫秒转字符串）
+        """
+        super().__init__(parent)
+        self.format_time = format_time
+        self.subtitles = []
+        self.lower_texts = []  # 每条字幕的小写文本，用于过滤
+        self.rows = []  # 当前显示的行对应的字幕下标
+        self.filter_text = ""
+
+    def set_subtitles(self, subtitles, filter_text=""):
+        """字幕数据变化后重建模型"""
+        self.beginResetModel()
+        self.subtitles = subtitles or []
+        self.lower_texts = [subtitle.get('text', '').lower() for subtitle in self.subtitles]
+        self.filter_text = filter_text.lower()
+        self.rows = self._match(range(len(self.subtitles)), self.filter_text)
+        self.endResetModel()
+
+    def set_filter(self, filter_text):
+        """按关键词过滤（不区分大小写）"""
+        filter_text = filter_text.lower()
+        if filter_text == self.filter_text:
+            return
+        # 关键词变长时结果只会更少，只需在当前结果中查找
+        candidates = self.rows if self.filter_text and self.filter_text in filter_text else range(len(self.subtitles))
+        self.beginResetModel()
+        self.rows = self._match(candidates, filter_text)
+        self.filter_text = filter_text
+        self.endResetModel()
+
+    def _match(self, candidates, filter_text):
+        if not filter_text:
+            return list(candidates)
+        lower_texts = self.lower_texts
+        return [i for i in candidates if filter_text in lower_texts[i]]
+
+    def subtitle_index(self, row):
+        """行对应的字幕下标，行无效时返回-1"""
+        return self.rows[row] if 0 <= row < len(self.rows) else -1
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.rows):
+            return None
+        subtitle_index = self.rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            subtitle = self.subtitles[subtitle_index]
+            start_str = self.format_time(int(subtitle.get('start_time', 0)))
+            end_str = self.format_time(int(subtitle.get('end_time', 0)))
+            return f"[{start_str} - {end_str}] {subtitle.get('text', '')}"
+        if role == self.SubtitleIndexRole:
+            return subtitle_index
+        return None
@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel
+from PyQt6.QtCore import Qt, QPoint
+
+
+class ThumbnailPreview(QWidget):
+    """悬停预览浮窗：显示缩略图和时间"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent, Qt.WindowType.ToolTip | Qt.WindowType.FramelessWindowHint)
+        self.setAttribute(Qt.WidgetAttribute.WA_ShowWithoutActivating)
+        self.setStyleSheet("background-color: #222; color: white;")
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(2, 2, 2, 2)
+        layout.setSpacing(2)
+
+        self.image_label = QLabel()
+        self.time_label = QLabel()
+        self.time_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(self.image_label)
+        layout.addWidget(self.time_label)
+
+    def show_preview(self, pixmap, time_text, global_pos):
+        """在全局坐标 global_pos 上方居中显示预览"""
+        if pixmap is None:
+            self.hide()
+            return
+        self.image_label.setPixmap(pixmap)
+        self.time_label.setText(time_text)
+        self.adjustSize()
+        self.move(global_pos - QPoint(self.width() // 2, self.height() + 8))
+        self.show()
@@ -0,0 +1,303 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from bisect import bisect_left, bisect_right
+from PyQt6.QtWidgets import QWidget, QSizePolicy
+from PyQt6.QtCore import Qt, pyqtSignal, QRectF, QPointF
+from PyQt6.QtGui import QPainter, QColor, QPen, QFontMetrics
+
+
+class TimelineWidget(QWidget):
+    """时间轴控件：显示波形、字幕、逐字边界和删除标记
+
+    所有数据保存为按时间排序的数组，绘制时只通过二分查找取可见范围内的条目；
+    缩小到条目比像素还密时，按像素列聚合绘制，绘制开销只与控件宽度有关。
+    """
+
+    # 自定义信号
+    seek_requested = pyqtSignal(int)  # 点击时间轴请求跳转（毫秒）
+
+    # 行布局（像素）
+    RULER_HEIGHT = 16
+    WAVEFORM_HEIGHT = 48
+    CUE_HEIGHT = 22
+    WORD_HEIGHT = 18
+
+    # 单个条目平均宽度小于该像素数时改为聚合绘制
+    MIN_ITEM_PIXELS = 3
+    # 缩放范围（每像素毫秒数）
+    MIN_MS_PER_PIXEL = 1.0
+    MAX_MS_PER_PIXEL = 60000.0
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMinimumHeight(self.RULER_HEIGHT + self.WAVEFORM_HEIGHT + self.CUE_HEIGHT + self.WORD_HEIGHT)
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+        self.setMouseTracking(True)
+
+        self.duration = 0
+        self.position = 0
+        self.view_start = 0.0  # 可见范围起点（毫秒）
+        self.ms_per_pixel = 100.0  # 缩放比例
+
+        # 字幕：按开始时间排序的数组
+        self.cue_starts = []
+        self.cue_ends = []
+        self.cue_ends_sorted = []  # 字幕可能重叠，结束时间单独排序后用于聚合绘制
+        self.cue_texts = []
+        self.max_cue_duration = 0
+        # 逐字时间戳
+        self.word_starts = []
+        self.word_ends = []
+        self.word_texts = []
+        # 删除片段（已合并、已排序）
+        self.delete_starts = []
+        self.delete_ends = []
+        # 波形（WaveformPeaks）
+        self.waveform = None
+
+        self.colors = {
+            'background': QColor('#1e2430'),
+            'ruler': QColor('#8a93a6'),
+            'waveform': QColor('#4f8fd6'),
+            'cue': QColor('#3a6ea5'),
+            'cue_border': QColor('#6fa3d8'),
+            'word': QColor('#5a667d'),
+            'text': QColor('#ffffff'),
+            'deleted': QColor(255, 80, 80, 110),
+            'playhead': QColor('#ffcc00')
+        }
+
+    # ---- 数据设置 ----
+
+    def set_duration(self, duration):
+        """设置媒体总时长（毫秒），首次设置时缩放到显示全部"""
+        first_time = self.duration == 0
+        self.duration = max(0, int(duration))
+        if first_time and self.duration and self.width() > 0:
+            self.ms_per_pixel = self._clamp_zoom(self.duration / self.width())
+        self._clamp_view()
+        self.update()
+
+    def set_cues(self, subtitles):
+        """设置字幕列表（字典列表，包含 start_time/end_time/text）"""
+        cues = sorted((subtitle.get('start_time', 0), subtitle.get('end_time', 0), subtitle.get('text', ''))
+                      for subtitle in (subtitles or []))
+        self.cue_starts = [cue[0] for cue in cues]
+        self.cue_ends = [cue[1] for cue in cues]
+        self.cue_ends_sorted = sorted(self.cue_ends)
+        self.cue_texts = [cue[2] for cue in cues]
+        self.max_cue_duration = max((end - start for start, end, _ in cues), default=0)
+        self.update()
+
+    def set_words(self, words_timestamps):
+        """设置逐字时间戳（字典列表，包含 word/start/end）"""
+        words = words_timestamps or []
+        self.word_starts = [word['start'] for word in words]
+        self.word_ends = [word['end'] for word in words]
+        self.word_texts = [word['word'] for word in words]
+        self.update()
+
+    def set_deletions(self, segments):
+        """设置删除片段，格式为[(start_time, end_time), ...]（已合并排序）"""
+        self.delete_starts = [start for start, _ in segments or []]
+        self.delete_ends = [end for _, end in segments or []]
+        self.update()
+
+    def set_waveform(self, waveform):
+        """设置波形数据（WaveformPeaks），为None时不显示波形"""
+        self.waveform = waveform
+        self.update()
+
+    def set_position(self, position):
+        """更新播放头位置，播放头移出可见范围时自动翻页"""
+        position = int(position)
+        if position == self.position:
+            return
+        old_x = self._time_to_x(self.position)
+        self.position = position
+
+        view_end = self.view_start + self.width() * self.ms_per_pixel
+        if not (self.view_start <= position < view_end):
+            self.view_start = position - self.width() * self.ms_per_pixel * 0.1
+            self._clamp_view()
+            self.update()
+            return
+
+        # 只重绘新旧播放头所在的窄条
+        new_x = self._time_to_x(position)
+        self.update(int(min(old_x, new_x)) - 2, 0, int(abs(new_x - old_x)) + 5, self.height())
+
+    # ---- 坐标换算 ----
+
+    def _time_to_x(self, time_ms):
+        return (time_ms - self.view_start) / self.ms_per_pixel
+
+    def _x_to_time(self, x):
+        return self.view_start + x * self.ms_per_pixel
+
+    def _clamp_zoom(self, ms_per_pixel):
+        return min(max(ms_per_pixel, self.MIN_MS_PER_PIXEL), self.MAX_MS_PER_PIXEL)
+
+    def _clamp_view(self):
+        max_start = max(0.0, self.duration - self.width() * self.ms_per_pixel)
+        self.view_start = min(max(self.view_start, 0.0), max_start)
+
+    # ---- 交互 ----
+
+    def wheelEvent(self, event):
+        """滚轮平移，Ctrl+滚轮以鼠标位置为中心缩放"""
+        delta = event.angleDelta().y()
+        if event.modifiers() & Qt.KeyboardModifier.ControlModifier:
+            anchor_x = event.position().x()
+            anchor_time = self._x_to_time(anchor_x)
+            factor = 0.8 if delta > 0 else 1.25
+            self.ms_per_pixel = self._clamp_zoom(self.ms_per_pixel * factor)
+            self.view_start = anchor_time - anchor_x * self.ms_per_pixel
+        else:
+            self.view_start -= delta / 120 * self.width() * self.ms_per_pixel * 0.1
+        self._clamp_view()
+        self.update()
+        event.accept()
+
+    def mousePressEvent(self, event):
+        """点击跳转"""
+        if event.button() == Qt.MouseButton.LeftButton and self.duration:
+            time_ms = int(min(max(self._x_to_time(event.position().x()), 0), self.duration))
+            self.seek_requested.emit(time_ms)
+
+    def resizeEvent(self, event):
+        self._clamp_view()
+        super().resizeEvent(event)
+
+    # ---- 绘制 ----
+
+    def paintEvent(self, event):
+        """只绘制可见范围内的条目"""
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), self.colors['background'])
+        if not self.duration:
+            return
+
+        width = self.width()
+        view_end = self._x_to_time(width)
+
+        y = 0
+        self._paint_ruler(painter, y, view_end)
+        y += self.RULER_HEIGHT
+        self._paint_waveform(painter, y, view_end)
+        y += self.WAVEFORM_HEIGHT
+        self._paint_items(painter, y, self.CUE_HEIGHT, view_end, self.cue_starts, self.cue_ends,
+                          self.cue_ends_sorted, self.cue_texts, self.colors['cue'], self.max_cue_duration)
+        y += self.CUE_HEIGHT
+        self._paint_items(painter, y, self.WORD_HEIGHT, view_end, self.word_starts, self.word_ends,
+                          self.word_ends, self.word_texts, self.colors['word'], 0)
+
+        self._paint_deletions(painter, view_end)
+
+        # 播放头
+        x = self._time_to_x(self.position)
+        painter.setPen(QPen(self.colors['playhead'], 1))
+        painter.drawLine(QPointF(x, 0), QPointF(x, self.height()))
+
+    def _paint_ruler(self, painter, y, view_end):
+        """刻度尺：根据缩放选择刻度间隔，保证刻度间距不小于约80像素"""
+        step = 1000
+        for candidate in (100, 500, 1000, 5000, 10000, 30000, 60000, 300000, 600000, 1800000, 3600000):
+            step = candidate
+            if candidate / self.ms_per_pixel >= 80:
+                break
+
+        painter.setPen(self.colors['ruler'])
+        tick = int(self.view_start // step) * step
+        while tick <= view_end:
+            x = self._time_to_x(tick)
+            painter.drawLine(QPointF(x, y + self.RULER_HEIGHT - 5), QPointF(x, y + self.RULER_HEIGHT))
+            painter.drawText(QPointF(x + 2, y + 11), self._format_tick(tick, step))
+            tick += step
+
+    def _format_tick(self, time_ms, step):
+        seconds, ms = divmod(int(time_ms), 1000)
+        minutes, seconds = divmod(seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+        text = f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes:02d}:{seconds:02d}"
+        if step < 1000:
+            text += f".{ms // 100}"
+        return text
+
+    def _paint_waveform(self, painter, y, view_end):
+        """波形：每个像素列一条 min-max 竖线"""
+        if self.waveform is None:
+            return
+        width = self.width()
+        mins, maxs = self.waveform.query(self.view_start, view_end, width)
+        center = y + self.WAVEFORM_HEIGHT / 2
+        half = self.WAVEFORM_HEIGHT / 2 - 1
+        painter.setPen(self.colors['waveform'])
+        for x in range(width):
+            if mins[x] or maxs[x]:
+                painter.drawLine(QPointF(x, center - maxs[x] * half), QPointF(x, center - mins[x] * half))
+
+    def _paint_items(self, painter, y, height, view_end, starts, ends, sorted_ends, texts, color, max_duration):
+        """绘制一行条目（字幕或逐字），条目过密时按像素列聚合
+
+        ends 与 starts 一一对应，sorted_ends 为升序排列的结束时间（条目互不重叠时即 ends）
+        """
+        if not starts:
+            return
+
+        # 可见条目范围：开始时间早于可见起点减去最长条目时长的条目不可能可见
+        first = bisect_left(starts, self.view_start - max_duration) if max_duration else \
+            max(0, bisect_right(starts, self.view_start) - 1)
+        last = bisect_right(starts, view_end)
+        visible_count = last - first
+        width = self.width()
+
+        if visible_count * self.MIN_ITEM_PIXELS > width:
+            self._paint_density(painter, y, height, starts, sorted_ends, color)
+            return
+
+        metrics = QFontMetrics(painter.font())
+        for i in range(first, last):
+            if ends[i] < self.view_start:
+                continue
+            x1 = self._time_to_x(starts[i])
+            x2 = self._time_to_x(ends[i])
+            rect = QRectF(x1, y + 1, max(1.0, x2 - x1 - 1), height - 2)
+            painter.fillRect(rect, color)
+
+            # 足够宽时才绘制文字
+            if rect.width() > 12 and texts[i].strip():
+                painter.setPen(self.colors['text'])
+                text = metrics.elidedText(texts[i], Qt.TextElideMode.ElideRight, int(rect.width()) - 4)
+                painter.drawText(rect.adjusted(2, 0, -2, 0),
+                                 Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft, text)
+
+    def _paint_density(self, painter, y, height, starts, sorted_ends, color):
+        """聚合绘制：每个像素列只判断是否有条目覆盖（两次二分查找，starts 和 sorted_ends 均为升序）"""
+        painter.setPen(color)
+        run_start = None
+        for x in range(self.width() + 1):
+            covered = False
+            if x < self.width():
+                col_start = self._x_to_time(x)
+                col_end = col_start + self.ms_per_pixel
+                # 开始早于列尾的条目数 - 结束不晚于列首的条目数 = 与该列相交的条目数（条目重叠时同样成立）
+                covered = bisect_left(starts, col_end) - bisect_right(sorted_ends, col_start) > 0
+            if covered and run_start is None:
+                run_start = x
+            elif not covered and run_start is not None:
+                painter.fillRect(QRectF(run_start, y + 1, x - run_start, height - 2), color)
+                run_start = None
+
+    def _paint_deletions(self, painter, view_end):
+        """删除片段覆盖在所有行上方"""
+        if not self.delete_starts:
+            return
+        first = bisect_left(self.delete_ends, self.view_start)
+        last = bisect_right(self.delete_starts, view_end)
+        top = self.RULER_HEIGHT
+        for i in range(first, last):
+            x1 = self._time_to_x(self.delete_starts[i])
+            x2 = self._time_to_x(self.delete_ends[i])
+            painter.fillRect(QRectF(x1, top, max(1.0, x2 - x1), self.height() - top), self.colors['deleted'])
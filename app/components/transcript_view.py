@@ -0,0 +1,325 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import math
+from bisect import bisect_right
+from collections import OrderedDict
+from itertools import accumulate
+from PyQt6.QtWidgets import QAbstractScrollArea
+from PyQt6.QtCore import Qt, pyqtSignal, QRectF
+from PyQt6.QtGui import QPainter, QColor, QFontMetrics
+from app.config import Config
+from app.utils.word_offset_index import WordOffsetIndex
+from app.utils.interval_set import IntervalSet
+
+
+class TranscriptView(QAbstractScrollArea):
+    """虚拟化逐字稿视图：用于很长的逐字稿
+
+    逐字稿按句子分段，只对可见范围内的段落排版和绘制；未排版的段落高度按字数估算，
+    排版结果按段落缓存且数量有上限，内存和每帧绘制开销与逐字稿长度无关。
+    选择以字下标记录，可以跨越多屏。
+    """
+
+    # 自定义信号
+    selection_finished = pyqtSignal(int, int)  # 拖动选择结束，选中的字下标范围 [first, last)
+    word_clicked = pyqtSignal(int)  # 单击某个字（字下标）
+
+    # 句末标点，遇到时分段
+    SENTENCE_ENDINGS = set('。！？!?；;')
+    PADDING = 6
+    PARAGRAPH_SPACING = 8
+    LINE_SPACING = 4
+    # 最多缓存的段落排版数
+    MAX_CACHED_LAYOUTS = 300
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
+        self.viewport().setCursor(Qt.CursorShape.IBeamCursor)
+
+        self.words = []
+        self.word_index = WordOffsetIndex([])
+        self.word_starts = []  # 每个字的开始时间，用于定位播放头所在的字
+        self.marked_indices = IntervalSet()
+
+        # 段落：paragraph_starts[p] 为第 p 段第一个字的下标，最后一项为字总数
+        self.paragraph_starts = [0]
+        self.heights = []  # 每段高度（已排版为实际值，否则为估算值）
+        self.tops = [0]  # 每段顶部位置（heights 的前缀和）
+        self.tops_dirty = False
+        self.layouts = OrderedDict()  # {段落下标: [[(字下标, x, 宽度), ...], ...]}
+        self.layout_width = 0
+
+        # 选择与播放头
+        self.anchor_word = -1
+        self.cursor_word = -1
+        self.dragging = False
+        self.current_word = -1
+        self.follow_playhead = True
+
+        self.colors = {
+            'marked': QColor('#ffcccc'),
+            'current': QColor('#ffe08a'),
+            'selection': self.palette().highlight().color(),
+            'selection_text': self.palette().highlightedText().color(),
+            'text': self.palette().text().color()
+        }
+
+    # ---- 数据设置 ----
+
+    def set_words(self, words, marked_indices):
+        """设置逐字稿和标记（标记区间集合只保存引用，变化后调用 refresh_marks）"""
+        self.words = words or []
+        self.word_index = WordOffsetIndex(self.words)
+        self.word_starts = [word['start'] for word in self.words]
+        self.marked_indices = marked_indices
+
+        # 按句末标点或段落最大字数分段
+        max_chars = Config.TRANSCRIPT['paragraph_max_chars']
+        self.paragraph_starts = [0]
+        paragraph_chars = 0
+        for i, word in enumerate(self.words):
+            text = word['word']
+            paragraph_chars += len(text)
+            if (text and text[-1] in self.SENTENCE_ENDINGS) or paragraph_chars >= max_chars:
+                self.paragraph_starts.append(i + 1)
+                paragraph_chars = 0
+        if self.paragraph_starts[-1] != len(self.words):
+            self.paragraph_starts.append(len(self.words))
+
+        self.anchor_word = self.cursor_word = self.current_word = -1
+        self._reset_layouts()
+        self.verticalScrollBar().setValue(0)
+
+    def refresh_marks(self):
+        """标记变化后重绘"""
+        self.viewport().update()
+
+    def selection_range(self):
+        """当前选中的字下标范围 (first, last)，没有选择时返回None"""
+        if self.anchor_word < 0 or self.cursor_word < 0:
+            return None
+        return min(self.anchor_word, self.cursor_word), max(self.anchor_word, self.cursor_word) + 1
+
+    def clear_selection(self):
+        """清除选择"""
+        self.anchor_word = self.cursor_word = -1
+        self.viewport().update()
+
+    def set_position(self, position):
+        """高亮播放头所在的字，必要时滚动到该字"""
+        index = bisect_right(self.word_starts, position) - 1
+        if index == self.current_word:
+            return
+        self.current_word = index
+        if index >= 0 and self.follow_playhead and not self.dragging:
+            self.ensure_word_visible(index)
+        self.viewport().update()
+
+    def ensure_word_visible(self, index):
+        """滚动使第 index 个字可见"""
+        paragraph = self._paragraph_of(index)
+        lines = self._layout(paragraph)
+        line_number = next((n for n, line in enumerate(lines) if line and line[-1][0] >= index), 0)
+        y = self._tops()[paragraph] + line_number * self._line_height()
+        scroll_bar = self.verticalScrollBar()
+        view_height = self.viewport().height()
+        if y < scroll_bar.value() or y + self._line_height() > scroll_bar.value() + view_height:
+            scroll_bar.setValue(int(y - view_height / 3))
+
+    # ---- 排版 ----
+
+    def _line_height(self):
+        return self.fontMetrics().height() + self.LINE_SPACING
+
+    def _text_width(self):
+        return max(1, self.viewport().width() - 2 * self.PADDING)
+
+    def _paragraph_count(self):
+        return len(self.paragraph_starts) - 1
+
+    def _paragraph_of(self, word):
+        return min(max(bisect_right(self.paragraph_starts, word) - 1, 0), max(self._paragraph_count() - 1, 0))
+
+    def _reset_layouts(self):
+        """清空排版缓存并按字数估算每段高度"""
+        self.layouts.clear()
+        self.layout_width = self._text_width()
+        metrics = self.fontMetrics()
+        char_width = max(metrics.horizontalAdvance('中'), 1)
+        chars_per_line = max(1, self.layout_width // char_width)
+        line_height = self._line_height()
+        offsets = self.word_index.offsets
+        self.heights = []
+        for p in range(self._paragraph_count()):
+            chars = offsets[self.paragraph_starts[p + 1]] - offsets[self.paragraph_starts[p]]
+            lines = max(1, math.ceil(chars / chars_per_line))
+            self.heights.append(lines * line_height + self.PARAGRAPH_SPACING)
+        self.tops_dirty = True
+        self._update_scrollbar()
+
+    def _layout(self, paragraph):
+        """排版一段（按字换行），结果缓存；实际高度与估算不同时更新段落高度"""
+        lines = self.layouts.get(paragraph)
+        if lines is not None:
+            self.layouts.move_to_end(paragraph)
+            return lines
+
+        metrics = QFontMetrics(self.font())
+        width = self.layout_width
+        lines = []
+        line = []
+        x = 0
+        for i in range(self.paragraph_starts[paragraph], self.paragraph_starts[paragraph + 1]):
+            word_width = metrics.horizontalAdvance(self.words[i]['word'])
+            if line and x + word_width > width:
+                lines.append(line)
+                line = []
+                x = 0
+            line.append((i, x, word_width))
+            x += word_width
+        lines.append(line)
+
+        self.layouts[paragraph] = lines
+        if len(self.layouts) > self.MAX_CACHED_LAYOUTS:
+            self.layouts.popitem(last=False)
+
+        height = len(lines) * self._line_height() + self.PARAGRAPH_SPACING
+        if height != self.heights[paragraph]:
+            self.heights[paragraph] = height
+            self.tops_dirty = True
+        return lines
+
+    def _tops(self):
+        """每段顶部位置，段落高度变化后重新计算前缀和"""
+        if self.tops_dirty:
+            self.tops = [0] + list(accumulate(self.heights))
+            self.tops_dirty = False
+        return self.tops
+
+    def _update_scrollbar(self):
+        tops = self._tops()
+        view_height = self.viewport().height()
+        scroll_bar = self.verticalScrollBar()
+        scroll_bar.setRange(0, max(0, tops[-1] + 2 * self.PADDING - view_height))
+        scroll_bar.setPageStep(view_height)
+        scroll_bar.setSingleStep(self._line_height())
+
+    # ---- 命中测试 ----
+
+    def _word_at(self, pos):
+        """视口坐标处的字下标（超出范围时取最近的字），没有字时返回-1"""
+        if not self.words:
+            return -1
+        tops = self._tops()
+        y = self.verticalScrollBar().value() + pos.y() - self.PADDING
+        paragraph = min(max(bisect_right(tops, y) - 1, 0), self._paragraph_count() - 1)
+        lines = self._layout(paragraph)
+        line_number = min(max(int((y - tops[paragraph]) // self._line_height()), 0), len(lines) - 1)
+        line = lines[line_number]
+        if not line:
+            return self.paragraph_starts[paragraph]
+        x = pos.x() - self.PADDING
+        for index, word_x, word_width in line:
+            if x < word_x + word_width:
+                return index
+        return line[-1][0]
+
+    # ---- 交互 ----
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton:
+            self.anchor_word = self.cursor_word = self._word_at(event.position())
+            self.dragging = True
+            self.viewport().update()
+
+    def mouseMoveEvent(self, event):
+        if not self.dragging:
+            return
+        pos = event.position()
+        # 拖出视口时自动滚动，实现跨屏选择
+        scroll_bar = self.verticalScrollBar()
+        if pos.y() < 0:
+            scroll_bar.setValue(scroll_bar.value() - self._line_height())
+        elif pos.y() > self.viewport().height():
+            scroll_bar.setValue(scroll_bar.value() + self._line_height())
+        self.cursor_word = self._word_at(pos)
+        self.viewport().update()
+
+    def mouseReleaseEvent(self, event):
+        if event.button() != Qt.MouseButton.LeftButton or not self.dragging:
+            return
+        self.dragging = False
+        if self.anchor_word < 0:
+            return
+        if self.anchor_word == self.cursor_word:
+            index = self.anchor_word
+            self.clear_selection()
+            self.word_clicked.emit(index)
+        else:
+            first, last = self.selection_range()
+            self.selection_finished.emit(first, last)
+
+    def keyPressEvent(self, event):
+        if event.key() == Qt.Key.Key_Escape:
+            self.clear_selection()
+        else:
+            super().keyPressEvent(event)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        # 宽度变化时重新排版，高度变化只需更新滚动条
+        if self._text_width() != self.layout_width:
+            self._reset_layouts()
+        else:
+            self._update_scrollbar()
+
+    def scrollContentsBy(self, dx, dy):
+        self.viewport().update()
+
+    # ---- 绘制 ----
+
+    def paintEvent(self, event):
+        """只排版和绘制可见段落"""
+        painter = QPainter(self.viewport())
+        if not self.words:
+            return
+
+        view_top = self.verticalScrollBar().value()
+        view_height = self.viewport().height()
+        line_height = self._line_height()
+        selection = self.selection_range() or (-1, -1)
+
+        normal_font = self.font()
+        marked_font = self.font()
+        marked_font.setStrikeOut(True)
+
+        tops = self._tops()
+        paragraph = min(max(bisect_right(tops, view_top - self.PADDING) - 1, 0), self._paragraph_count() - 1)
+        y = tops[paragraph] - view_top + self.PADDING
+        while paragraph < self._paragraph_count() and y < view_height:
+            lines = self._layout(paragraph)
+            for line in lines:
+                if y + line_height >= 0:
+                    for index, x, width in line:
+                        rect = QRectF(self.PADDING + x, y, width, line_height)
+                        selected = selection[0] <= index < selection[1]
+                        marked = index in self.marked_indices
+                        if selected:
+                            painter.fillRect(rect, self.colors['selection'])
+                        elif index == self.current_word:
+                            painter.fillRect(rect, self.colors['current'])
+                        elif marked:
+                            painter.fillRect(rect, self.colors['marked'])
+                        painter.setFont(marked_font if marked else normal_font)
+                        painter.setPen(self.colors['selection_text'] if selected else self.colors['text'])
+                        painter.drawText(rect, Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft,
+                                         self.words[index]['word'])
+                y += line_height
+            y += self.PARAGRAPH_SPACING
+            paragraph += 1
+
+        # 本次排版修正了段落高度时同步滚动条范围
+        if self.tops_dirty:
+            self._update_scrollbar()
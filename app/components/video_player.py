@@ -1,18 +1,26 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+from bisect import bisect_right
+from collections import OrderedDict
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
                             QSlider, QLabel, QStyle, QSizePolicy, QFrame)
-from PyQt6.QtCore import Qt, QUrl, pyqtSignal, QTime, QTimer
+from PyQt6.QtCore import Qt, QUrl, pyqtSignal, QTime, QTimer, QEvent
 from PyQt6.QtMultimedia import QMediaPlayer, QAudioOutput
 from PyQt6.QtMultimediaWidgets import QVideoWidget
-from PyQt6.QtGui import QFont, QColor, QPainter, QTextDocument
+from PyQt6.QtGui import QFont, QColor, QPainter, QTextDocument, QPixmap
+from app.components.thumbnail_preview import ThumbnailPreview
+from app.utils.subtitle_track import SubtitleTrack
 
 
 class VideoPlayer(QWidget):
+    # 最多缓存的字幕渲染结果数
+    MAX_CACHED_SUBTITLES = 32
+
     # 自定义信号
     position_changed = pyqtSignal(int)  # 播放位置变化信号
     state_changed = pyqtSignal(bool)    # 播放状态变化信号
+    preview_finished = pyqtSignal()     # 跳过删除片段的预览结束（播放完毕或被停止）
     
     def __init__(self):
         """初始化视频播放器"""
@@ -24,6 +32,7 @@ class VideoPlayer(QWidget):
         self.audio_output.setVolume(0.7)  # 设置默认音量为70%
         
         self.media_path = None
+        self.playback_path = None  # 实际播放的文件（原始文件或代理文件）
         self.duration = 0
         
         # 字幕相关属性
@@ -31,8 +40,31 @@ class VideoPlayer(QWidget):
         self.subtitle_font = QFont("Arial", 16)
         self.subtitle_color = QColor(255, 255, 255)  # 白色
         self.subtitle_background = QColor(0, 0, 0, 128)  # 半透明黑色
+        self.subtitle_cache = OrderedDict()  # {(文本, 宽度, 屏幕像素比): 字幕QPixmap}，字体或颜色变化时清空
         self.subtitle_position = Qt.AlignmentFlag.AlignBottom | Qt.AlignmentFlag.AlignHCenter
         
+        # 缩略图悬停预览（不经过播放器解码）
+        self.thumbnails = None
+        self.thumbnail_preview = ThumbnailPreview(self)
+        
+        # 跳过删除片段的预览：单次定时器在播放头到达下一个删除片段时触发，空闲时不占用CPU
+        self.preview_active = False
+        self.preview_starts = []
+        self.preview_ends = []
+        self.preview_window = (0, -1)  # 定时器按此范围安排，位置离开该范围（跳转）时重新安排
+        self.preview_timer = QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.preview_timer.timeout.connect(self._on_preview_timer)
+        
+        # 字幕显示：单次定时器在下一个字幕边界（开始或结束）触发，只在边界处更新字幕
+        self.cue_track = SubtitleTrack()
+        self.cue_window = (0, -1)  # 当前字幕保持不变的时间范围 [开始, 下一边界)
+        self.cue_timer = QTimer(self)
+        self.cue_timer.setSingleShot(True)
+        self.cue_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.cue_timer.timeout.connect(self.refresh_cues)
+        
         # 设置界面
         self.setup_ui()
         
@@ -80,6 +112,8 @@ class VideoPlayer(QWidget):
         # 进度条
         self.position_slider = QSlider(Qt.Orientation.Horizontal)
         self.position_slider.setRange(0, 0)
+        self.position_slider.setMouseTracking(True)
+        self.position_slider.installEventFilter(self)
         time_slider_layout.addWidget(self.position_slider)
         
         # 总时长标签
@@ -138,6 +172,16 @@ class VideoPlayer(QWidget):
         # 连接媒体状态变化信号
         self.media_player.mediaStatusChanged.connect(self.handle_media_status)
         
+        # 预览时播放状态、位置和速率变化后重新安排跳转
+        self.media_player.playbackStateChanged.connect(self._schedule_preview_skip)
+        self.media_player.positionChanged.connect(self._on_preview_position)
+        self.media_player.playbackRateChanged.connect(self._schedule_preview_skip)
+        
+        # 播放状态或速率变化后重新计算字幕边界，跳转到当前字幕范围之外时立即更新
+        self.media_player.playbackStateChanged.connect(self.refresh_cues)
+        self.media_player.playbackRateChanged.connect(self.refresh_cues)
+        self.media_player.positionChanged.connect(self._on_cue_position)
+        
         # 连接按钮动作
         self.play_button.clicked.connect(self.toggle_play)
         # self.stop_button.clicked.connect(self.stop)  # 移除这一行
@@ -145,6 +189,35 @@ class VideoPlayer(QWidget):
         self.volume_slider.sliderMoved.connect(self.set_volume)
         self.volume_button.clicked.connect(self.toggle_mute)
 
+    def set_thumbnails(self, thumbnails):
+        """设置缩略图精灵图（ThumbnailSprites），为None时关闭悬停预览"""
+        self.thumbnails = thumbnails
+        self.thumbnail_preview.hide()
+        
+    def show_thumbnail(self, position_ms, global_pos):
+        """在指定位置显示某时间点的缩略图"""
+        if not self.thumbnails:
+            return
+        pixmap = self.thumbnails.get_thumbnail(position_ms)
+        self.thumbnail_preview.show_preview(pixmap, self.format_time(int(position_ms)), global_pos)
+        
+    def hide_thumbnail(self):
+        """隐藏缩略图预览"""
+        self.thumbnail_preview.hide()
+        
+    def eventFilter(self, obj, event):
+        """进度条悬停时显示对应时间的缩略图"""
+        if obj is self.position_slider and self.thumbnails:
+            if event.type() == QEvent.Type.MouseMove:
+                slider = self.position_slider
+                x = int(event.position().x())
+                position = QStyle.sliderValueFromPosition(slider.minimum(), slider.maximum(),
+                                                          x, slider.width())
+                self.show_thumbnail(position, slider.mapToGlobal(event.position().toPoint()))
+            elif event.type() == QEvent.Type.Leave:
+                self.hide_thumbnail()
+        return super().eventFilter(obj, event)
+
     def handle_error(self, error):
         """处理播放器错误"""
         if error != QMediaPlayer.Error.NoError:
@@ -170,6 +243,8 @@ class VideoPlayer(QWidget):
                 self.audio_output = QAudioOutput()
                 self.media_player.setAudioOutput(self.audio_output)
                 self.audio_output.setVolume(0.7)
+        elif status == QMediaPlayer.MediaStatus.EndOfMedia:
+            self.stop_preview()
         elif status == QMediaPlayer.MediaStatus.InvalidMedia:
             print("无效的媒体文件")
         elif status == QMediaPlayer.MediaStatus.NoMedia:
@@ -183,10 +258,17 @@ class VideoPlayer(QWidget):
             # 尝试连接视频输出的信号
             pass
         
-    def set_media(self, file_path):
-        """加载媒体文件"""
+    def set_media(self, file_path, playback_path=None):
+        """加载媒体文件
+        
+        Args:
+            file_path: 原始媒体路径
+            playback_path: 实际用于播放的文件（如低分辨率代理），默认播放原始文件
+        """
         self.media_path = file_path
-        self.media_player.setSource(QUrl.fromLocalFile(file_path))
+        self.playback_path = playback_path or file_path
+        self.set_thumbnails(None)
+        self.media_player.setSource(QUrl.fromLocalFile(self.playback_path))
         
         # 重置进度条
         self.position_slider.setValue(0)
@@ -194,8 +276,22 @@ class VideoPlayer(QWidget):
         
         self.stop()
         
+    def set_playback_source(self, playback_path):
+        """切换实际播放的文件（原始文件与代理文件时间轴一致），保持播放位置和状态"""
+        if not self.media_path or playback_path == self.playback_path:
+            return
+        
+        position = self.media_player.position()
+        was_playing = self.media_player.playbackState() == QMediaPlayer.PlaybackState.PlayingState
+        
+        self.playback_path = playback_path
+        self.media_player.setSource(QUrl.fromLocalFile(playback_path))
+        self.media_player.setPosition(position)
+        if was_playing:
+            self.media_player.play()
+        
     def get_media_path(self):
-        """获取当前媒体路径"""
+        """获取当前原始媒体路径"""
         return self.media_path
     
     def has_media(self):
@@ -250,6 +346,7 @@ class VideoPlayer(QWidget):
         
     def stop(self):
         """停止播放"""
+        self.stop_preview()
         self.media_player.stop()
         
     def set_position(self, position):
@@ -269,10 +366,110 @@ class VideoPlayer(QWidget):
     
     def get_position(self):
         """获取当前播放位置（毫秒）"""
-        position = self.media_player.position()
-        self.position_changed.emit(position)
-        return position
+        return self.media_player.position()
+    
+    def start_preview(self, delete_segments, start_position=0):
+        """从指定位置开始预览剪辑效果，播放到删除片段时直接跳过
         
+        Args:
+            delete_segments: 需要跳过的时间段列表，格式为[(start_time, end_time), ...]（已合并排序）
+            start_position: 开始预览的位置（毫秒）
+        """
+        if not self.has_media():
+            return
+        self.preview_starts = [int(start) for start, _ in delete_segments]
+        self.preview_ends = [int(end) for _, end in delete_segments]
+        self.preview_active = True
+        self.media_player.setPosition(self._skip_deleted(int(start_position)))
+        self.play()
+        self._schedule_preview_skip()
+    
+    def stop_preview(self):
+        """停止预览"""
+        if not self.preview_active:
+            return
+        self.preview_active = False
+        self.preview_timer.stop()
+        self.media_player.pause()
+        self.preview_finished.emit()
+    
+    def is_previewing(self):
+        """是否正在预览"""
+        return self.preview_active
+    
+    def _skip_deleted(self, position):
+        """位置落在删除片段内时返回该片段的结束位置，否则原样返回"""
+        i = bisect_right(self.preview_starts, position) - 1
+        if i >= 0 and position < self.preview_ends[i]:
+            return self.preview_ends[i]
+        return position
+    
+    def _schedule_preview_skip(self, *args):
+        """按当前位置重新安排跳转定时器（播放状态或速率变化时调用）"""
+        self._arm_preview_timer(self.media_player.position())
+    
+    def _arm_preview_timer(self, position):
+        """按播放速率计算从 position 到达下一个删除片段的时间，启动单次定时器"""
+        self.preview_timer.stop()
+        self.preview_window = (0, -1)
+        if not self.preview_active or not self.media_player.isPlaying():
+            return
+        i = bisect_right(self.preview_starts, position)
+        if i >= len(self.preview_starts):
+            self.preview_window = (position, float('inf'))
+            return  # 后面没有删除片段，播放到结尾即可
+        self.preview_window = (position, self.preview_starts[i])
+        rate = self.media_player.playbackRate() or 1.0
+        self.preview_timer.start(max(0, int((self.preview_starts[i] - position) / rate)))
+    
+    def _on_preview_timer(self):
+        """定时器到期：已到达删除片段则跳过，否则（播放卡顿等）重新安排"""
+        if not self.preview_active:
+            return
+        position = self.media_player.position()
+        target = self._skip_deleted(position)
+        if target != position:
+            self.media_player.setPosition(target)
+        self._arm_preview_timer(target)
+    
+    def _on_preview_position(self, position):
+        """位置离开定时器安排的范围（拖动进度条等跳转）时重新安排，落在删除片段内时立即跳过"""
+        if not self.preview_active:
+            return
+        start, end = self.preview_window
+        if start <= position < end:
+            return
+        target = self._skip_deleted(position)
+        if target != position:
+            self.media_player.setPosition(target)
+        self._arm_preview_timer(target)
+        
+    def set_cue_track(self, cue_track):
+        """设置字幕索引（只保存引用，字幕或偏移变化后调用 refresh_cues）"""
+        self.cue_track = cue_track or SubtitleTrack()
+        self.refresh_cues()
+    
+    def refresh_cues(self, *args):
+        """按当前位置更新字幕，并把定时器设到下一个字幕边界"""
+        self.cue_timer.stop()
+        position = self.media_player.position()
+        text = self.cue_track.active_text(position)
+        if text != self.current_subtitle:
+            self.set_subtitle(text)
+        
+        boundary = self.cue_track.next_boundary(position)
+        self.cue_window = (position, boundary if boundary is not None else float('inf'))
+        if boundary is not None and self.media_player.isPlaying():
+            rate = self.media_player.playbackRate() or 1.0
+            # 定时器早于播放位置到达时会再次触发，直到越过边界
+            self.cue_timer.start(max(1, int((boundary - position) / rate)))
+    
+    def _on_cue_position(self, position):
+        """位置离开当前字幕范围（跳转或定时器滞后）时立即更新"""
+        start, end = self.cue_window
+        if not start <= position < end:
+            self.refresh_cues()
+    
     def set_volume(self, volume):
         """设置音量"""
         self.audio_output.setVolume(volume / 100.0)
@@ -366,26 +563,55 @@ class VideoPlayer(QWidget):
         return 0
 
     def paintEvent(self, event):
-        """重写绘制事件以显示字幕"""
+        """重写绘制事件以显示字幕（字幕渲染结果已缓存，重绘时直接绘制）"""
         if self.current_subtitle:
-            painter = QPainter(self)
-            doc = QTextDocument()
-            doc.setDefaultFont(self.subtitle_font)
-            
-            # 设置字幕样式，使用类属性而不是硬编码颜色
-            color_str = f"rgb({self.subtitle_color.red()},{self.subtitle_color.green()},{self.subtitle_color.blue()})"
-            bg_color_str = f"rgba({self.subtitle_background.red()},{self.subtitle_background.green()},{self.subtitle_background.blue()},{self.subtitle_background.alpha()/255})"
-            html = f'<div style="color: {color_str}; background-color: {bg_color_str}; padding: 5px;">{self.current_subtitle}</div>'
-            doc.setHtml(html)
-            
+            pixmap = self._subtitle_pixmap(self.current_subtitle)
+            size = pixmap.deviceIndependentSize()
+
             # 计算字幕位置
-            x = (self.width() - doc.size().width()) / 2
-            y = self.height() - doc.size().height() - 20  # 距离底部20像素
-            
+            x = (self.width() - size.width()) / 2
+            y = self.height() - size.height() - 20  # 距离底部20像素
+
             # 绘制字幕
-            painter.translate(x, y)
-            doc.drawContents(painter)
-            
+            painter = QPainter(self)
+            painter.drawPixmap(int(x), int(y), pixmap)
+
+    def _subtitle_pixmap(self, text):
+        """取缓存的字幕渲染结果，没有时排版并渲染一次"""
+        # 窗口移到像素比不同的屏幕时重新渲染
+        ratio = self.devicePixelRatioF()
+        key = (text, self.width(), ratio)
+        pixmap = self.subtitle_cache.get(key)
+        if pixmap is not None:
+            self.subtitle_cache.move_to_end(key)
+            return pixmap
+
+        doc = QTextDocument()
+        doc.setDefaultFont(self.subtitle_font)
+
+        # 设置字幕样式，使用类属性而不是硬编码颜色
+        color_str = f"rgb({self.subtitle_color.red()},{self.subtitle_color.green()},{self.subtitle_color.blue()})"
+        bg_color_str = f"rgba({self.subtitle_background.red()},{self.subtitle_background.green()},{self.subtitle_background.blue()},{self.subtitle_background.alpha()/255})"
+        html = f'<div style="color: {color_str}; background-color: {bg_color_str}; padding: 5px;">{text}</div>'
+        doc.setHtml(html)
+        # 超过窗口宽度时换行
+        if doc.size().width() > self.width() > 0:
+            doc.setTextWidth(self.width())
+
+        # 按屏幕像素比渲染，高分屏上不模糊
+        size = doc.size()
+        pixmap = QPixmap(max(1, round(size.width() * ratio)), max(1, round(size.height() * ratio)))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        doc.drawContents(painter)
+        painter.end()
+
+        self.subtitle_cache[key] = pixmap
+        if len(self.subtitle_cache) > self.MAX_CACHED_SUBTITLES:
+            self.subtitle_cache.popitem(last=False)
+        return pixmap
+
     def set_subtitle(self, text):
         """设置当前字幕文本"""
         self.current_subtitle = text
@@ -394,14 +620,17 @@ class VideoPlayer(QWidget):
     def set_subtitle_font(self, font):
         """设置字幕字体"""
         self.subtitle_font = font
+        self.subtitle_cache.clear()
         self.update()
-        
+
     def set_subtitle_color(self, color):
         """设置字幕颜色"""
         self.subtitle_color = color
+        self.subtitle_cache.clear()
         self.update()
         
     def set_subtitle_background(self, color):
         """设置字幕背景颜色"""
         self.subtitle_background = color
+        self.subtitle_cache.clear()
         self.update()
\ No newline at end of file
@@ -14,15 +14,140 @@ class Config:
         "spk_model": "damo/speech_campplus_sv_zh-cn_16k-common"
     }
     
+    # 转录输出配置（SRT和逐字稿保存在媒体目录的 srt 子目录下）
+    ASR_OUTPUT = {
+        "save_raw_result": False  # 同时保存模型原始结果（<名称>.raw.json.gz，用于调试）
+    }
+    
     # 模型缓存目录
     MODEL_CACHE_DIR = "funasr_model"
     
+    # 缓存目录（相对项目根目录），代理、波形等缓存放在其子目录中
+    CACHE_DIR = "cache"
+    
+    # 代理文件配置：高分辨率视频播放时使用低分辨率短GOP代理，导出仍使用原始文件
+    PROXY = {
+        "enabled": True,
+        "min_source_height": 1080,  # 高于该分辨率的视频生成代理
+        "heavy_codecs": ["hevc", "av1", "vp9", "prores"],  # 解码开销大的编码也生成代理
+        "height": 540,  # 代理分辨率高度
+        "gop": 10,  # 关键帧间隔（帧）
+        "crf": 28
+    }
+    
+    # 波形配置：解码为单声道低采样率后计算多级峰值
+    WAVEFORM = {
+        "sample_rate": 8000,
+        "samples_per_peak": 64,  # 第0层每个峰值对应的采样数（8ms）
+        "level_factor": 4  # 相邻两层的倍数
+    }
+    
+    # 缩略图配置：每个文件一次解码生成精灵图，用于进度条和字幕列表的悬停预览
+    THUMBNAILS = {
+        "interval_sec": 2,  # 缩略图间隔（秒）
+        "width": 160,  # 缩略图宽度
+        "columns": 10,  # 每张精灵图的列数
+        "rows": 10,  # 每张精灵图的行数
+        "keyframes_only": True,  # 只解码关键帧，速度更快
+        "max_cache_mb": 500  # 缩略图缓存上限，超出时删除最久未使用的
+    }
+    
+    # 保留片段渲染缓存：重新导出时复用边界未变的片段
+    SEGMENT_CACHE = {
+        "enabled": True,
+        "max_cache_mb": 4096  # 片段缓存上限，超出时删除最久未使用的
+    }
+    
+    # 逐字稿编辑配置
+    TRANSCRIPT = {
+        "virtualize_threshold": 50000,  # 逐字稿字数达到该值时使用只绘制可见段落的虚拟化视图
+        "paragraph_max_chars": 200  # 虚拟化视图中没有句末标点时的段落最大字数
+    }
+    
+    # 撤销/重做配置
+    EDIT_HISTORY = {
+        "max_entries": 10000  # 最多保留的撤销记录数（每条只保存变化量）
+    }
+
+    # 工程文件：字幕、逐字稿、删除标记和设置保存在一个二进制文件中，SRT/JSON只作为导出文件
+    PROJECT = {
+        "enabled": True,
+        "extension": ".scproj",  # 保存在媒体目录的 srt 子目录下
+        "autosave_delay_ms": 2000  # 停止编辑后多久自动保存
+    }
+
+    # 剪辑计划优化：渲染前减少剪切点
+    PLAN_OPTIMIZER = {
+        "enabled": True,
+        "merge_gap_ms": 100,  # 间隔不超过该值的删除片段合并为一个
+        "min_keep_ms": 0,  # 短于该值的保留片段并入相邻删除片段（会删掉这部分内容），0表示不处理
+        "snap_to_keyframes": False,  # 将保留片段开始吸附到附近的关键帧（需要一次关键帧探测）
+        "keyframe_tolerance_ms": 200  # 吸附关键帧的最大偏移
+    }
+    
     # 视频播放器配置
     VIDEO_PLAYER = {
         "min_width": 640,
         "min_height": 360
     }
     
+    # 视频导出配置
+    EXPORT = {
+        "max_concurrency": 0,  # 同时导出的任务数上限，0表示根据CPU核数和磁盘自动计算
+        "jobs_per_disk": 2,  # 每个输出磁盘同时写入的任务数（-c copy 导出主要受磁盘限制）
+        "queue_state_file": "export_queue.json",  # 导出队列状态文件（相对项目根目录）
+        "mux_subtitles": True,  # 导出视频时将重新计时的字幕封装为软字幕轨（同时总会输出SRT文件）
+        "default_profiles": ["1080p", "720p", "audio"]  # 多版本导出默认使用的配置
+    }
+    
+    # 多版本导出配置：一次解码同时输出多个版本，每个版本单独设置编码参数
+    # height 为 None 表示只输出音频；输出文件名为 <输出名><suffix><ext>
+    EXPORT_PROFILES = {
+        "1080p": {
+            "suffix": "_1080p",
+            "ext": ".mp4",
+            "height": 1080,
+            "video": ["-c:v", "libx264", "-preset", "medium", "-crf", "20"],
+            "audio": ["-c:a", "aac", "-b:a", "192k"]
+        },
+        "720p": {
+            "suffix": "_720p",
+            "ext": ".mp4",
+            "height": 720,
+            "video": ["-c:v", "libx264", "-preset", "medium", "-crf", "23"],
+            "audio": ["-c:a", "aac", "-b:a", "128k"]
+        },
+        "audio": {
+            "suffix": "_audio",
+            "ext": ".m4a",
+            "height": None,
+            "audio": ["-c:a", "aac", "-b:a", "192k"]
+        }
+    }
+    
+    # 按字幕导出独立片段配置
+    CLIP_EXPORT = {
+        "max_workers": 0,  # 并行提取的片段数，0表示取CPU核数的一半
+        "pad_ms": 0,  # 每个片段前后额外保留的时长（毫秒）
+        "max_name_chars": 30,  # 文件名中字幕文本的最大字数
+        # 视频片段编码参数，默认直接复制；需要精确切点时改为如 ["-c:v", "libx264", "-c:a", "aac"]
+        "codec_args": ["-c", "copy"]
+    }
+    
+    # 音频导出配置
+    AUDIO_EXPORT = {
+        "fade_ms": 10,  # 剪切点淡入淡出时长（毫秒），0表示不加淡变
+        "chunk_size": 256 * 1024,  # 每次读取的PCM字节数
+        # 按输出扩展名选择编码器参数
+        "codecs": {
+            ".wav": ["-c:a", "pcm_s16le"],
+            ".flac": ["-c:a", "flac"],
+            ".mp3": ["-c:a", "libmp3lame", "-q:a", "2"],
+            ".m4a": ["-c:a", "aac", "-b:a", "192k"],
+            ".aac": ["-c:a", "aac", "-b:a", "192k"]
+        }
+    }
+    
     # 主窗口配置
     MAIN_WINDOW = {
         "title": "视频字幕剪辑工具",
@@ -3,35 +3,85 @@
 
 import os
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                            QPushButton, QListWidget, QLabel, QFileDialog, 
-                            QSplitter,  QTabWidget, QTextEdit, QApplication,
+                            QPushButton, QListWidget, QListView, QAbstractItemView, QLabel, QFileDialog, 
+                            QSplitter,  QTabWidget, QTextEdit,
                             QMessageBox, QDialog, QLineEdit,
                             QFontComboBox, QSpinBox, QColorDialog,QMenu)
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QColor, QTextCharFormat, QTextCursor
+from PyQt6.QtCore import Qt, QEvent, QTimer
+from PyQt6.QtGui import QColor, QTextCharFormat, QTextCursor, QCursor, QShortcut, QKeySequence
 from app.components.video_player import VideoPlayer
 from app.utils.asr_transcribe import ASRTranscribeThread
 from app.utils.model_loader_task import ModelLoadThread
 from app.utils.batch_transcribe_queue import BatchTranscribeQueue
+from app.utils.batch_export_queue import BatchExportQueue
 from app.components.progress_dialog import ProgressDialog
+from app.components.export_queue_dialog import ExportQueueDialog
+from app.components.timeline_widget import TimelineWidget
+from app.components.transcript_view import TranscriptView
+from app.components.subtitle_list_model import SubtitleListModel
 from app.utils.logger import setup_logger
 from app.utils.event_bus import event_bus
 from app.utils.video_processor import VideoProcessor
+from app.utils.proxy_generator import ProxyGenerateThread, find_proxy
+from app.utils.thumbnail_cache import ThumbnailExtractThread, ThumbnailSprites
+from app.utils.waveform import WaveformLoadThread
+from app.utils.clip_exporter import ClipExportThread
+from app.utils.plan_optimizer import merge_segments
+from app.utils.subtitle_track import SubtitleTrack
+from app.utils.word_offset_index import WordOffsetIndex
+from app.utils.interval_set import IntervalSet
+from app.utils.edit_history import EditHistory, MARK, SUBTITLES, OFFSET
+from app.utils.subtitle_io import get_transcription_paths, read_srt, read_words
+from app.utils.project_file import ProjectData, ProjectFileError, get_project_path, read_project, write_project
+from app.config import Config
 import json
 class MainWindow(QMainWindow):
     """主窗口类"""
     
+    # 导出文件类型，音频格式只导出音频
+    EXPORT_FILE_FILTER = "MP4文件 (*.mp4);;WAV音频 (*.wav);;FLAC音频 (*.flac);;MP3音频 (*.mp3);;AAC音频 (*.m4a)"
+    
     def __init__(self):
         super().__init__()
         self.logger = setup_logger(__name__)
         self.media_path = None
         self.subtitles = None
         self.current_highlighted_index = -1
-        self.marked_indices = {}  # 存储被标记的字的下标
+        self.marked_indices = IntervalSet()  # 被标记删除的字下标（区间集合）
+        self.merged_segments_cache = None  # (缓存键, 合并后的删除时间段)
+        self.word_index = None  # 逐字稿字符位置索引（WordOffsetIndex）
+        self.text_editor = None  # 逐字稿编辑器（QTextEdit）
+        self.transcript_view = None  # 长逐字稿使用的虚拟化视图（TranscriptView）
         self.words_timestamps = None
         self.asr = None
         self.asr_loaded = False  # 新增标志位
         self.batch_queue = BatchTranscribeQueue()  # 批量转录队列
+        self.export_queue = BatchExportQueue()  # 批量导出队列
+        self.export_queue_dialog = None
+        self.proxy_threads = {}  # 正在生成代理的线程 {原始路径: ProxyGenerateThread}
+        self.thumbnail_threads = {}  # 正在生成缩略图的线程 {原始路径: ThumbnailExtractThread}
+        self.waveform_threads = {}  # 正在计算波形的线程 {原始路径: WaveformLoadThread}
+        self.clip_export_thread = None  # 按字幕导出独立片段的线程
+        self.subtitle_track = SubtitleTrack()  # 播放时查找当前字幕的索引
+        # 时间偏移先只作用于索引，停止调整后再一次性写回字幕并刷新列表
+        self.offset_commit_timer = QTimer(self)
+        self.offset_commit_timer.setSingleShot(True)
+        self.offset_commit_timer.setInterval(300)
+        self.offset_commit_timer.timeout.connect(self.commit_subtitle_offset)
+        
+        # 撤销/重做：标记、合并、分割和时间偏移
+        self.edit_history = EditHistory()
+        QShortcut(QKeySequence.StandardKey.Undo, self, self.undo_edit)
+        QShortcut(QKeySequence("Ctrl+Shift+Z"), self, self.redo_edit)
+        
+        # 工程文件：修改后延迟自动保存，切换媒体和关闭窗口时立即保存
+        self.project_media_path = None  # 内存中的字幕、逐字稿和标记所属的媒体
+        self.project_dirty = False
+        self.project_save_timer = QTimer(self)
+        self.project_save_timer.setSingleShot(True)
+        self.project_save_timer.setInterval(Config.PROJECT['autosave_delay_ms'])
+        self.project_save_timer.timeout.connect(self.save_project)
+        self.export_profiles = list(Config.EXPORT['default_profiles'])  # 多版本导出使用的配置
         self.setup_ui()
         
     def setup_ui(self):
@@ -69,6 +119,15 @@ class MainWindow(QMainWindow):
         self.video_player.setMinimumSize(640, 360)  # 确保视频播放器有足够大的尺寸
         self.left_layout.addWidget(self.video_player)
         
+        # 时间轴
+        self.timeline = TimelineWidget()
+        self.timeline.seek_requested.connect(self.video_player.set_position)
+        self.video_player.position_changed.connect(self.timeline.set_position)
+        self.video_player.preview_finished.connect(self.on_preview_finished)
+        self.video_player.set_cue_track(self.subtitle_track)
+        self.video_player.media_player.durationChanged.connect(self.timeline.set_duration)
+        self.left_layout.addWidget(self.timeline)
+        
         
         # 添加字幕样式设置面板
         self.setup_subtitle_style_controls()
@@ -115,11 +174,23 @@ class MainWindow(QMainWindow):
         self.export_video_button.clicked.connect(self.export_video)
         self.export_video_button.setMinimumHeight(40)
         
+        # 添加加入导出队列按钮
+        self.queue_export_button = QPushButton("加入导出队列")
+        self.queue_export_button.clicked.connect(self.add_to_export_queue)
+        self.queue_export_button.setMinimumHeight(40)
+        
+        # 添加多版本导出按钮
+        self.renditions_export_button = QPushButton("多版本导出")
+        self.renditions_export_button.clicked.connect(self.export_renditions)
+        self.renditions_export_button.setMinimumHeight(40)
+        
         # 添加所有按钮到主按钮布局
         button_layout.addLayout(import_layout)
         button_layout.addLayout(transcribe_layout)
         button_layout.addWidget(self.text_edit_button)
         button_layout.addWidget(self.export_video_button)
+        button_layout.addWidget(self.queue_export_button)
+        button_layout.addWidget(self.renditions_export_button)
         right_layout.addLayout(button_layout)
         
         # 创建标签页控件
@@ -155,16 +226,26 @@ class MainWindow(QMainWindow):
         # 添加搜索框
         self.search_edit = QLineEdit()
         self.search_edit.setPlaceholderText("输入关键词过滤字幕...")
-        self.search_edit.textChanged.connect(self.update_subtitle_list)
+        self.search_edit.textChanged.connect(self.on_subtitle_filter_changed)
         subtitle_tab_layout.addWidget(self.search_edit)
         
         subtitle_label = QLabel("字幕列表")
         subtitle_tab_layout.addWidget(subtitle_label)
         
-        self.subtitle_list = QListWidget()
+        # 字幕列表使用模型/视图，行文本在显示时才生成
+        self.subtitle_model = SubtitleListModel(self.format_time, self)
+        self.subtitle_list = QListView()
+        self.subtitle_list.setModel(self.subtitle_model)
+        self.subtitle_list.setUniformItemSizes(True)
         self.subtitle_list.setMinimumWidth(350)
         self.subtitle_list.setAlternatingRowColors(True)
-        self.subtitle_list.itemClicked.connect(self.on_subtitle_clicked)
+        self.subtitle_list.clicked.connect(self.on_subtitle_clicked)
+        self.subtitle_list.setMouseTracking(True)
+        self.subtitle_list.entered.connect(self.on_subtitle_hovered)
+        self.subtitle_list.viewport().installEventFilter(self)
+        self.subtitle_list.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)  # 支持多选
+        self.subtitle_list.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.subtitle_list.customContextMenuRequested.connect(self.show_subtitle_context_menu)
         subtitle_tab_layout.addWidget(self.subtitle_list, 1)  # 1是伸展因子
         
         # 文本剪辑标签页
@@ -270,8 +351,8 @@ class MainWindow(QMainWindow):
             
             self.subtitles = subtitles
             self.words_timestamps = words_timestamps
-            # 保存字幕文件
-            self.save_subtitles(subtitles, words_timestamps)
+            # SRT和逐字稿已由ASR服务保存
+            self.on_new_transcription()
             self.update_subtitle_list()
             self.statusBar().showMessage(f"转录完成，共 {len(subtitles)} 条字幕")
         else:
@@ -291,6 +372,7 @@ class MainWindow(QMainWindow):
             
             self.subtitles = subtitles
             self.words_timestamps = words_timestamps
+            self.on_new_transcription()
             self.update_subtitle_list()
             self.statusBar().showMessage(f"转录完成，共 {len(subtitles)} 条字幕")
         else:
@@ -321,42 +403,96 @@ class MainWindow(QMainWindow):
         if hasattr(self, 'progress_dialog') and self.progress_dialog:
             self.progress_dialog.close()
 
-    def save_subtitles(self, subtitles,words_timestamps):
-        """保存字幕到srt文件"""
-        if not self.media_path or not subtitles:
+    def on_new_transcription(self):
+        """新的转录结果替换了字幕和逐字稿：原有标记和撤销历史失效，保存到工程文件"""
+        self.marked_indices.clear()
+        self.edit_history.clear()
+        self.project_media_path = self.media_path
+        self.mark_project_dirty()
+
+    def mark_project_dirty(self):
+        """记录工程有未保存的修改，停止编辑一段时间后自动保存"""
+        if not Config.PROJECT['enabled']:
             return
-            
-        # 创建srt目录
-        srt_dir = os.path.join(os.path.dirname(self.media_path), 'srt')
-        os.makedirs(srt_dir, exist_ok=True)
-        
-        # 生成srt文件名
-        video_name = os.path.splitext(os.path.basename(self.media_path))[0]
-        srt_path = os.path.join(srt_dir, f"{video_name}.srt")
-        
-        # 写入srt文件
-        with open(srt_path, 'w', encoding='utf-8') as f:
-            for i, subtitle in enumerate(subtitles, 1):
-                start_time = self.format_srt_time(subtitle['start_time'])
-                end_time = self.format_srt_time(subtitle['end_time'])
-                f.write(f"{i}\n{start_time} --> {end_time}\n{subtitle['text']}\n\n")
-        self.logger.info(f"字幕已保存到: {srt_path}")
+        self.project_dirty = True
+        self.project_save_timer.start()
 
-        words_path = os.path.join(srt_dir, f"{video_name}.words.json")
-        with open(words_path, 'w', encoding='utf-8') as f:
-            json.dump(self.words_timestamps, f, ensure_ascii=False, indent=2)
-        self.logger.info(f"逐字稿已保存到: {words_path}")
-        
-        
-    def format_srt_time(self, milliseconds):
-        """格式化时间为srt格式 (HH:MM:SS,mmm)"""
-        seconds = milliseconds // 1000
-        ms = milliseconds % 1000
-        minutes = seconds // 60
-        seconds = seconds % 60
-        hours = minutes // 60
-        minutes = minutes % 60
-        return f"{hours:02d}:{minutes:02d}:{seconds:02d},{ms:03d}"
+    def project_settings(self):
+        """需要随工程保存的设置（字幕样式和多版本导出配置）"""
+        font = self.video_player.subtitle_font
+        return {
+            'subtitle_font': font.family(),
+            'subtitle_size': font.pointSize(),
+            'subtitle_color': self.video_player.subtitle_color.name(QColor.NameFormat.HexArgb),
+            'subtitle_background': self.video_player.subtitle_background.name(QColor.NameFormat.HexArgb),
+            'export_profiles': self.export_profiles
+        }
+
+    def apply_project_settings(self, settings):
+        """应用工程文件中保存的设置"""
+        if settings.get('subtitle_font'):
+            font = self.video_player.subtitle_font
+            font.setFamily(settings['subtitle_font'])
+            font.setPointSize(settings.get('subtitle_size', font.pointSize()))
+            self.video_player.set_subtitle_font(font)
+            self.font_combo.blockSignals(True)
+            self.font_combo.setCurrentFont(font)
+            self.font_combo.blockSignals(False)
+            self.size_spin.blockSignals(True)
+            self.size_spin.setValue(font.pointSize())
+            self.size_spin.blockSignals(False)
+        if settings.get('subtitle_color'):
+            color = QColor(settings['subtitle_color'])
+            self.video_player.set_subtitle_color(color)
+            self.color_button.setStyleSheet(f"background-color: {color.name()};")
+        if settings.get('subtitle_background'):
+            color = QColor(settings['subtitle_background'])
+            self.video_player.set_subtitle_background(color)
+            self.bg_button.setStyleSheet(f"background-color: {color.name()};")
+        profiles = [name for name in settings.get('export_profiles') or [] if name in Config.EXPORT_PROFILES]
+        self.export_profiles = profiles or list(Config.EXPORT['default_profiles'])
+
+    def save_project(self):
+        """将字幕、逐字稿、删除标记和设置保存到工程文件（没有未保存的修改时不写入）"""
+        self.project_save_timer.stop()
+        if not self.project_dirty or not self.project_media_path or not self.subtitles:
+            return
+        self.project_dirty = False
+        project = ProjectData(self.subtitles, self.words_timestamps, list(self.marked_indices.intervals()),
+                              self.project_settings())
+        try:
+            write_project(get_project_path(self.project_media_path), project)
+        except OSError as e:
+            self.logger.error(f"保存工程文件失败: {str(e)}")
+            self.statusBar().showMessage(f"保存工程文件失败: {str(e)}", 5000)
+
+    def load_project(self, media_path):
+        """从工程文件加载字幕、逐字稿、删除标记和设置
+
+        Returns:
+            bool: 是否成功加载
+        """
+        project_path = get_project_path(media_path)
+        if not Config.PROJECT['enabled'] or not os.path.exists(project_path):
+            return False
+        try:
+            project = read_project(project_path)
+        except (OSError, ValueError, ProjectFileError) as e:
+            self.logger.warning(f"工程文件无法读取，改为从SRT加载: {str(e)}")
+            return False
+        if not project.subtitles:
+            return False
+
+        self.subtitles = project.subtitles
+        self.words_timestamps = project.words or None
+        self.marked_indices.clear()
+        for start, end in project.marks:
+            self.marked_indices.add(start, end)
+        self.apply_project_settings(project.settings)
+        self.project_media_path = media_path
+        self.project_dirty = False
+        self.logger.info(f"从工程文件加载: {project_path}")
+        return True
 
     def handle_splitter_move(self, pos, index):
         """处理分割器移动事件"""
@@ -380,6 +516,22 @@ class MainWindow(QMainWindow):
                 self.transcribe_thread.quit()
                 self.transcribe_thread.wait()
         
+        # 保存未保存的修改
+        self.save_project()
+        
+        # 等待正在进行的导出任务
+        self.export_queue.stop()
+        
+        # 等待片段导出线程，未开始的片段不再导出
+        if self.clip_export_thread and self.clip_export_thread.isRunning():
+            self.clip_export_thread.cancel()
+            self.clip_export_thread.wait()
+        
+        # 等待代理和缩略图生成线程
+        for thread in (list(self.proxy_threads.values()) + list(self.thumbnail_threads.values()) +
+                       list(self.waveform_threads.values())):
+            thread.wait()
+        
         self.logger.info('窗口关闭完成')
         event.accept()
 
@@ -389,7 +541,7 @@ class MainWindow(QMainWindow):
             self,
             "选择视频文件",
             "",
-            "视频文件 (*.mp4 *.avi *.mkv *.mov *.flv);;所有文件 (*.*)"
+            "媒体文件 (*.mp4 *.avi *.mkv *.mov *.flv *.wav *.mp3 *.m4a *.flac *.aac);;所有文件 (*.*)"
         )
         
         if file_paths:
@@ -407,11 +559,124 @@ class MainWindow(QMainWindow):
             # 加载第一个视频到播放器
             if file_paths:
                 self.media_path = file_paths[0]
-                self.video_player.set_media(file_paths[0])
+                self.load_media(file_paths[0])
                 
             self.statusBar().showMessage(f"已导入 {len(file_paths)} 个视频")
             
 
+    def load_media(self, media_path):
+        """加载媒体到播放器，有代理文件时播放代理，否则在后台生成代理"""
+        if media_path != self.project_media_path:
+            # 先保存上一个媒体的工程，字幕、逐字稿和标记在 update_subtitle_list 时按新媒体加载
+            self.save_project()
+            self.project_media_path = None
+            self.subtitles = None
+            self.words_timestamps = None
+            self.marked_indices.clear()
+        proxy_path = find_proxy(media_path)
+        self.video_player.set_media(media_path, proxy_path)
+        # 撤销历史中的字幕片段只对当前媒体有效
+        self.edit_history.clear()
+        self.timeline.set_waveform(None)
+        self.timeline.set_deletions([])
+        self.start_waveform_loading(media_path)
+        if proxy_path:
+            self.start_thumbnail_extraction(media_path)
+        else:
+            # 缩略图在代理线程结束后生成，有代理时从代理解码
+            self.start_proxy_generation(media_path)
+    
+    def start_waveform_loading(self, media_path):
+        """在后台加载或计算波形"""
+        if media_path in self.waveform_threads:
+            return
+        
+        thread = WaveformLoadThread(media_path)
+        thread.finished_signal.connect(self.on_waveform_ready)
+        thread.error_signal.connect(lambda path, error: self.logger.warning(f"波形计算失败: {path}, {error}"))
+        thread.finished.connect(lambda: self.waveform_threads.pop(media_path, None))
+        self.waveform_threads[media_path] = thread
+        thread.start()
+    
+    def on_waveform_ready(self, media_path, peaks):
+        """波形就绪，当前播放的是该媒体时显示到时间轴"""
+        if self.video_player.get_media_path() == media_path:
+            self.timeline.set_waveform(peaks)
+    
+    def refresh_timeline(self):
+        """同步时间轴上的字幕、逐字和删除标记，并重建播放字幕索引"""
+        self.subtitle_track.rebuild(self.subtitles)
+        self.video_player.refresh_cues()
+        self.timeline.set_cues(self.subtitles)
+        self.timeline.set_words(self.words_timestamps)
+        self.timeline.set_deletions(self.get_merged_segments())
+    
+    def start_thumbnail_extraction(self, media_path):
+        """在后台生成缩略图精灵图（已有缓存时直接加载）"""
+        if media_path in self.thumbnail_threads:
+            return
+        
+        thread = ThumbnailExtractThread(media_path)
+        thread.finished_signal.connect(self.on_thumbnails_ready)
+        thread.error_signal.connect(lambda path, error: self.logger.warning(f"缩略图生成失败: {path}, {error}"))
+        thread.finished.connect(lambda: self.thumbnail_threads.pop(media_path, None))
+        self.thumbnail_threads[media_path] = thread
+        thread.start()
+    
+    def on_thumbnails_ready(self, media_path, thumb_dir):
+        """缩略图生成完成，当前播放的是该视频时启用悬停预览"""
+        if self.video_player.get_media_path() == media_path:
+            self.video_player.set_thumbnails(ThumbnailSprites(thumb_dir))
+    
+    def on_subtitle_hovered(self, model_index):
+        """字幕列表悬停时显示该字幕开始时间的缩略图"""
+        index = self.subtitle_model.subtitle_index(model_index.row())
+        if self.subtitles and 0 <= index < len(self.subtitles):
+            rect = self.subtitle_list.visualRect(model_index)
+            global_pos = self.subtitle_list.viewport().mapToGlobal(rect.topLeft())
+            global_pos.setX(QCursor.pos().x())
+            self.video_player.show_thumbnail(self.subtitles[index].get('start_time', 0), global_pos)
+    
+    def eventFilter(self, obj, event):
+        """鼠标离开字幕列表时隐藏缩略图预览"""
+        if obj is self.subtitle_list.viewport() and event.type() == QEvent.Type.Leave:
+            self.video_player.hide_thumbnail()
+        return super().eventFilter(obj, event)
+    
+    def start_proxy_generation(self, media_path):
+        """在后台为媒体生成低分辨率代理文件（不需要代理的文件线程会直接结束）"""
+        if media_path in self.proxy_threads:
+            return
+        
+        thread = ProxyGenerateThread(media_path)
+        thread.progress_signal.connect(self.on_proxy_progress)
+        thread.finished_signal.connect(self.on_proxy_ready)
+        thread.error_signal.connect(self.on_proxy_error)
+        thread.finished.connect(lambda: self.on_proxy_thread_finished(media_path))
+        self.proxy_threads[media_path] = thread
+        thread.start()
+    
+    def on_proxy_thread_finished(self, media_path):
+        """代理线程结束（无论是否生成了代理），接着生成缩略图"""
+        self.proxy_threads.pop(media_path, None)
+        self.start_thumbnail_extraction(media_path)
+    
+    def on_proxy_progress(self, media_path, progress):
+        """代理生成进度"""
+        self.status_label.setText(f"生成代理 {os.path.basename(media_path)} {progress}%")
+    
+    def on_proxy_ready(self, media_path, proxy_path):
+        """代理生成完成，当前播放的是该视频时切换到代理播放"""
+        self.status_label.setText("AI引擎就绪" if self.asr_loaded else "AI引擎加载中...")
+        if self.video_player.get_media_path() == media_path:
+            self.video_player.set_playback_source(proxy_path)
+            self.statusBar().showMessage("已切换到代理文件播放", 5000)
+    
+    def on_proxy_error(self, media_path, error):
+        """代理生成失败，继续播放原始文件"""
+        self.status_label.setText("AI引擎就绪" if self.asr_loaded else "AI引擎加载中...")
+        self.logger.warning(f"代理生成失败，将播放原始文件: {media_path}, {error}")
+    
     def transcribe_video(self):
         """转录单个视频"""
         if not self.media_path:
@@ -475,7 +740,7 @@ class MainWindow(QMainWindow):
         
         # 设置当前视频到播放器
         self.media_path = video_path
-        self.video_player.set_media(video_path)
+        self.load_media(video_path)
         
         # 创建并启动转录线程
         self.transcribe_thread = ASRTranscribeThread(self.asr, video_path)
@@ -518,6 +783,7 @@ class MainWindow(QMainWindow):
         if self.media_path == video_path:
             self.subtitles = subtitles
             self.words_timestamps = words_timestamps
+            self.on_new_transcription()
             self.update_subtitle_list()
             
     def on_batch_transcribe_error(self, video_path, error):
@@ -535,74 +801,44 @@ class MainWindow(QMainWindow):
         # 通知批量队列管理器该视频已处理完成（虽然失败）
         self.batch_queue.on_video_transcribed(video_path, [], [])
 
-    def update_subtitle_list(self, filter_text=""):
-        """更新字幕列表"""
-        self.subtitle_list.clear()
-
-        if not self.media_path:
-            return
-        # 如果内存中没有字幕，尝试从srt文件加载
-        if not self.subtitles:
-            srt_dir = os.path.join(os.path.dirname(self.media_path), 'srt')
-            video_name = os.path.splitext(os.path.basename(self.media_path))[0]
-            srt_path = os.path.join(srt_dir, f"{video_name}.srt")
-            if os.path.exists(srt_path):
+    def update_subtitle_list(self):
+        """字幕数据变化后更新字幕列表和时间轴"""
+        # 如果内存中没有字幕，优先从工程文件加载，没有工程文件时从srt文件加载并生成工程文件
+        if self.media_path and not self.subtitles:
+            srt_path, _ = get_transcription_paths(self.media_path)
+            if not self.load_project(self.media_path) and os.path.exists(srt_path):
                 self.load_srt_file(srt_path)
                 self.logger.info(f"从文件加载字幕: {srt_path}")
+                self.project_media_path = self.media_path
+                self.mark_project_dirty()
         
-        if not self.subtitles:
-            return
-            
-        for subtitle in self.subtitles:
-            text = subtitle.get('text', '')
-            start_time = subtitle.get('start_time', 0)
-            end_time = subtitle.get('end_time', 0)
-            
-            # 如果有过滤文本，检查字幕文本是否包含过滤文本
-            if filter_text and filter_text.lower() not in text.lower():
-                continue
-            
-            start_str = self.format_time(start_time)
-            end_str = self.format_time(end_time)
-            
-            item_text = f"[{start_str} - {end_str}] {text}"
-            self.subtitle_list.addItem(item_text)
-        
-        self.logger.info(f"字幕列表更新完成，显示 {self.subtitle_list.count()} 条")
-        
+        self.refresh_timeline()
+        self.subtitle_model.set_subtitles(self.subtitles if self.media_path else None, self.search_edit.text())
+        self.logger.info(f"字幕列表更新完成，显示 {self.subtitle_model.rowCount()} 条")
+    
+    def on_subtitle_filter_changed(self, filter_text):
+        """过滤字幕列表（只影响列表显示）"""
+        self.subtitle_model.set_filter(filter_text)
+    
+    def selected_subtitle_indices(self):
+        """字幕列表中选中的字幕下标（升序）"""
+        rows = self.subtitle_list.selectionModel().selectedRows()
+        indices = (self.subtitle_model.subtitle_index(index.row()) for index in rows)
+        return sorted(i for i in indices if self.subtitles and 0 <= i < len(self.subtitles))
+    
     def load_srt_file(self, srt_path):
-        """从srt文件加载字幕"""
-        import pysrt
-        subs = pysrt.open(srt_path, encoding='utf-8')
-        
-        subtitles = []
-        for sub in subs:
-            # 转换时间为毫秒
-            start_time = (sub.start.hours * 3600 + sub.start.minutes * 60 + 
-                        sub.start.seconds) * 1000 + sub.start.milliseconds
-            end_time = (sub.end.hours * 3600 + sub.end.minutes * 60 + 
-                        sub.end.seconds) * 1000 + sub.end.milliseconds
-            
-            subtitles.append({
-                'text': sub.text,
-                'start_time': start_time,
-                'end_time': end_time
-            })
-        self.subtitles = subtitles
+        """从srt文件加载字幕，同目录下有逐字稿时一并加载"""
+        self.subtitles = read_srt(srt_path)
         self.logger.info(f"成功加载字幕文件: {srt_path}")
 
         # 尝试加载逐字稿
-        words_path = os.path.join(os.path.dirname(srt_path), f"{os.path.splitext(os.path.basename(srt_path))[0]}.words.json")
+        words_path = f"{os.path.splitext(srt_path)[0]}.words.json"
         if os.path.exists(words_path):
-            with open(words_path, 'r', encoding='utf-8') as f:
-                self.words_timestamps = json.load(f)
+            self.words_timestamps = read_words(words_path)
             self.logger.info(f"成功加载逐字稿: {words_path}")
         else:
             self.logger.warning(f"未找到逐字稿文件: {words_path}")
             self.words_timestamps = None
-        
-        self.logger.info(f"成功加载字幕文件: {srt_path}")
-        
             
     def parse_srt_time(self, time_str):
         """解析srt时间格式为毫秒"""
@@ -615,10 +851,10 @@ class MainWindow(QMainWindow):
             return hours * 3600000 + minutes * 60000 + seconds * 1000 + milliseconds
         return 0
 
-    def on_subtitle_clicked(self, item):
+    def on_subtitle_clicked(self, model_index):
         """字幕点击事件处理"""
-        index = self.subtitle_list.row(item)
-        if 0 <= index < len(self.subtitles):
+        index = self.subtitle_model.subtitle_index(model_index.row())
+        if self.subtitles and 0 <= index < len(self.subtitles):
             start_time = self.subtitles[index].get('start_time', 0)
             self.logger.debug(f"跳转到字幕时间点: {start_time}ms")
             self.video_player.set_position(start_time)
@@ -654,11 +890,24 @@ class MainWindow(QMainWindow):
                         
         self.logger.info(f"已导入逐字稿，共 {len(self.words_timestamps)} 个字")
         
-        # 创建文本编辑器
-        self.text_editor = QTextEdit()
-        self.text_editor.setReadOnly(False)  # 允许选择文本
-        self.text_editor.setMinimumHeight(200)
-        self.text_editor.mouseReleaseEvent = self.on_text_editor_mouse_release
+        # 逐字稿很长时使用只绘制可见部分的虚拟化视图，否则使用文本编辑器
+        if self.get_word_index().text_length >= Config.TRANSCRIPT['virtualize_threshold']:
+            self.text_editor = None
+            self.transcript_view = TranscriptView()
+            self.transcript_view.setMinimumHeight(200)
+            self.transcript_view.selection_finished.connect(self.on_transcript_selection)
+            self.transcript_view.word_clicked.connect(self.on_transcript_word_clicked)
+            self.video_player.position_changed.connect(self.transcript_view.set_position)
+            editor_widget = self.transcript_view
+        else:
+            self.transcript_view = None
+            self.text_editor = QTextEdit()
+            self.text_editor.setReadOnly(False)  # 允许选择文本
+            self.text_editor.setMinimumHeight(200)
+            self.text_editor.mouseReleaseEvent = self.on_text_editor_mouse_release
+            # 撤销由编辑历史处理，标记格式的变化不进入编辑器自身的撤销栈
+            self.text_editor.setUndoRedoEnabled(False)
+            editor_widget = self.text_editor
         
         # 创建预览按钮
         preview_button = QPushButton("预览")
@@ -677,7 +926,7 @@ class MainWindow(QMainWindow):
         # for i in reversed(range(self.text_edit_tab_layout.count())): 
         #     self.text_edit_tab_layout.itemAt(i).widget().setParent(None)
         
-        self.text_edit_tab_layout.addWidget(self.text_editor)
+        self.text_edit_tab_layout.addWidget(editor_widget)
         self.text_edit_tab_layout.addLayout(button_layout)
         
         # 切换到文本编辑标签页
@@ -697,7 +946,10 @@ class MainWindow(QMainWindow):
             self.text_editor.textChanged.disconnect(self.on_text_changed)
 
     def preview_marked_text(self):
-        """预览标记的文本"""
+        """预览标记的文本：跳过标记删除的片段播放，再次点击停止预览"""
+        if self.video_player.is_previewing():
+            self.video_player.stop_preview()
+            return
         if not self.marked_indices:
             QMessageBox.information(self, "提示", "请先标记需要删除的文本", 
                                     QMessageBox.StandardButton.Ok)
@@ -707,33 +959,16 @@ class MainWindow(QMainWindow):
         merged_segments = self.get_merged_segments()
         self.logger.info(f"开始预览，跳过 {len(merged_segments)} 个片段")
         
-        # 保存当前编辑器状态
-        self.text_editor.setReadOnly(True)
-        # 预览播放
-        current_position = 0
-        for start, end in merged_segments:
-            # 播放到下一个跳过片段的开始
-            if current_position < start:
-                self.video_player.set_position(current_position)
-                self.video_player.play()
-                while self.video_player.get_position() < start:
-                    QApplication.processEvents()
-                self.video_player.pause()
-            
-            self.logger.debug(f"跳过片段: {self.format_time(start)} - {self.format_time(end)}")
-            current_position = end
-            self.video_player.set_position(current_position)
-        
-        # 播放剩余部分
-        if current_position < self.video_player.get_duration():
-            self.video_player.set_position(current_position)
-            self.video_player.play()
-            while self.video_player.get_position() < self.video_player.get_duration():
-                QApplication.processEvents()
-            self.video_player.pause()
-        
+        # 预览期间编辑器只读，预览结束后在 on_preview_finished 中恢复
+        if self.text_editor:
+            self.text_editor.setReadOnly(True)
+        self.video_player.start_preview(merged_segments)
+
+    def on_preview_finished(self):
+        """预览结束，恢复编辑器界面"""
         self.logger.info("预览结束，恢复编辑器界面")
-        self.text_editor.setReadOnly(False)
+        if self.text_editor:
+            self.text_editor.setReadOnly(False)
 
     def export_edit_plan(self):
         """导出剪辑计划"""
@@ -754,7 +989,8 @@ class MainWindow(QMainWindow):
             with open(file_path, 'w', encoding='utf-8') as f:
                 json.dump({
                     'video_path': self.media_path,
-                    'segments': merged_segments
+                    'segments': merged_segments,
+                    'subtitles': self.subtitles
                 }, f, ensure_ascii=False, indent=2)
             
             self.logger.info(f"剪辑计划已导出: {file_path}")
@@ -767,20 +1003,9 @@ class MainWindow(QMainWindow):
         self.progress_dialog.show()
         
     def update_position(self, position):
-        """更新播放位置和字幕显示"""
+        """更新播放位置（字幕由播放器按字幕边界自行更新）"""
         if self.video_player.get_duration() > 0:
             self.player_controls.update_progress(position, self.video_player.get_duration())
-            
-            # 更新字幕显示
-            if self.subtitles:
-                current_subtitle = None
-                for subtitle in self.subtitles:
-                    start_time = subtitle.get('start_time', 0)
-                    end_time = subtitle.get('end_time', 0)
-                    if start_time <= position <= end_time:
-                        current_subtitle = subtitle.get('text', '')
-                        break
-                self.video_player.set_subtitle(current_subtitle)
             self.video_player.set_position(position)
             
     def on_progress_changed(self, value):
@@ -794,38 +1019,44 @@ class MainWindow(QMainWindow):
         self.player_controls.update_play_button_state(is_playing)
 
     def get_merged_segments(self):
-        """获取合并后的时间段"""
-        if not self.marked_indices or not self.words_timestamps:
-            return []
-        
-        self.logger.info(f"开始合并，标记了 {self.marked_indices} ")
-        # 将标记的索引转换为时间段
-        segments = []
-        for index in sorted(self.marked_indices.keys()):
-            if index < len(self.words_timestamps):
-                word_info = self.words_timestamps[index]
-                segments.append((word_info['start'], word_info['end']))
+        """获取合并后的时间段
         
-        # 合并重叠或相邻的时间段
-        if not segments:
+        标记以区间保存，每个区间直接对应一个时间段；结果缓存到标记或逐字稿变化为止，
+        预览和导出反复读取时开销与剪切点数量有关，与标记的字数无关。
+        """
+        if not self.marked_indices or not self.words_timestamps:
             return []
         
-        merged = [segments[0]]
-        for current in segments[1:]:
-            previous = merged[-1]
-            # 如果当前段与前一段重叠或相邻（间隔小于100ms），则合并
-            if current[0] - previous[1] <= 100:
-                merged[-1] = (previous[0], max(previous[1], current[1]))
-            else:
-                merged.append(current)
+        gap = Config.PLAN_OPTIMIZER['merge_gap_ms']
+        cache_key = (self.marked_indices.version, id(self.words_timestamps), len(self.words_timestamps), gap)
+        if self.merged_segments_cache and self.merged_segments_cache[0] == cache_key:
+            return list(self.merged_segments_cache[1])
         
-        return merged
+        # 将标记的区间转换为时间段
+        word_count = len(self.words_timestamps)
+        segments = []
+        for start, end in self.marked_indices.intervals():
+            if start >= word_count:
+                break
+            end = min(end, word_count)
+            segments.append((self.words_timestamps[start]['start'], self.words_timestamps[end - 1]['end']))
+        
+        # 合并重叠或间隔很近的时间段（间隔阈值见 Config.PLAN_OPTIMIZER）
+        merged = merge_segments(segments, gap)
+        self.merged_segments_cache = (cache_key, merged)
+        self.logger.debug(f"标记 {len(segments)} 个区间，合并为 {len(merged)} 个时间段")
+        return list(merged)
 
     def display_text_content(self):
         """显示文本内容"""
         if not self.words_timestamps:
             return
         
+        if self.transcript_view is not None:
+            self.transcript_view.set_words(self.words_timestamps, self.marked_indices)
+            self.timeline.set_deletions(self.get_merged_segments())
+            return
+        
         # 暂时断开文本变化信号
         try:
             self.text_editor.textChanged.disconnect(self.on_text_changed)
@@ -847,17 +1078,14 @@ class MainWindow(QMainWindow):
         
         # 标记已选中的文字
         cursor = self.text_editor.textCursor()
-        fmt = QTextCharFormat()
-        fmt.setFontStrikeOut(True)  # 设置删除线效果
-        fmt.setBackground(QColor('#ffcccc'))  # 设置红色背景
+        fmt = self.marked_format()
         
-        for index in self.marked_indices:
-            if index < len(self.words_timestamps):
-                start_pos = sum(len(word['word']) for word in self.words_timestamps[:index])
-                length = len(self.words_timestamps[index]['word'])
-                cursor.setPosition(start_pos)
-                cursor.movePosition(QTextCursor.MoveOperation.Right, QTextCursor.MoveMode.KeepAnchor, length)
-                cursor.mergeCharFormat(fmt)
+        # 每个标记区间设置一次格式
+        word_count = len(self.get_word_index())
+        for start, end in self.marked_indices.intervals():
+            if start >= word_count:
+                break
+            self._format_word_range(cursor, start, min(end, word_count), fmt)
         
         # 恢复光标位置
         cursor = self.text_editor.textCursor()
@@ -865,7 +1093,69 @@ class MainWindow(QMainWindow):
         if selection_start != selection_end:
             cursor.setPosition(selection_end, QTextCursor.MoveMode.KeepAnchor)
         self.text_editor.setTextCursor(cursor)
+        
+        # 同步时间轴上的删除标记
+        self.timeline.set_deletions(self.get_merged_segments())
           
+    def get_word_index(self):
+        """获取逐字稿字符位置索引，逐字稿变化后自动重建"""
+        if self.word_index is None or self.word_index.words is not self.words_timestamps:
+            self.word_index = WordOffsetIndex(self.words_timestamps)
+        return self.word_index
+    
+    def _format_word_range(self, cursor, first, last, fmt):
+        """为第 first 到 last（不含）个字设置格式，fmt 为None时恢复默认格式"""
+        word_index = self.get_word_index()
+        cursor.setPosition(word_index.word_start(first))
+        cursor.setPosition(word_index.word_end(last - 1), QTextCursor.MoveMode.KeepAnchor)
+        if fmt is None:
+            cursor.setCharFormat(QTextCharFormat())
+        else:
+            cursor.mergeCharFormat(fmt)
+    
+    def marked_format(self):
+        """标记删除的文字格式"""
+        fmt = QTextCharFormat()
+        fmt.setFontStrikeOut(True)  # 设置删除线效果
+        fmt.setBackground(QColor('#ffcccc'))  # 设置红色背景
+        return fmt
+    
+    def refresh_marks(self, ranges):
+        """只更新指定范围内字的标记格式，开销与变化的范围数成正比
+        
+        Args:
+            ranges: 标记状态发生变化的字下标范围 [(first, last), ...]
+        """
+        if self.transcript_view is not None:
+            self.transcript_view.refresh_marks()
+            self.timeline.set_deletions(self.get_merged_segments())
+            return
+        
+        word_count = len(self.get_word_index())
+        ranges = [(max(0, first), min(last, word_count)) for first, last in ranges]
+        ranges = [(first, last) for first, last in ranges if first < last]
+        if not ranges:
+            return
+        
+        marked_fmt = self.marked_format()
+        # 格式变化不触发自动标记
+        self.text_editor.blockSignals(True)
+        cursor = QTextCursor(self.text_editor.document())
+        cursor.beginEditBlock()
+        try:
+            # 范围内已标记和未标记的部分分别设置格式
+            for first, last in ranges:
+                for start, end in self.marked_indices.covered(first, last):
+                    self._format_word_range(cursor, start, end, marked_fmt)
+                for start, end in self.marked_indices.gaps(first, last):
+                    self._format_word_range(cursor, start, end, None)
+        finally:
+            cursor.endEditBlock()
+            self.text_editor.blockSignals(False)
+        
+        # 同步时间轴上的删除标记
+        self.timeline.set_deletions(self.get_merged_segments())
+    
     def on_text_changed(self):
         """文本变化事件处理"""
         if not self.auto_mark_checkbox.isChecked() or not self.words_timestamps:
@@ -875,54 +1165,26 @@ class MainWindow(QMainWindow):
         self.text_editor.textChanged.disconnect(self.on_text_changed)
         
         try:
-            # 获取当前文本和光标位置
-            current_text = self.text_editor.toPlainText()
+            # 获取当前光标位置
             cursor = self.text_editor.textCursor()
             selection_start = cursor.selectionStart()
             selection_end = cursor.selectionEnd()
             
-            # 如果有选中文本
+            word_index = self.get_word_index()
+            # 如果有选中文本，选中范围内的字；否则为光标所在的字
             if selection_start != selection_end:
-                # 计算选中范围内的所有字符对应的单词索引
-                total_length = 0
-                for i, word in enumerate(self.words_timestamps):
-                    word_length = len(word['word'])
-                    word_start = total_length
-                    word_end = total_length + word_length
-                    
-                    # 如果当前单词与选中范围有重叠
-                    if not (word_end <= selection_start or word_start >= selection_end):
-                        # 切换该字的标记状态
-                        if i in self.marked_indices:
-                            del self.marked_indices[i]
-                        else:
-                            self.marked_indices[i] = True
-                    
-                    total_length += word_length
+                words = word_index.words_in_range(selection_start, selection_end)
+                first, last = words.start, words.stop
             else:
-                # 单字符处理逻辑
-                cursor_pos = cursor.position()
-                total_length = 0
-                for i, word in enumerate(self.words_timestamps):
-                    word_length = len(word['word'])
-                    if total_length <= cursor_pos < total_length + word_length:
-                        # 切换该字的标记状态
-                        if i in self.marked_indices:
-                            del self.marked_indices[i]
-                        else:
-                            self.marked_indices[i] = True
-                        break
-                    total_length += word_length
-            
-            # 重新显示文本内容
-            self.display_text_content()
+                first = word_index.word_at(cursor.position())
+                last = first + 1
             
-            # 恢复光标位置
-            cursor = self.text_editor.textCursor()
-            cursor.setPosition(selection_start)
-            if selection_start != selection_end:
-                cursor.setPosition(selection_end, QTextCursor.MoveMode.KeepAnchor)
-            self.text_editor.setTextCursor(cursor)
+            # 切换这些字的标记状态，只更新变化的字的格式
+            if first >= 0:
+                added, removed = self.marked_indices.toggle(first, last)
+                self.edit_history.push_mark(added, removed)
+                self.mark_project_dirty()
+                self.refresh_marks(added + removed)
         finally:
             # 重新连接文本变化信号
             self.text_editor.textChanged.connect(self.on_text_changed)
@@ -942,30 +1204,31 @@ class MainWindow(QMainWindow):
                                         QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
                 
                 if reply == QMessageBox.StandardButton.Yes:
-                    # 计算选中范围内的所有字符对应的单词索引
-                    total_length = 0
-                    for i, word in enumerate(self.words_timestamps):
-                        word_length = len(word['word'])
-                        word_start = total_length
-                        word_end = total_length + word_length
-                        
-                        # 如果当前单词与选中范围有重叠
-                        if not (word_end <= selection_start or word_start >= selection_end):
-                            self.marked_indices[i] = True
-                        
-                        total_length += word_length
-                    
-                    # 重新显示文本内容
-                    self.display_text_content()
-                    
-                    # 恢复光标位置
-                    cursor = self.text_editor.textCursor()
-                    cursor.setPosition(selection_start)
-                    if selection_start != selection_end:
-                        cursor.setPosition(selection_end, QTextCursor.MoveMode.KeepAnchor)
-                    self.text_editor.setTextCursor(cursor)
+                    # 标记与选中范围有重叠的所有字，只更新新标记的字的格式
+                    words = self.get_word_index().words_in_range(selection_start, selection_end)
+                    added = self.marked_indices.add(words.start, words.stop)
+                    self.edit_history.push_mark(added)
+                    self.mark_project_dirty()
+                    self.refresh_marks(added)
     
 
+    def on_transcript_selection(self, first, last):
+        """虚拟化逐字稿视图中选择结束，确认后标记选中的字"""
+        reply = QMessageBox.question(self, "删除确认",
+                                "是否要删除选中的文本？",
+                                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+        if reply == QMessageBox.StandardButton.Yes:
+            added = self.marked_indices.add(first, last)
+            self.edit_history.push_mark(added)
+            self.mark_project_dirty()
+            self.transcript_view.clear_selection()
+            self.refresh_marks(added)
+    
+    def on_transcript_word_clicked(self, index):
+        """单击逐字稿中的字，跳转到该字"""
+        if self.words_timestamps and 0 <= index < len(self.words_timestamps):
+            self.video_player.set_position(self.words_timestamps[index]['start'])
+    
     def setup_subtitle_style_controls(self):
         """设置字幕样式控制面板"""
         style_panel = QWidget()
@@ -977,8 +1240,11 @@ class MainWindow(QMainWindow):
         self.merge_button.clicked.connect(self.merge_selected_subtitles)
         self.split_button = QPushButton("分割字幕")
         self.split_button.clicked.connect(self.split_subtitle)
+        self.export_clips_button = QPushButton("导出选中片段")
+        self.export_clips_button.clicked.connect(self.export_selected_clips)
         button_layout.addWidget(self.merge_button)
         button_layout.addWidget(self.split_button)
+        button_layout.addWidget(self.export_clips_button)
         
         style_layout.addLayout(button_layout)
         style_layout.addWidget(QLabel("字幕样式:"))
@@ -1035,6 +1301,7 @@ class MainWindow(QMainWindow):
             current_size = self.video_player.subtitle_font.pointSize()
             font.setPointSize(current_size)
             self.video_player.set_subtitle_font(font)
+            self.mark_project_dirty()
             
     def on_size_changed(self, size):
         """字体大小改变事件处理"""
@@ -1042,6 +1309,7 @@ class MainWindow(QMainWindow):
             font = self.video_player.subtitle_font
             font.setPointSize(size)
             self.video_player.set_subtitle_font(font)
+            self.mark_project_dirty()
             
     def on_color_clicked(self):
         """字体颜色选择事件处理"""
@@ -1050,6 +1318,7 @@ class MainWindow(QMainWindow):
             self.color_button.setStyleSheet(f"background-color: {color.name()};")
             if self.video_player:
                 self.video_player.set_subtitle_color(color)
+                self.mark_project_dirty()
                 
     def on_bg_clicked(self):
         """背景颜色选择事件处理"""
@@ -1058,24 +1327,122 @@ class MainWindow(QMainWindow):
             self.bg_button.setStyleSheet(f"background-color: {color.name()};")
             if self.video_player:
                 self.video_player.set_subtitle_background(color)
+                self.mark_project_dirty()
 
     def on_time_offset_changed(self, offset):
-        """字幕时间偏移调整"""
+        """字幕时间偏移调整（播放立即生效，字幕数据和列表在停止调整后统一更新）"""
         if self.subtitles:
-            for subtitle in self.subtitles:
-                subtitle['start_time'] = subtitle.get('start_time', 0) + offset * 1000
-                subtitle['end_time'] = subtitle.get('end_time', 0) + offset * 1000
+            self.subtitle_track.shift(int(offset * 1000))
+            self.video_player.refresh_cues()
+            self.edit_history.push_offset(int(offset * 1000))
+            self.mark_project_dirty()
+            self.offset_commit_timer.start()
+    
+    def undo_edit(self):
+        """撤销上一次修改"""
+        entry = self.edit_history.undo()
+        if entry:
+            self.apply_edit(entry, undo=True)
+            self.statusBar().showMessage("已撤销", 2000)
+    
+    def redo_edit(self):
+        """重做上一次撤销的修改"""
+        entry = self.edit_history.redo()
+        if entry:
+            self.apply_edit(entry, undo=False)
+            self.statusBar().showMessage("已重做", 2000)
+    
+    def apply_edit(self, entry, undo):
+        """正向或反向应用一条编辑历史记录"""
+        kind = entry[0]
+        self.mark_project_dirty()
+        if kind == MARK:
+            _, added, removed = entry
+            if undo:
+                added, removed = removed, added
+            for start, end in removed:
+                self.marked_indices.remove(start, end)
+            for start, end in added:
+                self.marked_indices.add(start, end)
+            if self.text_editor or self.transcript_view:
+                self.refresh_marks(list(added) + list(removed))
+            else:
+                self.timeline.set_deletions(self.get_merged_segments())
+        elif kind == SUBTITLES:
+            # 未写回的时间偏移要先写回，否则重建字幕索引时丢失
+            self.commit_subtitle_offset()
+            _, index, old_subtitles, new_subtitles = entry
+            if undo:
+                old_subtitles, new_subtitles = new_subtitles, old_subtitles
+            self.subtitles[index:index + len(old_subtitles)] = new_subtitles
+            self.update_subtitle_list()
+        elif kind == OFFSET:
+            self.subtitle_track.shift(-entry[1] if undo else entry[1])
+            self.video_player.refresh_cues()
+            self.offset_commit_timer.start()
+    
+    def commit_subtitle_offset(self):
+        """将累计的时间偏移写回字幕并刷新列表"""
+        self.offset_commit_timer.stop()
+        if self.subtitle_track.offset:
+            self.subtitle_track.apply_offset()
             self.update_subtitle_list()
 
+    def show_subtitle_context_menu(self, pos):
+        """字幕列表右键菜单"""
+        if not self.subtitle_list.selectionModel().hasSelection():
+            return
+        menu = QMenu(self)
+        menu.addAction("导出选中字幕为独立片段", self.export_selected_clips)
+        menu.exec(self.subtitle_list.viewport().mapToGlobal(pos))
+    
+    def export_selected_clips(self):
+        """将选中的每条字幕导出为一个独立片段（并行提取）"""
+        if not self.media_path:
+            QMessageBox.warning(self, "警告", "请先导入视频")
+            return
+        if self.clip_export_thread and self.clip_export_thread.isRunning():
+            QMessageBox.information(self, "提示", "片段正在导出中，请稍候")
+            return
+        
+        ranges = [self.subtitles[i] for i in self.selected_subtitle_indices()]
+        if not ranges:
+            QMessageBox.warning(self, "警告", "请先选择需要导出的字幕")
+            return
+        
+        output_dir = QFileDialog.getExistingDirectory(self, "选择片段输出目录",
+                                                      os.path.dirname(self.media_path))
+        if not output_dir:
+            return
+        
+        self.show_progress_dialog("导出片段", f"正在导出 {len(ranges)} 个片段...")
+        self.clip_export_thread = ClipExportThread(self.media_path, ranges, output_dir)
+        self.clip_export_thread.progress_signal.connect(self.on_video_progress)
+        self.clip_export_thread.finished_signal.connect(self.on_clips_exported)
+        self.clip_export_thread.start()
+    
+    def on_clips_exported(self, outputs, errors):
+        """片段导出完成"""
+        if hasattr(self, 'progress_dialog') and self.progress_dialog:
+            self.progress_dialog.close()
+        
+        message = f"已导出 {len(outputs)} 个片段"
+        if outputs:
+            message += f"到:\n{os.path.dirname(outputs[0])}"
+        if errors:
+            message += f"\n\n失败 {len(errors)} 个:\n" + "\n".join(errors[:10])
+            QMessageBox.warning(self, "导出完成", message)
+        else:
+            QMessageBox.information(self, "导出完成", message)
+    
     def merge_selected_subtitles(self):
         """合并选中的字幕"""
-        selected_items = self.subtitle_list.selectedItems()
-        if len(selected_items) < 2:
+        indices = self.selected_subtitle_indices()
+        # 未写回的时间偏移要先写回（偏移不改变顺序，选中的下标仍然有效）
+        self.commit_subtitle_offset()
+        if len(indices) < 2:
             QMessageBox.warning(self, "警告", "请至少选择两个字幕进行合并")
             return
-            
-        indices = [self.subtitle_list.row(item) for item in selected_items]
-        indices.sort()
         
         # 确保选中的字幕是连续的
         if indices[-1] - indices[0] + 1 != len(indices):
@@ -1091,6 +1458,8 @@ class MainWindow(QMainWindow):
         }
         
         # 更新字幕列表
+        self.edit_history.push_subtitles(indices[0], self.subtitles[indices[0]:indices[-1] + 1], [merged_subtitle])
+        self.mark_project_dirty()
         for i in reversed(indices[1:]):
             del self.subtitles[i]
         self.subtitles[indices[0]] = merged_subtitle
@@ -1098,12 +1467,14 @@ class MainWindow(QMainWindow):
         
     def split_subtitle(self):
         """分割选中的字幕"""
-        selected_items = self.subtitle_list.selectedItems()
-        if len(selected_items) != 1:
+        indices = self.selected_subtitle_indices()
+        # 未写回的时间偏移要先写回（偏移不改变顺序，选中的下标仍然有效）
+        self.commit_subtitle_offset()
+        if len(indices) != 1:
             QMessageBox.warning(self, "警告", "请选择一个字幕进行分割")
             return
             
-        index = self.subtitle_list.row(selected_items[0])
+        index = indices[0]
         subtitle = self.subtitles[index]
         text = subtitle['text']
         
@@ -1148,6 +1519,8 @@ class MainWindow(QMainWindow):
                 new_subtitles.append(new_subtitle)
                 
             # 更新字幕列表
+            self.edit_history.push_subtitles(index, [subtitle], new_subtitles)
+            self.mark_project_dirty()
             self.subtitles[index:index+1] = new_subtitles
             self.update_subtitle_list()
 
@@ -1158,12 +1531,12 @@ class MainWindow(QMainWindow):
                                     QMessageBox.StandardButton.Ok)
             return
         
-        # 获取输出文件路径
+        # 获取输出文件路径，选择音频格式时走仅音频导出
         file_path, _ = QFileDialog.getSaveFileName(
             self,
             "保存剪辑视频",
             "",
-            "MP4文件 (*.mp4)"
+            self.EXPORT_FILE_FILTER
         )
         
         if not file_path:
@@ -1184,9 +1557,84 @@ class MainWindow(QMainWindow):
         self.video_processor.progress_updated.connect(self.on_video_progress)
         self.video_processor.process_completed.connect(self.on_video_completed)
         self.video_processor.process_error.connect(self.on_video_error)
+        self.video_processor.plan_optimized.connect(self.on_plan_optimized)
+        
+        # 开始处理视频（音频输出格式时只导出音频）
+        self.video_processor.export(self.media_path, merged_segments, file_path, self.subtitles)
+    
+    def export_renditions(self):
+        """一次解码导出多个版本（配置见 Config.EXPORT['default_profiles']）"""
+        if not self.marked_indices:
+            QMessageBox.information(self, "提示", "请先标记需要删除的文本", 
+                                    QMessageBox.StandardButton.Ok)
+            return
+        
+        merged_segments = self.get_merged_segments()
+        if not merged_segments:
+            QMessageBox.information(self, "提示", "没有找到有效的剪辑片段", 
+                                    QMessageBox.StandardButton.Ok)
+            return
+        
+        # 选择输出文件名，各版本在文件名后追加后缀
+        video_name = os.path.splitext(os.path.basename(self.media_path))[0]
+        default_path = os.path.join(os.path.dirname(self.media_path), f"{video_name}_cut.mp4")
+        file_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "选择多版本导出的文件名",
+            default_path,
+            "MP4文件 (*.mp4)"
+        )
+        
+        if not file_path:
+            return
+        
+        self.show_progress_dialog("多版本导出", "正在处理视频...")
+        
+        self.video_processor = VideoProcessor()
+        self.video_processor.progress_updated.connect(self.on_video_progress)
+        self.video_processor.process_completed.connect(self.on_video_completed)
+        self.video_processor.process_error.connect(self.on_video_error)
+        self.video_processor.plan_optimized.connect(self.on_plan_optimized)
         
-        # 开始处理视频
-        self.video_processor.process_video(self.media_path, merged_segments, file_path)
+        self.video_processor.export_renditions(self.media_path, merged_segments, file_path,
+                                               profile_names=self.export_profiles, subtitles=self.subtitles)
+    
+    def add_to_export_queue(self):
+        """将当前视频的剪辑加入导出队列"""
+        if not self.marked_indices:
+            QMessageBox.information(self, "提示", "请先标记需要删除的文本", 
+                                    QMessageBox.StandardButton.Ok)
+            return
+        
+        merged_segments = self.get_merged_segments()
+        if not merged_segments:
+            QMessageBox.information(self, "提示", "没有找到有效的剪辑片段", 
+                                    QMessageBox.StandardButton.Ok)
+            return
+        
+        # 默认输出到原视频目录
+        video_name = os.path.splitext(os.path.basename(self.media_path))[0]
+        default_path = os.path.join(os.path.dirname(self.media_path), f"{video_name}_cut.mp4")
+        file_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "保存剪辑视频",
+            default_path,
+            self.EXPORT_FILE_FILTER
+        )
+        
+        if not file_path:
+            return
+        
+        self.export_queue.add_job(self.media_path, merged_segments, file_path, self.subtitles)
+        self.statusBar().showMessage(f"已加入导出队列: {os.path.basename(file_path)}", 5000)
+        self.show_export_queue()
+    
+    def show_export_queue(self):
+        """显示导出队列对话框"""
+        if not self.export_queue_dialog:
+            self.export_queue_dialog = ExportQueueDialog(self.export_queue, self)
+        self.export_queue_dialog.show()
+        self.export_queue_dialog.raise_()
     
     def on_video_progress(self, progress, message):
         """视频处理进度更新"""
@@ -1194,6 +1642,14 @@ class MainWindow(QMainWindow):
             self.progress_dialog.set_progress(progress)
             self.progress_dialog.set_message(message)
     
+    def on_plan_optimized(self, report):
+        """显示剪辑计划优化结果"""
+        if report['cuts_saved'] > 0 or report['snapped'] > 0:
+            self.statusBar().showMessage(
+                f"剪辑计划已优化：减少 {report['cuts_saved']} 个剪切点，"
+                f"少处理 {report['reencode_ms_saved'] / 1000.0:.1f} 秒，"
+                f"多删除内容 {report['removed_ms'] / 1000.0:.1f} 秒", 10000)
+    
     def on_video_completed(self, output_path):
         """视频处理完成"""
         if hasattr(self, 'progress_dialog') and self.progress_dialog:
@@ -1220,7 +1676,7 @@ class MainWindow(QMainWindow):
         video_paths = self.batch_queue.get_video_paths()
         if 0 <= index < len(video_paths):
             self.media_path = video_paths[index]
-            self.video_player.set_media(video_paths[index])
+            self.load_media(video_paths[index])
             # 加载该视频的字幕（如果有）
             self.update_subtitle_list()
             self.video_player.play()  # 自动开始播放
@@ -1240,13 +1696,15 @@ class MainWindow(QMainWindow):
                 video_paths = self.batch_queue.get_video_paths()
                 if 0 <= index < len(video_paths):
                     self.media_path = video_paths[index]
-                    self.video_player.set_media(video_paths[index])
+                    self.load_media(video_paths[index])
                     self.transcribe_video()
             elif action == remove_action:
                 index = self.video_list.row(item)
                 video_paths = self.batch_queue.get_video_paths()
                 # 如果移除的是当前播放的视频，清空播放器
                 if video_paths and self.media_path == video_paths[index]:
+                    self.save_project()
+                    self.project_media_path = None
                     self.media_path = None
                     self.video_player.stop()
                     self.subtitles = None
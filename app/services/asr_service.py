@@ -10,6 +10,7 @@ from pathlib import Path
 from ..config import Config
 from ..utils.logger import logger
 from ..utils.event_bus import event_bus
+from ..utils.subtitle_io import save_transcription
 
 class ASRService:
     """语音识别服务 - 基于FunASR的自动语音识别"""
@@ -110,30 +111,15 @@ class ASRService:
                 hotword='魔搭'
             )
             
-            # 保存原始结果（用于调试）
-            if isinstance(result, list) or isinstance(result, dict):
-                with open("funasr_raw_result.json", "w", encoding="utf-8") as f:
-                    import json
-                    json.dump(result, f, ensure_ascii=False, indent=2)
-                    logger.debug("原始结果已保存到 funasr_raw_result.json")
-            
             # 处理结果为字幕格式和文字时间戳
             subtitles, words_timestamps = self.process_funasr_result(result)
             
-            # 自动保存SRT文件到视频文件所在目录下的srt子目录中
+            # 保存转录输出（视频文件所在目录下的srt子目录中），每次转录只写一次
             if subtitles and len(subtitles) > 0:
-                # 获取视频文件所在目录
-                video_dir = os.path.dirname(media_path)
-                # 创建srt子目录
-                srt_dir = os.path.join(video_dir, "srt")
-                os.makedirs(srt_dir, exist_ok=True)
-                # 获取视频文件名（不含扩展名）
-                video_name = os.path.splitext(os.path.basename(media_path))[0]
-                # 构建SRT文件路径
-                srt_path = os.path.join(srt_dir, f"{video_name}.srt")
-                # 保存SRT文件
-                self.convert_to_srt(subtitles, srt_path)
-                logger.info(f"已自动保存SRT文件到: {srt_path}")
+                raw_result = result if Config.ASR_OUTPUT['save_raw_result'] else None
+                srt_path, words_path = save_transcription(media_path, subtitles, words_timestamps, raw_result)
+                logger.info(f"已自动保存SRT文件到: {srt_path}，逐字稿: {words_path}")
+                event_bus.publish('srt_saved', {'output_path': srt_path})
             
             # 发布转录完成事件
             event_bus.publish('asr_result', {
@@ -159,25 +145,3 @@ class ASRService:
             logger.error(f"转录出错: {str(e)}")
             logger.error(traceback.format_exc())
             return [], []
-    
-    def convert_to_srt(self, subtitles, output_path):
-        """将字幕转换为SRT格式并保存"""
-        with open(output_path, 'w', encoding='utf-8') as f:
-            for i, sub in enumerate(subtitles):
-                start_time_str = self.ms_to_srt_time(sub["start_time"])
-                end_time_str = self.ms_to_srt_time(sub["end_time"])
-                
-                # SRT格式：序号、时间码、文本内容，每个字幕条目之间用空行分隔
-                f.write(f"{i+1}\n")
-                f.write(f"{start_time_str} --> {end_time_str}\n")
-                f.write(f"{sub['text']}\n\n")
-                
-        logger.info(f"SRT文件已保存: {output_path}")
-        event_bus.publish('srt_saved', {'output_path': output_path})
-    
-    def ms_to_srt_time(self, ms):
-        """将毫秒转换为SRT时间格式 (00:00:00,000)"""
-        s, ms = divmod(ms, 1000)
-        m, s = divmod(s, 60)
-        h, m = divmod(m, 60)
-        return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
\ No newline at end of file
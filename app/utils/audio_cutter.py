@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import sys
+from array import array
+
+# 16位有符号整数PCM
+SAMPLE_BYTES = 2
+
+
+class PCMCutter:
+    """在解码后的PCM流上按保留片段裁剪拼接
+
+    输入为连续的 s16le 交错PCM数据块，输出只包含保留片段的数据，
+    并可在剪切点处加入短淡入淡出，避免拼接处出现爆音。
+    """
+
+    def __init__(self, keep_segments, sample_rate, channels, fade_ms=0, total_ms=None):
+        """初始化
+
+        Args:
+            keep_segments: 需要保留的时间段列表，格式为[(start_time, end_time), ...]（毫秒，已排序）
+            sample_rate: 采样率
+            channels: 声道数
+            fade_ms: 剪切点淡入淡出时长（毫秒），0表示不加淡变
+            total_ms: 媒体总时长（毫秒），在原始开头和结尾处不加淡变
+        """
+        self.channels = channels
+        self.frame_bytes = channels * SAMPLE_BYTES
+        self.fade_frames = int(sample_rate * fade_ms / 1000)
+
+        # 片段转换为采样帧区间 [start, end)
+        self.segments = []
+        for start, end in keep_segments:
+            start_frame = start * sample_rate // 1000
+            end_frame = end * sample_rate // 1000
+            if end_frame > start_frame:
+                fade_in = start > 0
+                fade_out = total_ms is None or end < total_ms
+                self.segments.append((start_frame, end_frame, fade_in, fade_out))
+
+        self.position = 0  # 已输入的帧数
+        self.segment_index = 0
+        self.pending = b''  # 不足一帧的剩余字节
+
+    @property
+    def finished(self):
+        """所有保留片段是否已输出完毕"""
+        return self.segment_index >= len(self.segments)
+
+    def feed(self, data):
+        """输入一块PCM数据，返回需要输出的PCM数据"""
+        if self.pending:
+            data = self.pending + data
+        usable = len(data) - len(data) % self.frame_bytes
+        self.pending = data[usable:]
+
+        chunk_start = self.position
+        chunk_end = chunk_start + usable // self.frame_bytes
+        self.position = chunk_end
+
+        output = []
+        while self.segment_index < len(self.segments):
+            start, end, fade_in, fade_out = self.segments[self.segment_index]
+            if start >= chunk_end:
+                break
+
+            lo = max(start, chunk_start)
+            hi = min(end, chunk_end)
+            if hi > lo:
+                piece = data[(lo - chunk_start) * self.frame_bytes:(hi - chunk_start) * self.frame_bytes]
+                output.append(self._apply_fades(piece, lo, start, end, fade_in, fade_out))
+
+            if end <= chunk_end:
+                self.segment_index += 1
+            else:
+                break
+
+        return b''.join(output)
+
+    def _apply_fades(self, piece, first_frame, start, end, fade_in, fade_out):
+        """对落在淡入淡出区域内的采样做线性增益"""
+        fade = self.fade_frames
+        last_frame = first_frame + len(piece) // self.frame_bytes
+        in_zone = fade_in and fade and first_frame < start + fade
+        out_zone = fade_out and fade and last_frame > end - fade
+        if not (in_zone or out_zone):
+            return piece
+
+        samples = array('h', piece)
+        if sys.byteorder == 'big':
+            samples.byteswap()
+
+        # 只遍历淡变区域内的帧
+        zones = []
+        if in_zone:
+            zones.append((first_frame, min(last_frame, start + fade)))
+        if out_zone:
+            zones.append((max(first_frame, end - fade), last_frame))
+        if len(zones) == 2 and zones[0][1] >= zones[1][0]:
+            # 片段短于两倍淡变时长时两个区域重叠，合并后只处理一次
+            zones = [(zones[0][0], zones[1][1])]
+
+        for zone_start, zone_end in zones:
+            for frame in range(zone_start, zone_end):
+                gain = 1.0
+                if fade_in:
+                    gain = min(gain, (frame - start) / fade)
+                if fade_out:
+                    gain = min(gain, (end - frame) / fade)
+                if gain >= 1.0:
+                    continue
+                base = (frame - first_frame) * self.channels
+                for channel in range(self.channels):
+                    samples[base + channel] = int(samples[base + channel] * gain)
+
+        if sys.byteorder == 'big':
+            samples.byteswap()
+        return samples.tobytes()
@@ -0,0 +1,298 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import time
+import uuid
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
+from app.config import Config
+from app.utils.logger import setup_logger
+from app.utils.video_processor import VideoProcessor
+
+
+class ExportWorkerThread(QThread):
+    """单个导出任务的工作线程"""
+
+    # 定义信号
+    progress_signal = pyqtSignal(str, dict)  # 任务ID, 进度统计
+    finished_signal = pyqtSignal(str, bool, str)  # 任务ID, 是否成功, 输出路径或错误信息
+
+    def __init__(self, job):
+        """初始化导出线程"""
+        super().__init__()
+        self.job_id = job['id']
+        self.video_path = job['video_path']
+        self.segments = [tuple(segment) for segment in job['segments']]
+        self.output_path = job['output_path']
+        self.subtitles = job.get('subtitles')
+
+    def run(self):
+        """执行导出任务"""
+        result = {'success': False, 'message': '未知错误'}
+
+        def on_completed(output_path):
+            result.update(success=True, message=output_path)
+
+        def on_error(error_message):
+            result.update(success=False, message=error_message)
+
+        # 处理器在本线程中创建，信号直接回调后再转发到主线程
+        processor = VideoProcessor()
+        processor.progress_stats.connect(lambda stats: self.progress_signal.emit(self.job_id, stats))
+        processor.process_completed.connect(on_completed)
+        processor.process_error.connect(on_error)
+        processor.export(self.video_path, self.segments, self.output_path, self.subtitles)
+
+        self.finished_signal.emit(self.job_id, result['success'], result['message'])
+
+
+class BatchExportQueue(QObject):
+    """批量导出队列管理器，按并发上限同时导出多个视频"""
+
+    # 定义信号
+    job_added_signal = pyqtSignal(dict)  # 新增任务
+    job_updated_signal = pyqtSignal(dict)  # 任务状态或进度变化
+    job_removed_signal = pyqtSignal(str)  # 任务被移除
+    queue_stats_signal = pyqtSignal(dict)  # 队列整体统计
+    queue_completed_signal = pyqtSignal()  # 队列处理完成信号
+
+    # 任务状态
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    def __init__(self, state_file=None):
+        """初始化批量导出队列"""
+        super().__init__()
+        self.logger = setup_logger(__name__)
+        self.state_file = state_file or str(Config.ROOT_DIR / Config.EXPORT['queue_state_file'])
+        self.jobs = []  # 任务列表，每个任务为字典
+        self.workers = {}  # 正在运行的任务 {job_id: ExportWorkerThread}
+        self.is_processing = False
+        self.start_time = 0
+        self.load_state()
+
+    def add_job(self, video_path, segments, output_path, subtitles=None):
+        """添加一个导出任务
+
+        Args:
+            video_path: 原始视频路径
+            segments: 需要删除的时间段列表，格式为[(start_time, end_time), ...]
+            output_path: 输出视频路径
+            subtitles: 原始字幕列表，导出时输出重新计时的字幕
+
+        Returns:
+            任务ID
+        """
+        job = {
+            'id': uuid.uuid4().hex[:8],
+            'video_path': video_path,
+            'segments': [list(segment) for segment in segments],
+            'output_path': output_path,
+            'subtitles': subtitles or None,
+            'status': self.PENDING,
+            'percent': 0,
+            'speed': 0.0,
+            'throughput': 0.0,
+            'eta': -1,
+            'elapsed': 0.0,
+            'media_ms': 0,  # 输出时长（毫秒），开始处理后由进度统计得到
+            'message': ''
+        }
+        self.jobs.append(job)
+        self.save_state()
+        self.logger.info(f"已添加导出任务: {video_path} -> {output_path}，当前队列长度: {len(self.jobs)}")
+        self.job_added_signal.emit(job)
+
+        # 队列运行中时立即尝试调度新任务
+        if self.is_processing:
+            self._schedule()
+        return job['id']
+
+    def remove_job(self, job_id):
+        """移除未在运行的任务"""
+        job = self.get_job(job_id)
+        if not job or job['status'] == self.RUNNING:
+            return False
+        self.jobs.remove(job)
+        self.save_state()
+        self.job_removed_signal.emit(job_id)
+        return True
+
+    def clear_finished(self):
+        """清除已完成和失败的任务"""
+        for job in [job for job in self.jobs if job['status'] in (self.DONE, self.FAILED)]:
+            self.remove_job(job['id'])
+
+    def retry_failed(self):
+        """将失败的任务重新放回待处理状态"""
+        for job in self.jobs:
+            if job['status'] == self.FAILED:
+                job.update(status=self.PENDING, percent=0, message='')
+                self.job_updated_signal.emit(job)
+        self.save_state()
+
+    def get_job(self, job_id):
+        """获取指定ID的任务"""
+        for job in self.jobs:
+            if job['id'] == job_id:
+                return job
+        return None
+
+    def get_jobs(self):
+        """获取所有任务"""
+        return list(self.jobs)
+
+    def start_processing(self):
+        """开始处理队列"""
+        if self.is_processing or not self._pending_jobs():
+            return False
+
+        self.is_processing = True
+        self.start_time = time.monotonic()
+        self.logger.info(f"开始批量导出，待处理任务 {len(self._pending_jobs())} 个，并发上限 {self.max_concurrency()}")
+        self._schedule()
+        return True
+
+    def max_concurrency(self):
+        """计算并发上限
+
+        -c copy 导出几乎不占CPU，瓶颈在磁盘读写，因此按输出磁盘数限制，
+        同时不超过CPU核数的一半。
+        """
+        configured = Config.EXPORT.get('max_concurrency', 0)
+        if configured > 0:
+            return configured
+
+        cpu_limit = max(1, (os.cpu_count() or 2) // 2)
+        disks = set()
+        for job in self._pending_jobs() + self._running_jobs():
+            output_dir = os.path.dirname(os.path.abspath(job['output_path']))
+            try:
+                disks.add(os.stat(output_dir).st_dev)
+            except OSError:
+                disks.add(output_dir)
+        disk_limit = max(1, len(disks)) * Config.EXPORT.get('jobs_per_disk', 2)
+        return max(1, min(cpu_limit, disk_limit))
+
+    def _schedule(self):
+        """在并发上限内启动待处理任务"""
+        limit = self.max_concurrency()
+        for job in self._pending_jobs():
+            if len(self.workers) >= limit:
+                break
+            self._start_job(job)
+
+        if not self.workers and not self._pending_jobs():
+            self._complete_queue()
+
+    def _start_job(self, job):
+        """启动单个任务"""
+        job.update(status=self.RUNNING, percent=0, message='', started_at=time.monotonic())
+        worker = ExportWorkerThread(job)
+        worker.progress_signal.connect(self.on_job_progress)
+        worker.finished_signal.connect(self.on_job_finished)
+        self.workers[job['id']] = worker
+        self.save_state()
+        self.logger.info(f"开始导出任务 {job['id']}: {job['video_path']}")
+        self.job_updated_signal.emit(job)
+        worker.start()
+
+    def on_job_progress(self, job_id, stats):
+        """任务进度回调"""
+        job = self.get_job(job_id)
+        if not job:
+            return
+        job.update(percent=stats['percent'], speed=stats['speed'], media_ms=stats['output_ms'],
+                   throughput=stats['throughput'], eta=stats['eta'],
+                   elapsed=stats['elapsed'], message=stats['stage'])
+        self.job_updated_signal.emit(job)
+        self._emit_stats()
+
+    def on_job_finished(self, job_id, success, message):
+        """任务完成回调"""
+        worker = self.workers.pop(job_id, None)
+        if worker:
+            worker.wait()
+            worker.deleteLater()
+
+        job = self.get_job(job_id)
+        if job:
+            job.update(status=self.DONE if success else self.FAILED,
+                       percent=100 if success else job['percent'],
+                       eta=-1, message=message)
+            if 'started_at' in job:
+                job['elapsed'] = time.monotonic() - job.pop('started_at')
+            if success:
+                self.logger.info(f"导出任务 {job_id} 完成: {message}")
+            else:
+                self.logger.error(f"导出任务 {job_id} 失败: {message}")
+            self.job_updated_signal.emit(job)
+
+        self.save_state()
+        self._emit_stats()
+        if self.is_processing:
+            self._schedule()
+
+    def _emit_stats(self):
+        """发送队列整体统计：完成数量、整体进度和吞吐量"""
+        done_ms = sum(job['media_ms'] * job['percent'] / 100 for job in self.jobs)
+        elapsed = time.monotonic() - self.start_time if self.start_time else 0
+        percents = [job['percent'] for job in self.jobs]
+        stats = {
+            'total': len(self.jobs),
+            'done': len([job for job in self.jobs if job['status'] == self.DONE]),
+            'failed': len([job for job in self.jobs if job['status'] == self.FAILED]),
+            'running': len(self.workers),
+            'percent': int(sum(percents) / len(percents)) if percents else 0,
+            'throughput': (done_ms / 1000.0) / elapsed if elapsed > 0 else 0.0,
+            'elapsed': elapsed
+        }
+        self.queue_stats_signal.emit(stats)
+
+    def _complete_queue(self):
+        """完成队列处理"""
+        if not self.is_processing:
+            return
+        self.is_processing = False
+        self.logger.info(f"批量导出队列处理完成，共 {len(self.jobs)} 个任务")
+        self._emit_stats()
+        self.queue_completed_signal.emit()
+
+    def _pending_jobs(self):
+        return [job for job in self.jobs if job['status'] == self.PENDING]
+
+    def _running_jobs(self):
+        return [job for job in self.jobs if job['status'] == self.RUNNING]
+
+    def save_state(self):
+        """保存队列状态到文件"""
+        try:
+            jobs = [{key: value for key, value in job.items() if key != 'started_at'} for job in self.jobs]
+            with open(self.state_file, 'w', encoding='utf-8') as f:
+                json.dump({'jobs': jobs}, f, ensure_ascii=False)
+        except Exception as e:
+            self.logger.error(f"保存导出队列状态失败: {str(e)}")
+
+    def load_state(self):
+        """从文件恢复队列状态，上次未完成的任务重新置为待处理"""
+        if not os.path.exists(self.state_file):
+            return
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                self.jobs = json.load(f).get('jobs', [])
+            for job in self.jobs:
+                if job['status'] == self.RUNNING:
+                    job.update(status=self.PENDING, percent=0)
+            self.logger.info(f"已恢复导出队列，共 {len(self.jobs)} 个任务")
+        except Exception as e:
+            self.logger.error(f"读取导出队列状态失败: {str(e)}")
+            self.jobs = []
+
+    def stop(self):
+        """停止调度新任务，并等待正在运行的任务结束"""
+        self.is_processing = False
+        for worker in list(self.workers.values()):
+            worker.wait()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from PyQt6.QtCore import QThread, pyqtSignal
+from app.config import Config
+from app.utils.logger import setup_logger
+from app.utils.ffmpeg_progress import run_ffmpeg
+from app.utils.proxy_generator import probe_video_stream
+
+logger = setup_logger(__name__)
+
+# 文件名中不允许的字符
+INVALID_NAME_CHARS = re.compile(r'[\\/:*?"<>|\r\n\t]+')
+
+
+def clip_file_name(index, start_ms, text, ext):
+    """根据序号、开始时间和字幕文本生成片段文件名，如 003_00-01-25_大家好.mp4"""
+    seconds = int(start_ms) // 1000
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    title = INVALID_NAME_CHARS.sub(' ', text or '').strip()[:Config.CLIP_EXPORT['max_name_chars']].strip()
+    name = f"{index:03d}_{hours:02d}-{minutes:02d}-{seconds:02d}"
+    if title:
+        name += f"_{title}"
+    return name + ext
+
+
+def clip_workers():
+    """并行提取片段的线程数，配置为0时取CPU核数的一半"""
+    workers = Config.CLIP_EXPORT['max_workers']
+    return workers if workers > 0 else max(1, (os.cpu_count() or 2) // 2)
+
+
+class ClipExportThread(QThread):
+    """按字幕范围并行提取多个独立片段"""
+
+    # 定义信号
+    progress_signal = pyqtSignal(int, str)  # 进度百分比, 描述
+    clip_finished_signal = pyqtSignal(str)  # 单个片段输出路径
+    finished_signal = pyqtSignal(list, list)  # 成功的输出路径列表, 失败信息列表
+
+    def __init__(self, media_path, ranges, output_dir):
+        """初始化片段导出线程
+
+        Args:
+            media_path: 原始媒体路径
+            ranges: 片段列表，每项为包含 start_time/end_time/text 的字典
+            output_dir: 输出目录
+        """
+        super().__init__()
+        self.media_path = media_path
+        self.ranges = ranges
+        self.output_dir = output_dir
+        self.is_cancelled = False
+
+    def cancel(self):
+        """取消尚未开始的片段"""
+        self.is_cancelled = True
+
+    def run(self):
+        """只探测一次源文件，之后用有界线程池并行提取各片段"""
+        stream_info = probe_video_stream(self.media_path)
+        duration = stream_info['duration'] if stream_info else 0
+        ext = os.path.splitext(self.media_path)[1] or '.mp4'
+        if stream_info is None:
+            # 没有视频流时按音频导出
+            ext = '.m4a'
+
+        pad = Config.CLIP_EXPORT['pad_ms']
+        jobs = []
+        for index, clip in enumerate(self.ranges, 1):
+            start = max(0, clip['start_time'] - pad)
+            end = clip['end_time'] + pad
+            if duration:
+                end = min(end, duration)
+            if end <= start:
+                continue
+            output_path = os.path.join(self.output_dir, clip_file_name(index, clip['start_time'], clip.get('text'), ext))
+            jobs.append((start, end, output_path))
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        outputs, errors = [], []
+        total = len(jobs)
+        logger.info(f"开始并行提取 {total} 个片段，线程数: {clip_workers()}")
+
+        with ThreadPoolExecutor(max_workers=clip_workers()) as executor:
+            futures = {executor.submit(self._extract_clip, start, end, output_path): output_path
+                       for start, end, output_path in jobs}
+            for done, future in enumerate(as_completed(futures), 1):
+                output_path = futures[future]
+                error = future.result()
+                if error:
+                    errors.append(f"{os.path.basename(output_path)}: {error}")
+                else:
+                    outputs.append(output_path)
+                    self.clip_finished_signal.emit(output_path)
+                self.progress_signal.emit(done * 100 // total, f"已导出 {done}/{total} 个片段")
+
+        logger.info(f"片段导出完成，成功 {len(outputs)} 个，失败 {len(errors)} 个")
+        self.finished_signal.emit(sorted(outputs), errors)
+
+    def _extract_clip(self, start, end, output_path):
+        """提取单个片段，返回错误信息，成功时返回None"""
+        if self.is_cancelled:
+            return "已取消"
+
+        cmd = [
+            "ffmpeg",
+            "-y",
+            "-ss", f"{start / 1000.0:.3f}",
+            "-i", self.media_path,
+            "-t", f"{(end - start) / 1000.0:.3f}"
+        ]
+        if output_path.endswith('.m4a'):
+            cmd += ["-vn", "-c:a", "aac", "-b:a", "192k"]
+        else:
+            # 直接复制时起点会对齐到关键帧，需要精确切点时重新编码
+            cmd += Config.CLIP_EXPORT['codec_args']
+        cmd.append(output_path)
+
+        try:
+            returncode, stderr = run_ffmpeg(cmd)
+        except Exception as e:
+            return str(e)
+        if returncode != 0:
+            logger.error(f"提取片段失败: {output_path}, {stderr}")
+            return "FFmpeg执行失败"
+        return None
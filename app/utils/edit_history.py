@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from collections import deque
+from app.config import Config
+
+# 记录类型
+MARK = 'mark'  # ('mark', 新增标记的字范围, 取消标记的字范围)
+SUBTITLES = 'subtitles'  # ('subtitles', 起始下标, 被替换的字幕, 替换后的字幕)
+OFFSET = 'offset'  # ('offset', 偏移毫秒数)
+
+
+class EditHistory:
+    """撤销/重做历史
+
+    每条记录只保存变化量（标记的字范围、被替换的字幕片段、时间偏移），不保存整体快照，
+    撤销和重做的开销与变化大小成正比。记录数量超过上限时丢弃最早的记录。
+    """
+
+    def __init__(self, max_entries=None):
+        max_entries = max_entries or Config.EDIT_HISTORY['max_entries']
+        self.undo_stack = deque(maxlen=max_entries)
+        self.redo_stack = deque(maxlen=max_entries)
+
+    def clear(self):
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+
+    def can_undo(self):
+        return bool(self.undo_stack)
+
+    def can_redo(self):
+        return bool(self.redo_stack)
+
+    def push(self, entry):
+        """记录一次修改，新的修改会清空重做历史；连续的时间偏移合并为一条"""
+        if (entry[0] == OFFSET and self.undo_stack and self.undo_stack[-1][0] == OFFSET
+                and not self.redo_stack):
+            entry = (OFFSET, self.undo_stack.pop()[1] + entry[1])
+        self.undo_stack.append(entry)
+        self.redo_stack.clear()
+
+    def push_mark(self, added, removed=()):
+        """记录标记变化，没有实际变化时不记录"""
+        if added or removed:
+            self.push((MARK, tuple(added), tuple(removed)))
+
+    def push_subtitles(self, index, old_subtitles, new_subtitles):
+        """记录字幕片段替换（合并、分割）"""
+        self.push((SUBTITLES, index, list(old_subtitles), list(new_subtitles)))
+
+    def push_offset(self, offset_ms):
+        """记录整体时间偏移"""
+        if offset_ms:
+            self.push((OFFSET, offset_ms))
+
+    def undo(self):
+        """取出需要撤销的记录，没有时返回None"""
+        if not self.undo_stack:
+            return None
+        entry = self.undo_stack.pop()
+        self.redo_stack.append(entry)
+        return entry
+
+    def redo(self):
+        """取出需要重做的记录，没有时返回None"""
+        if not self.redo_stack:
+            return None
+        entry = self.redo_stack.pop()
+        self.undo_stack.append(entry)
+        return entry
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import subprocess
+import threading
+from collections import deque
+
+# Windows下隐藏FFmpeg控制台窗口，其他平台没有该标志
+CREATE_NO_WINDOW = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+
+
+class FFmpegProgressParser:
+    """解析FFmpeg -progress 管道输出的键值对
+
+    FFmpeg每隔一段时间输出一组 key=value 行，以 progress=continue/end 结尾。
+    """
+
+    def __init__(self):
+        self.fields = {}
+
+    def feed_line(self, line):
+        """输入一行输出，凑齐一组时返回进度快照，否则返回None"""
+        line = line.strip()
+        if '=' not in line:
+            return None
+
+        key, value = line.split('=', 1)
+        key = key.strip()
+        value = value.strip()
+        self.fields[key] = value
+
+        if key != 'progress':
+            return None
+
+        snapshot = {
+            'out_time_ms': self._out_time_ms(),
+            'speed': self._speed(),
+            'total_size': self._int_field('total_size'),
+            'finished': value == 'end'
+        }
+        self.fields = {}
+        return snapshot
+
+    def _int_field(self, key):
+        """读取整数字段，N/A等无效值返回0"""
+        try:
+            return int(self.fields.get(key, 0))
+        except ValueError:
+            return 0
+
+    def _out_time_ms(self):
+        """当前已输出的媒体时间（毫秒）"""
+        # out_time_ms 实际上也是微秒，优先使用 out_time_us
+        for key in ('out_time_us', 'out_time_ms'):
+            if key in self.fields:
+                value = self._int_field(key)
+                if value > 0:
+                    return value // 1000
+
+        # 回退到 HH:MM:SS.micro 格式
+        out_time = self.fields.get('out_time', '')
+        try:
+            hours, minutes, seconds = out_time.split(':')
+            return int((int(hours) * 3600 + int(minutes) * 60 + float(seconds)) * 1000)
+        except ValueError:
+            return 0
+
+    def _speed(self):
+        """处理速度（相对实时的倍数），未知时返回0"""
+        speed = self.fields.get('speed', '').rstrip('x').strip()
+        try:
+            return float(speed)
+        except ValueError:
+            return 0.0
+
+
+def open_ffmpeg(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, text=True):
+    """启动FFmpeg进程，并在后台线程中持续读取stderr
+
+    Returns:
+        (进程对象, 获取stderr末尾若干行的函数)
+    """
+    process = subprocess.Popen(cmd,
+                               stdin=stdin,
+                               stdout=stdout,
+                               stderr=subprocess.PIPE,
+                               text=text,
+                               encoding="utf-8" if text else None,
+                               errors="replace" if text else None,
+                               creationflags=CREATE_NO_WINDOW)
+
+    # stderr单独线程读取，避免管道写满导致FFmpeg阻塞
+    stderr_tail = deque(maxlen=50)
+
+    def drain_stderr():
+        for line in process.stderr:
+            if isinstance(line, bytes):
+                line = line.decode("utf-8", errors="replace")
+            stderr_tail.append(line.rstrip())
+
+    stderr_thread = threading.Thread(target=drain_stderr, daemon=True)
+    stderr_thread.start()
+
+    def get_stderr():
+        stderr_thread.join()
+        return "\n".join(stderr_tail)
+
+    return process, get_stderr
+
+
+def run_ffmpeg(cmd, on_progress=None):
+    """执行FFmpeg命令并增量解析进度
+
+    Args:
+        cmd: FFmpeg命令列表，第一个元素为ffmpeg可执行文件
+        on_progress: 进度回调，参数为 FFmpegProgressParser 生成的快照
+
+    Returns:
+        (返回码, stderr末尾若干行)
+    """
+    cmd = [cmd[0], "-progress", "pipe:1", "-nostats"] + list(cmd[1:])
+    process, get_stderr = open_ffmpeg(cmd)
+
+    parser = FFmpegProgressParser()
+    for line in process.stdout:
+        snapshot = parser.feed_line(line)
+        if snapshot and on_progress:
+            on_progress(snapshot)
+
+    returncode = process.wait()
+    return returncode, get_stderr()
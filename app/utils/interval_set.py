@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from bisect import bisect_left, bisect_right
+
+
+class IntervalSet:
+    """整数区间集合，用于保存被标记删除的字下标
+
+    内部保存按顺序排列、互不重叠也不相邻的半开区间 [start, end)，
+    区间的增加、删除和切换只处理受影响的区间，并返回实际发生变化的范围。
+    每次修改后 version 加一，供依赖标记的缓存判断是否失效。
+    """
+
+    def __init__(self, intervals=()):
+        self.starts = []
+        self.ends = []
+        self.version = 0
+        for start, end in intervals:
+            self.add(start, end)
+
+    def __bool__(self):
+        return bool(self.starts)
+
+    def __len__(self):
+        """被标记的下标总数"""
+        return sum(end - start for start, end in zip(self.starts, self.ends))
+
+    def __contains__(self, index):
+        i = bisect_right(self.starts, index) - 1
+        return i >= 0 and index < self.ends[i]
+
+    def __iter__(self):
+        for start, end in zip(self.starts, self.ends):
+            yield from range(start, end)
+
+    def __repr__(self):
+        return f"IntervalSet({list(self.intervals())})"
+
+    def intervals(self):
+        """所有区间 [(start, end), ...]"""
+        return zip(self.starts, self.ends)
+
+    def clear(self):
+        self.starts = []
+        self.ends = []
+        self.version += 1
+
+    def _overlapping(self, start, end):
+        """与 [start, end] 重叠或相邻的区间下标范围 [lo, hi)"""
+        lo = bisect_left(self.ends, start)
+        hi = bisect_right(self.starts, end)
+        return lo, hi
+
+    def gaps(self, start, end):
+        """[start, end) 中未被标记的子范围"""
+        result = []
+        position = start
+        lo = bisect_right(self.ends, start)
+        for i in range(lo, len(self.starts)):
+            if self.starts[i] >= end:
+                break
+            if self.starts[i] > position:
+                result.append((position, self.starts[i]))
+            position = max(position, self.ends[i])
+        if position < end:
+            result.append((position, end))
+        return result
+
+    def covered(self, start, end):
+        """[start, end) 中已被标记的子范围"""
+        result = []
+        lo = bisect_right(self.ends, start)
+        for i in range(lo, len(self.starts)):
+            if self.starts[i] >= end:
+                break
+            result.append((max(start, self.starts[i]), min(end, self.ends[i])))
+        return result
+
+    def add(self, start, end):
+        """标记 [start, end)
+
+        Returns:
+            新增标记的子范围列表
+        """
+        if start >= end:
+            return []
+        added = self.gaps(start, end)
+        if not added:
+            return []
+
+        lo, hi = self._overlapping(start, end)
+        if lo < hi:
+            start = min(start, self.starts[lo])
+            end = max(end, self.ends[hi - 1])
+        self.starts[lo:hi] = [start]
+        self.ends[lo:hi] = [end]
+        self.version += 1
+        return added
+
+    def remove(self, start, end):
+        """取消标记 [start, end)
+
+        Returns:
+            被取消标记的子范围列表
+        """
+        if start >= end:
+            return []
+        removed = self.covered(start, end)
+        if not removed:
+            return []
+
+        lo = bisect_right(self.ends, start)
+        hi = bisect_left(self.starts, end)
+        # 保留被切开的区间两端
+        new_starts, new_ends = [], []
+        if self.starts[lo] < start:
+            new_starts.append(self.starts[lo])
+            new_ends.append(start)
+        if self.ends[hi - 1] > end:
+            new_starts.append(end)
+            new_ends.append(self.ends[hi - 1])
+        self.starts[lo:hi] = new_starts
+        self.ends[lo:hi] = new_ends
+        self.version += 1
+        return removed
+
+    def toggle(self, start, end):
+        """切换 [start, end) 中每个下标的标记状态
+
+        Returns:
+            (新增标记的子范围列表, 被取消标记的子范围列表)
+        """
+        added = self.gaps(start, end)
+        removed = self.covered(start, end)
+        for sub_start, sub_end in removed:
+            self.remove(sub_start, sub_end)
+        for sub_start, sub_end in added:
+            self.add(sub_start, sub_end)
+        return added, removed
@@ -0,0 +1,20 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import hashlib
+from app.config import Config
+
+
+def media_fingerprint(media_path):
+    """根据路径、大小和修改时间生成媒体文件指纹，文件变化后缓存自动失效"""
+    stat = os.stat(media_path)
+    key = f"{os.path.abspath(media_path)}|{stat.st_size}|{stat.st_mtime_ns}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+
+def get_cache_dir(name):
+    """获取（并创建）指定类别的缓存目录"""
+    cache_dir = Config.ROOT_DIR / Config.CACHE_DIR / name
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
@@ -0,0 +1,197 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""剪辑计划优化
+
+在剪辑计划和渲染之间减少剪切点：合并间隔很近的删除片段、去掉过短的保留片段，
+并可选地把剪切点吸附到附近的关键帧，每减少一个保留片段就少一次FFmpeg切割。
+"""
+
+import os
+import json
+import subprocess
+from bisect import bisect_left, bisect_right
+from app.config import Config
+from app.utils.logger import setup_logger
+from app.utils.ffmpeg_progress import CREATE_NO_WINDOW
+from app.utils.media_cache import media_fingerprint, get_cache_dir
+
+logger = setup_logger(__name__)
+
+
+def merge_segments(segments, gap_ms=0):
+    """排序并合并重叠或间隔不超过 gap_ms 的时间段"""
+    merged = []
+    for start, end in sorted(segments):
+        if merged and start - merged[-1][1] <= gap_ms:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def count_keep_segments(delete_segments, duration):
+    """删除片段之外保留片段的数量（即需要切割的次数）"""
+    count = 0
+    last_end = 0
+    for start, end in delete_segments:
+        if start > last_end:
+            count += 1
+        last_end = max(last_end, end)
+    if last_end < duration:
+        count += 1
+    return count
+
+
+def keep_segments(delete_segments, duration):
+    """删除片段（已排序合并）之外的保留片段列表"""
+    keep = []
+    last_end = 0
+    for start, end in delete_segments:
+        if start > last_end:
+            keep.append((last_end, start))
+        last_end = max(last_end, end)
+    if last_end < duration:
+        keep.append((last_end, duration))
+    return keep
+
+
+def encoded_duration(delete_segments, duration, keyframes=None):
+    """渲染时需要处理的总时长（毫秒）
+
+    直接复制编码时每个保留片段从开始之前最近的关键帧读起，提供关键帧时计入这段多处理的内容，
+    否则即保留片段的总时长。
+    """
+    total = 0
+    for start, end in keep_segments(delete_segments, duration):
+        if keyframes:
+            i = bisect_right(keyframes, start) - 1
+            if i >= 0:
+                start = keyframes[i]
+        total += end - start
+    return total
+
+
+def snap_to_keyframes(delete_segments, keyframes, tolerance_ms):
+    """将删除片段的结束（即下一个保留片段的开始）吸附到 tolerance_ms 内最近的关键帧
+
+    直接复制编码时保留片段只能从关键帧开始，吸附后切点与实际输出一致。
+
+    Returns:
+        (吸附后的删除片段, 吸附的切点数)
+    """
+    if not keyframes:
+        return list(delete_segments), 0
+
+    snapped = []
+    count = 0
+    for start, end in delete_segments:
+        i = bisect_left(keyframes, end)
+        candidates = [keyframes[j] for j in (i - 1, i) if 0 <= j < len(keyframes)]
+        nearest = min(candidates, key=lambda keyframe: abs(keyframe - end))
+        if nearest != end and abs(nearest - end) <= tolerance_ms and nearest > start:
+            end = nearest
+            count += 1
+        snapped.append((start, end))
+    return snapped, count
+
+
+def optimize_plan(delete_segments, duration, keyframes=None):
+    """优化删除片段列表
+
+    Args:
+        delete_segments: 需要删除的时间段列表，格式为[(start_time, end_time), ...]
+        duration: 媒体总时长（毫秒）
+        keyframes: 关键帧时间列表（毫秒，升序），提供时把切点吸附到关键帧
+
+    Returns:
+        (优化后的删除片段列表, 报告字典)
+    """
+    options = Config.PLAN_OPTIMIZER
+    original = merge_segments(delete_segments)
+    cuts_before = count_keep_segments(original, duration)
+    kept_before = duration - sum(end - start for start, end in original)
+    encoded_before = encoded_duration(original, duration, keyframes)
+
+    # 合并间隔很近的删除片段
+    segments = merge_segments(original, options['merge_gap_ms'])
+
+    # 吸附到关键帧后重新合并
+    snapped = 0
+    if keyframes:
+        segments, snapped = snap_to_keyframes(segments, keyframes, options['keyframe_tolerance_ms'])
+        segments = merge_segments(segments)
+
+    # 去掉过短的保留片段：并入相邻的删除片段（包括开头和结尾），会删掉这部分内容
+    min_keep = options['min_keep_ms']
+    if min_keep > 0 and segments:
+        keep_before = keep_segments(segments, duration)
+        segments = merge_segments(segments, min_keep)
+        if segments[0][0] < min_keep:
+            segments[0] = (0, segments[0][1])
+        if duration - segments[-1][1] < min_keep:
+            segments[-1] = (segments[-1][0], duration)
+        # 过短的保留片段只会整段并入删除片段，逐个记录被丢弃的内容
+        remaining = set(keep_segments(segments, duration))
+        for start, end in keep_before:
+            if (start, end) not in remaining:
+                logger.info(f"丢弃过短的保留片段: {start} - {end} ms（{end - start} ms）")
+
+    cuts_after = count_keep_segments(segments, duration)
+    kept_after = duration - sum(end - start for start, end in segments)
+    encoded_after = encoded_duration(segments, duration, keyframes)
+    report = {
+        'cuts_before': cuts_before,
+        'cuts_after': cuts_after,
+        'cuts_saved': cuts_before - cuts_after,
+        'snapped': snapped,
+        # 少处理（切割/编码）的时长（毫秒），包括去掉的剪切点在关键帧之前多读的部分
+        'reencode_ms_saved': encoded_before - encoded_after,
+        # 相比原计划多删除的内容时长（毫秒），为负表示吸附关键帧后多保留了内容
+        'removed_ms': kept_before - kept_after
+    }
+    return segments, report
+
+
+def get_keyframes_cache_path(media_path):
+    """关键帧索引缓存路径"""
+    return str(get_cache_dir('keyframes') / f"{media_fingerprint(media_path)}.json")
+
+
+def probe_keyframes(media_path):
+    """获取视频关键帧时间列表（毫秒，升序），结果按媒体指纹缓存，失败时返回空列表"""
+    try:
+        cache_path = get_keyframes_cache_path(media_path)
+        if os.path.exists(cache_path):
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+
+        # 只解码关键帧
+        cmd = [
+            "ffprobe",
+            "-v", "error",
+            "-select_streams", "v:0",
+            "-skip_frame", "nokey",
+            "-show_entries", "frame=pts_time",
+            "-of", "csv=p=0",
+            media_path
+        ]
+        result = subprocess.run(cmd,
+                                stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE,
+                                text=True,
+                                creationflags=CREATE_NO_WINDOW)
+        if result.returncode != 0:
+            logger.error(f"获取关键帧失败: {result.stderr}")
+            return []
+
+        keyframes = sorted(int(float(line.strip().rstrip(',')) * 1000)
+                           for line in result.stdout.splitlines()
+                           if line.strip().rstrip(',') not in ('', 'N/A'))
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump(keyframes, f)
+        logger.info(f"关键帧索引已缓存: {len(keyframes)} 个")
+        return keyframes
+    except Exception as e:
+        logger.error(f"获取关键帧异常: {str(e)}")
+        return []
@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+无界面剪辑计划渲染器
+
+读取 MainWindow.export_edit_plan 导出的 JSON 剪辑计划（{video_path, segments, subtitles}），
+在多个工作进程中并行调用 VideoProcessor 渲染，并输出机器可读的运行摘要。
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from app.config import Config
+
+
+def _log_to_stderr():
+    """将控制台日志改为输出到stderr，保证stdout只包含运行摘要"""
+    Config.LOGGING['handlers']['console']['stream'] = 'ext://sys.stderr'
+
+
+def collect_plan_files(paths):
+    """收集剪辑计划文件，目录下的所有 .json 文件都视为剪辑计划"""
+    plan_files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.lower().endswith('.json'):
+                    plan_files.append(os.path.join(path, name))
+        else:
+            plan_files.append(path)
+    return plan_files
+
+
+def load_plan(plan_path):
+    """读取剪辑计划
+
+    Returns:
+        (视频路径, 删除时间段列表, 计划中指定的输出路径或None, 字幕列表或None)
+    """
+    with open(plan_path, 'r', encoding='utf-8') as f:
+        plan = json.load(f)
+    video_path = plan['video_path']
+    segments = [(int(start), int(end)) for start, end in plan['segments']]
+    return video_path, segments, plan.get('output_path'), plan.get('subtitles')
+
+
+def default_output_path(video_path, output_dir=None, suffix="_cut"):
+    """根据原视频路径生成输出路径"""
+    video_name, ext = os.path.splitext(os.path.basename(video_path))
+    output_dir = output_dir or os.path.dirname(video_path)
+    return os.path.join(output_dir, f"{video_name}{suffix}{ext or '.mp4'}")
+
+
+def render_plan(plan_path, output_dir=None, suffix="_cut"):
+    """渲染单个剪辑计划（在工作进程中执行）
+
+    Returns:
+        该计划的运行结果字典
+    """
+    from app.utils.video_processor import VideoProcessor
+
+    started = time.monotonic()
+    result = {
+        'plan': plan_path,
+        'video_path': None,
+        'output_path': None,
+        'success': False,
+        'error': None,
+        'segments': 0,
+        'elapsed': 0.0
+    }
+
+    try:
+        video_path, segments, output_path, subtitles = load_plan(plan_path)
+        output_path = output_path or default_output_path(video_path, output_dir, suffix)
+        result.update(video_path=video_path, output_path=output_path, segments=len(segments))
+
+        processor = VideoProcessor()
+        processor.process_completed.connect(lambda path: result.update(success=True))
+        processor.process_error.connect(lambda message: result.update(success=False, error=message))
+        processor.export(video_path, segments, output_path, subtitles)
+    except Exception as e:
+        result.update(success=False, error=f"{type(e).__name__}: {str(e)}")
+
+    result['elapsed'] = round(time.monotonic() - started, 3)
+    return result
+
+
+def render_plans(plan_files, output_dir=None, suffix="_cut", workers=None):
+    """并行渲染多个剪辑计划
+
+    Returns:
+        运行摘要字典
+    """
+    workers = workers or max(1, (os.cpu_count() or 2) // 2)
+    started = time.monotonic()
+    results = []
+
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_log_to_stderr) as executor:
+        futures = [executor.submit(render_plan, plan_path, output_dir, suffix) for plan_path in plan_files]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            status = "成功" if result['success'] else f"失败: {result['error']}"
+            print(f"[{len(results)}/{len(plan_files)}] {result['plan']} {status} ({result['elapsed']}s)",
+                  file=sys.stderr)
+
+    # 按输入顺序输出
+    order = {plan_path: i for i, plan_path in enumerate(plan_files)}
+    results.sort(key=lambda result: order[result['plan']])
+
+    return {
+        'workers': workers,
+        'total': len(results),
+        'succeeded': len([result for result in results if result['success']]),
+        'failed': len([result for result in results if not result['success']]),
+        'elapsed': round(time.monotonic() - started, 3),
+        'plans': results
+    }
+
+
+def main(argv=None):
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="渲染 snipCay 导出的剪辑计划（JSON）")
+    parser.add_argument("plans", nargs="+", help="剪辑计划文件或包含剪辑计划的目录")
+    parser.add_argument("-o", "--output-dir", help="输出目录，默认为原视频所在目录")
+    parser.add_argument("-s", "--suffix", default="_cut", help="输出文件名后缀，默认 _cut")
+    parser.add_argument("-j", "--jobs", type=int, default=0, help="并行进程数，默认为CPU核数的一半")
+    parser.add_argument("--summary", default="-", help="运行摘要JSON输出路径，默认输出到stdout")
+    args = parser.parse_args(argv)
+
+    _log_to_stderr()
+
+    plan_files = collect_plan_files(args.plans)
+    if not plan_files:
+        print("没有找到剪辑计划文件", file=sys.stderr)
+        return 2
+
+    summary = render_plans(plan_files, args.output_dir, args.suffix, args.jobs or None)
+
+    if args.summary == "-":
+        json.dump(summary, sys.stdout, ensure_ascii=False)
+        sys.stdout.write("\n")
+    else:
+        with open(args.summary, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+
+    return 0 if summary['failed'] == 0 else 1
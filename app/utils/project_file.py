@@ -0,0 +1,219 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import json
+import mmap
+import struct
+from array import array
+from itertools import accumulate
+from app.config import Config
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# 文件格式（小端）：
+#   文件头   magic(4s) 版本(H) 段数(H)
+#   段表     每段 标签(4s) 偏移(Q) 长度(Q)
+#   段内容   每段按8字节对齐
+# 字幕时间为 float64 数组（毫秒，分割字幕会产生小数），逐字时间和标记为 int64 数组（毫秒 / 字下标），
+# 均成对存放；文本为 uint32 字符偏移表加一段UTF-8文本。字幕除时间和文本外的字段（如 id）
+# 以JSON保存在 META 段中。打开时整个文件内存映射，数组直接按段转换，文本只解码一次再按偏移切分。
+MAGIC = b'SCPJ'
+VERSION = 2
+# 版本1的字幕时间为 int64，没有其他字段，仍可读取
+SUPPORTED_VERSIONS = (1, 2)
+HEADER = struct.Struct('<4sHH')
+SECTION = struct.Struct('<4sQQ')
+
+SUBTITLE_TIMES = b'STIM'  # 字幕 [start, end, ...]（float64）
+SUBTITLE_OFFSETS = b'SOFF'  # 字幕文本偏移
+SUBTITLE_TEXT = b'STXT'
+WORD_TIMES = b'WTIM'  # 逐字 [start, end, ...]
+WORD_OFFSETS = b'WOFF'
+WORD_TEXT = b'WTXT'
+MARKS = b'MARK'  # 删除标记区间 [start, end, ...]
+META = b'META'  # JSON：设置、字幕的其他字段
+
+
+# 单独存放在数组和文本段中的字幕字段
+_SUBTITLE_KEYS = ('start_time', 'end_time', 'text')
+
+
+class ProjectFileError(Exception):
+    """工程文件格式错误"""
+
+
+class ProjectData:
+    """工程文件内容"""
+
+    def __init__(self, subtitles=None, words=None, marks=None, settings=None):
+        self.subtitles = subtitles or []  # [{'start_time', 'end_time', 'text', 其他字段如 'id'}, ...]
+        self.words = words or []  # [{'word', 'start', 'end'}, ...]
+        self.marks = marks or []  # 删除标记的字下标区间 [(start, end), ...]
+        self.settings = settings or {}
+
+
+def get_project_path(media_path):
+    """媒体对应的工程文件路径（与SRT文件同在 srt 子目录下）"""
+    srt_dir = os.path.join(os.path.dirname(media_path), 'srt')
+    video_name = os.path.splitext(os.path.basename(media_path))[0]
+    return os.path.join(srt_dir, f"{video_name}{Config.PROJECT['extension']}")
+
+
+def _int_array(values):
+    data = array('q', (int(value) for value in values))
+    if sys.byteorder != 'little':
+        data.byteswap()
+    return data.tobytes()
+
+
+def _float_array(values):
+    data = array('d', values)
+    if sys.byteorder != 'little':
+        data.byteswap()
+    return data.tobytes()
+
+
+def _text_sections(texts):
+    """文本列表转换为 (字符偏移表, UTF-8文本)"""
+    offsets = array('I', accumulate((len(text) for text in texts), initial=0))
+    if sys.byteorder != 'little':
+        offsets.byteswap()
+    return offsets.tobytes(), ''.join(texts).encode('utf-8')
+
+
+def _extra_fields(subtitles):
+    """字幕中时间和文本以外的字段 {下标: {字段: 值}}，没有其他字段的字幕不记录"""
+    extra = {}
+    for i, subtitle in enumerate(subtitles):
+        fields = {key: value for key, value in subtitle.items() if key not in _SUBTITLE_KEYS}
+        if fields:
+            extra[str(i)] = fields
+    return extra
+
+
+def write_project(path, project):
+    """写入工程文件（先写临时文件再替换，写入中断不会损坏已有文件）
+
+    字幕的所有字段都会保存，时间保留小数；逐字时间和删除标记按整数保存。
+
+    Args:
+        path: 工程文件路径
+        project: ProjectData
+    """
+    subtitle_offsets, subtitle_text = _text_sections([sub.get('text', '') for sub in project.subtitles])
+    word_offsets, word_text = _text_sections([word.get('word', '') for word in project.words])
+    sections = [
+        (SUBTITLE_TIMES, _float_array(t for sub in project.subtitles
+                                      for t in (sub.get('start_time', 0), sub.get('end_time', 0)))),
+        (SUBTITLE_OFFSETS, subtitle_offsets),
+        (SUBTITLE_TEXT, subtitle_text),
+        (WORD_TIMES, _int_array(t for word in project.words for t in (word['start'], word['end']))),
+        (WORD_OFFSETS, word_offsets),
+        (WORD_TEXT, word_text),
+        (MARKS, _int_array(i for interval in project.marks for i in interval)),
+        (META, json.dumps({'settings': project.settings, 'subtitle_fields': _extra_fields(project.subtitles)},
+                          ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+    ]
+
+    # 计算各段偏移（8字节对齐）
+    offset = HEADER.size + SECTION.size * len(sections)
+    table = []
+    for tag, data in sections:
+        offset = (offset + 7) & ~7
+        table.append((tag, offset, len(data)))
+        offset += len(data)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.part"
+    with open(temp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(sections)))
+        for entry in table:
+            f.write(SECTION.pack(*entry))
+        for (tag, data), (_, section_offset, _) in zip(sections, table):
+            f.write(b'\0' * (section_offset - f.tell()))
+            f.write(data)
+    os.replace(temp_path, path)
+    logger.info(f"工程文件已保存: {path}")
+
+
+def _read_ints(view, section, typecode='q'):
+    offset, length = section
+    data = array(typecode)
+    data.frombytes(view[offset:offset + length])
+    if sys.byteorder != 'little':
+        data.byteswap()
+    return data
+
+
+def _time_value(value):
+    """整数毫秒还原为 int，保持与转录结果相同的类型"""
+    return int(value) if value.is_integer() else value
+
+
+def _read_texts(view, offsets_section, text_section):
+    offsets = _read_ints(view, offsets_section, 'I')
+    offset, length = text_section
+    text = str(view[offset:offset + length], 'utf-8')
+    offsets = offsets.tolist()
+    return [text[start:end] for start, end in zip(offsets, offsets[1:])]
+
+
+def read_project(path):
+    """读取工程文件
+
+    Returns:
+        ProjectData
+
+    Raises:
+        ProjectFileError: 文件不是工程文件或版本不支持
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size < HEADER.size:
+            raise ProjectFileError(f"工程文件不完整: {path}")
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mm)
+    try:
+        magic, version, count = HEADER.unpack_from(view, 0)
+        if magic != MAGIC:
+            raise ProjectFileError(f"不是工程文件: {path}")
+        if version not in SUPPORTED_VERSIONS:
+            raise ProjectFileError(f"不支持的工程文件版本 {version}: {path}")
+        sections = {}
+        for i in range(count):
+            tag, offset, length = SECTION.unpack_from(view, HEADER.size + i * SECTION.size)
+            if offset + length > len(view):
+                raise ProjectFileError(f"工程文件不完整: {path}")
+            sections[tag] = (offset, length)
+        missing = {SUBTITLE_TIMES, SUBTITLE_OFFSETS, SUBTITLE_TEXT, WORD_TIMES,
+                   WORD_OFFSETS, WORD_TEXT, MARKS, META} - sections.keys()
+        if missing:
+            raise ProjectFileError(f"工程文件缺少数据段 {sorted(missing)}: {path}")
+
+        if version == 1:
+            times = _read_ints(view, sections[SUBTITLE_TIMES]).tolist()
+        else:
+            times = [_time_value(t) for t in _read_ints(view, sections[SUBTITLE_TIMES], 'd')]
+        texts = _read_texts(view, sections[SUBTITLE_OFFSETS], sections[SUBTITLE_TEXT])
+        subtitles = [{'start_time': start, 'end_time': end, 'text': text}
+                     for start, end, text in zip(times[0::2], times[1::2], texts)]
+
+        times = _read_ints(view, sections[WORD_TIMES]).tolist()
+        texts = _read_texts(view, sections[WORD_OFFSETS], sections[WORD_TEXT])
+        words = [{'word': text, 'start': start, 'end': end}
+                 for start, end, text in zip(times[0::2], times[1::2], texts)]
+
+        marks = _read_ints(view, sections[MARKS]).tolist()
+        marks = list(zip(marks[0::2], marks[1::2]))
+
+        offset, length = sections[META]
+        meta = json.loads(str(view[offset:offset + length], 'utf-8'))
+    finally:
+        view.release()
+        mm.close()
+
+    for i, fields in meta.get('subtitle_fields', {}).items():
+        subtitles[int(i)].update(fields)
+    return ProjectData(subtitles, words, marks, meta.get('settings'))
@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import subprocess
+from PyQt6.QtCore import QThread, pyqtSignal
+from app.config import Config
+from app.utils.logger import setup_logger
+from app.utils.ffmpeg_progress import run_ffmpeg, CREATE_NO_WINDOW
+from app.utils.media_cache import media_fingerprint, get_cache_dir
+
+logger = setup_logger(__name__)
+
+
+def get_proxy_path(media_path):
+    """代理文件在缓存中的路径（不保证已存在）"""
+    return str(get_cache_dir('proxy') / f"{media_fingerprint(media_path)}.mp4")
+
+
+def find_proxy(media_path):
+    """返回已生成的代理文件路径，没有时返回None"""
+    try:
+        proxy_path = get_proxy_path(media_path)
+    except OSError:
+        return None
+    return proxy_path if os.path.exists(proxy_path) else None
+
+
+def probe_video_stream(media_path):
+    """获取第一条视频流的宽、高、编码和媒体时长，没有视频流时返回None"""
+    cmd = [
+        "ffprobe",
+        "-v", "error",
+        "-select_streams", "v:0",
+        "-show_entries", "stream=width,height,codec_name:format=duration",
+        "-of", "json",
+        media_path
+    ]
+    try:
+        result = subprocess.run(cmd,
+                                stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE,
+                                text=True,
+                                creationflags=CREATE_NO_WINDOW)
+        if result.returncode != 0:
+            logger.error(f"获取视频信息失败: {result.stderr}")
+            return None
+        data = json.loads(result.stdout)
+        streams = data.get('streams', [])
+        if not streams:
+            return None
+        stream = streams[0]
+        return {
+            'width': int(stream.get('width', 0)),
+            'height': int(stream.get('height', 0)),
+            'codec': stream.get('codec_name', ''),
+            'duration': int(float(data.get('format', {}).get('duration', 0)) * 1000)
+        }
+    except Exception as e:
+        logger.error(f"获取视频信息异常: {str(e)}")
+        return None
+
+
+def needs_proxy(stream_info):
+    """判断是否需要为该视频生成代理：高分辨率或解码开销大的编码"""
+    if not Config.PROXY['enabled'] or not stream_info:
+        return False
+    return (stream_info['height'] > Config.PROXY['min_source_height'] or
+            stream_info['codec'] in Config.PROXY['heavy_codecs'])
+
+
+class ProxyGenerateThread(QThread):
+    """后台生成低分辨率短GOP代理文件，用于流畅播放和拖动"""
+
+    # 定义信号
+    progress_signal = pyqtSignal(str, int)  # 原始文件路径, 进度百分比
+    finished_signal = pyqtSignal(str, str)  # 原始文件路径, 代理文件路径
+    error_signal = pyqtSignal(str, str)  # 原始文件路径, 错误信息
+
+    def __init__(self, media_path):
+        """初始化代理生成线程"""
+        super().__init__()
+        self.media_path = media_path
+
+    def run(self):
+        """生成代理文件，先写入临时文件，成功后再改名，避免留下不完整的代理"""
+        try:
+            proxy_path = find_proxy(self.media_path)
+            if proxy_path:
+                self.finished_signal.emit(self.media_path, proxy_path)
+                return
+
+            stream_info = probe_video_stream(self.media_path)
+            if not needs_proxy(stream_info):
+                return
+
+            proxy_path = get_proxy_path(self.media_path)
+            temp_path = proxy_path + ".part.mp4"
+            gop = str(Config.PROXY['gop'])
+            cmd = [
+                "ffmpeg",
+                "-y",
+                "-i", self.media_path,
+                "-map", "0:v:0",
+                "-map", "0:a:0?",
+                "-vf", f"scale=-2:{Config.PROXY['height']}",
+                "-c:v", "libx264",
+                "-preset", "ultrafast",
+                "-tune", "fastdecode",
+                "-crf", str(Config.PROXY['crf']),
+                "-g", gop,  # 短GOP，拖动时只需解码少量帧
+                "-keyint_min", gop,
+                "-c:a", "aac",
+                "-b:a", "128k",
+                "-movflags", "+faststart",
+                temp_path
+            ]
+
+            duration = stream_info['duration'] or 1
+
+            def on_progress(snapshot):
+                self.progress_signal.emit(self.media_path, min(99, snapshot['out_time_ms'] * 100 // duration))
+
+            logger.info(f"开始生成代理文件: {self.media_path}")
+            returncode, stderr = run_ffmpeg(cmd, on_progress)
+            if returncode != 0:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                logger.error(f"生成代理文件失败: {stderr}")
+                self.error_signal.emit(self.media_path, "生成代理文件失败")
+                return
+
+            os.replace(temp_path, proxy_path)
+            logger.info(f"代理文件已生成: {proxy_path}")
+            self.progress_signal.emit(self.media_path, 100)
+            self.finished_signal.emit(self.media_path, proxy_path)
+        except Exception as e:
+            logger.error(f"生成代理文件异常: {str(e)}")
+            self.error_signal.emit(self.media_path, str(e))
@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import glob
+import json
+import time
+import uuid
+import hashlib
+import threading
+from app.config import Config
+from app.utils.logger import setup_logger
+from app.utils.media_cache import media_fingerprint, get_cache_dir
+
+logger = setup_logger(__name__)
+
+# 占用标记文件扩展名：<key>.<进程号>-<随机串>.inuse，存在时该片段不会被淘汰
+IN_USE_EXT = ".inuse"
+# 超过该时间仍未删除的占用标记和临时文件视为崩溃任务遗留（秒）
+STALE_SEC = 24 * 3600
+# 同一进程内的多个导出任务串行淘汰
+_evict_lock = threading.Lock()
+
+
+class SegmentCache:
+    """保留片段渲染缓存
+
+    每个片段按 (源文件指纹, 开始, 结束, 编码参数) 缓存为一个文件，重新导出时边界未变的片段直接复用，
+    缓存总大小超过上限时按最近使用时间淘汰。
+    缓存目录由所有导出任务（包括其他进程）共用：任务在查找或写入片段前先登记占用（acquire），
+    合并完成后释放（release），有占用标记的片段不会被淘汰。
+    """
+
+    def __init__(self):
+        """初始化缓存目录"""
+        self.cache_dir = str(get_cache_dir('segments'))
+
+    def make_key(self, media_path, start, end, codec_args):
+        """生成片段缓存键"""
+        key = json.dumps([media_fingerprint(media_path), int(start), int(end), list(codec_args)])
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    def get_path(self, key, ext=".mp4"):
+        """片段缓存文件路径"""
+        return os.path.join(self.cache_dir, key + ext)
+
+    def acquire(self, key):
+        """登记片段正在被当前任务使用，需在 lookup/commit 之前调用
+
+        Returns:
+            占用标记文件路径，使用完后传给 release
+        """
+        marker = os.path.join(self.cache_dir, f"{key}.{os.getpid()}-{uuid.uuid4().hex[:8]}{IN_USE_EXT}")
+        with open(marker, 'w'):
+            pass
+        return marker
+
+    def release(self, markers):
+        """释放片段占用"""
+        for marker in markers:
+            try:
+                os.remove(marker)
+            except OSError:
+                pass
+
+    def _in_use(self, key):
+        return bool(glob.glob(os.path.join(glob.escape(self.cache_dir), f"{key}.*{IN_USE_EXT}")))
+
+    def lookup(self, key, ext=".mp4"):
+        """查找已缓存的片段，命中时更新使用时间并返回路径，否则返回None"""
+        path = self.get_path(key, ext)
+        if not os.path.exists(path):
+            return None
+        os.utime(path)
+        return path
+
+    def temp_path(self, key, ext=".mp4"):
+        """写入缓存前使用的临时路径，多个导出任务同时写同一片段时互不影响"""
+        return os.path.join(self.cache_dir, f"{key}.{uuid.uuid4().hex[:8]}.part{ext}")
+
+    def commit(self, temp_path, key, ext=".mp4"):
+        """将渲染完成的临时文件放入缓存，返回缓存路径"""
+        path = self.get_path(key, ext)
+        os.replace(temp_path, path)
+        return path
+
+    def evict(self):
+        """缓存超过上限时按最近使用时间删除最旧的片段
+
+        正在被任何任务使用的片段不删除；同时清理崩溃任务遗留的占用标记和临时文件。
+        """
+        with _evict_lock:
+            now = time.time()
+            entries = []
+            in_use = set()
+            total_size = 0
+            for entry in os.scandir(self.cache_dir):
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+                stale = now - stat.st_mtime > STALE_SEC
+                if entry.name.endswith(IN_USE_EXT) or '.part' in entry.name:
+                    if stale:
+                        self._remove(entry.path, "遗留文件")
+                    elif entry.name.endswith(IN_USE_EXT):
+                        in_use.add(entry.name.split('.', 1)[0])
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total_size += stat.st_size
+
+            max_size = Config.SEGMENT_CACHE['max_cache_mb'] * 1024 * 1024
+            for _, size, path in sorted(entries):
+                if total_size <= max_size:
+                    break
+                key = os.path.basename(path).split('.', 1)[0]
+                if key not in in_use and self._remove_unused(path, key):
+                    total_size -= size
+
+    def _remove_unused(self, path, key):
+        """删除未被占用的片段
+
+        先改名使其他任务查找不到，再确认期间没有任务登记占用（其他进程可能刚登记并查找到该片段），
+        有占用时改回原名。
+        """
+        evicting_path = os.path.join(self.cache_dir, f"{key}.{uuid.uuid4().hex[:8]}.part.evict")
+        try:
+            os.replace(path, evicting_path)
+        except OSError:
+            return False
+        if self._in_use(key):
+            os.replace(evicting_path, path)
+            return False
+        return self._remove(evicting_path, "片段缓存超出上限")
+
+    def _remove(self, path, reason):
+        try:
+            os.remove(path)
+            logger.debug(f"{reason}，已删除: {path}")
+            return True
+        except OSError as e:
+            logger.warning(f"删除片段缓存失败: {path}, 错误: {str(e)}")
+            return False
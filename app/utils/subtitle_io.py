@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import re
+import json
+import gzip
+
+# 时间行：00:00:01,000 --> 00:00:02,500（毫秒分隔符兼容 , 和 .）
+_TIME_LINE = re.compile(
+    r'(\d+):(\d+):(\d+)[,.](\d+)\s*-->\s*(\d+):(\d+):(\d+)[,.](\d+)')
+# 条目之间的空行（允许只包含空白字符）
+_BLOCK_SEPARATOR = re.compile(r'\n[ \t]*\n')
+
+# 流式写入时每次写出的字幕条数和逐字数
+_WRITE_CHUNK = 1000
+_WORDS_CHUNK = 10000
+
+
+def ms_to_srt_time(ms):
+    """将毫秒转换为SRT时间格式 (00:00:00,000)"""
+    s, ms = divmod(int(ms), 1000)
+    m, s = divmod(s, 60)
+    h, m = divmod(m, 60)
+    return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
+
+
+def get_transcription_paths(media_path):
+    """媒体对应的字幕和逐字稿文件路径（媒体目录的 srt 子目录下）
+
+    Returns:
+        (srt_path, words_path)
+    """
+    srt_dir = os.path.join(os.path.dirname(media_path), 'srt')
+    video_name = os.path.splitext(os.path.basename(media_path))[0]
+    return (os.path.join(srt_dir, f"{video_name}.srt"),
+            os.path.join(srt_dir, f"{video_name}.words.json"))
+
+
+def write_srt(subtitles, output_path):
+    """将字幕列表写入SRT文件（按块拼接后写出，不在内存中生成整个文件）
+
+    Args:
+        subtitles: 字幕列表，每项包含 start_time/end_time（毫秒）和 text
+        output_path: SRT文件路径
+    """
+    with open(output_path, 'w', encoding='utf-8') as f:
+        chunk = []
+        for i, sub in enumerate(subtitles, 1):
+            chunk.append(f"{i}\n{ms_to_srt_time(sub['start_time'])} --> {ms_to_srt_time(sub['end_time'])}\n{sub['text']}\n\n")
+            if len(chunk) >= _WRITE_CHUNK:
+                f.write(''.join(chunk))
+                chunk.clear()
+        f.write(''.join(chunk))
+
+
+def parse_srt(content):
+    """解析SRT文本
+
+    Returns:
+        字幕列表 [{'text', 'start_time', 'end_time'}, ...]（时间为毫秒）
+    """
+    content = content.lstrip('\ufeff').replace('\r\n', '\n').replace('\r', '\n')
+    subtitles = []
+    for block in _BLOCK_SEPARATOR.split(content):
+        lines = block.strip('\n').split('\n')
+        # 时间行通常是第二行（第一行为序号），也兼容没有序号的条目
+        for i in range(min(2, len(lines))):
+            match = _TIME_LINE.search(lines[i])
+            if match:
+                break
+        else:
+            continue
+        h1, m1, s1, ms1, h2, m2, s2, ms2 = map(int, match.groups())
+        subtitles.append({
+            'text': '\n'.join(lines[i + 1:]).strip(),
+            'start_time': ((h1 * 60 + m1) * 60 + s1) * 1000 + ms1,
+            'end_time': ((h2 * 60 + m2) * 60 + s2) * 1000 + ms2
+        })
+    return subtitles
+
+
+def read_srt(srt_path):
+    """读取SRT文件（UTF-8，兼容BOM）"""
+    with open(srt_path, 'r', encoding='utf-8-sig') as f:
+        return parse_srt(f.read())
+
+
+def write_words(words, output_path):
+    """将逐字时间戳写入紧凑JSON文件
+
+    按块用 json.dumps 编码后写出（json.dump 逐项写出，大列表时慢很多），结果仍是一个JSON数组。
+    """
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write('[')
+        for i in range(0, len(words), _WORDS_CHUNK):
+            if i:
+                f.write(',')
+            # 去掉每块的方括号后拼接
+            f.write(json.dumps(words[i:i + _WORDS_CHUNK], ensure_ascii=False, separators=(',', ':'))[1:-1])
+        f.write(']')
+
+
+def read_words(words_path):
+    """读取逐字时间戳JSON文件"""
+    with open(words_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_transcription(media_path, subtitles, words, raw_result=None):
+    """保存一次转录的输出文件：SRT字幕、逐字稿JSON，以及可选的原始识别结果（gzip压缩）
+
+    Args:
+        media_path: 媒体文件路径，输出文件放在其目录的 srt 子目录下
+        subtitles: 字幕列表
+        words: 逐字时间戳列表
+        raw_result: 识别模型的原始结果，None 表示不保存
+
+    Returns:
+        (srt_path, words_path)
+    """
+    srt_path, words_path = get_transcription_paths(media_path)
+    os.makedirs(os.path.dirname(srt_path), exist_ok=True)
+    write_srt(subtitles, srt_path)
+    write_words(words or [], words_path)
+    if raw_result is not None:
+        raw_path = f"{os.path.splitext(srt_path)[0]}.raw.json.gz"
+        with gzip.open(raw_path, 'wt', encoding='utf-8') as f:
+            json.dump(raw_result, f, ensure_ascii=False, separators=(',', ':'), default=str)
+    return srt_path, words_path
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from bisect import bisect_right
+from itertools import accumulate
+
+
+class SubtitleTrack:
+    """按开始时间排序的字幕索引，用于播放时查找当前字幕
+
+    查找先二分定位开始时间不晚于当前时间的最后一条字幕，再借助结束时间的前缀最大值向前检查
+    仍覆盖当前时间的字幕（字幕重叠时也与按列表顺序逐条查找的结果一致），通常只需检查一两条。
+    整体时间偏移只记录在 offset 中，不修改字幕字典，需要写回时调用 apply_offset。
+    """
+
+    def __init__(self, subtitles=None):
+        """初始化
+
+        Args:
+            subtitles: 字幕列表（字典列表，包含 start_time/end_time/text），索引只保存引用
+        """
+        self.rebuild(subtitles)
+
+    def rebuild(self, subtitles):
+        """字幕数据变化后重建索引"""
+        self.subtitles = subtitles or []
+        self.order = sorted(range(len(self.subtitles)),
+                            key=lambda i: self.subtitles[i].get('start_time', 0))
+        self.starts = [self.subtitles[i].get('start_time', 0) for i in self.order]
+        self.ends = [self.subtitles[i].get('end_time', 0) for i in self.order]
+        self.max_ends = list(accumulate(self.ends, max))  # ends 的前缀最大值
+        self.offset = 0  # 尚未写回字幕字典的整体偏移（毫秒）
+
+    def __len__(self):
+        return len(self.order)
+
+    def shift(self, offset_ms):
+        """整体平移所有字幕时间（O(1)，不修改字幕字典）"""
+        self.offset += offset_ms
+
+    def apply_offset(self):
+        """将累计的偏移写回字幕字典"""
+        if not self.offset:
+            return
+        for subtitle in self.subtitles:
+            subtitle['start_time'] = subtitle.get('start_time', 0) + self.offset
+            subtitle['end_time'] = subtitle.get('end_time', 0) + self.offset
+        self.starts = [start + self.offset for start in self.starts]
+        self.ends = [end + self.offset for end in self.ends]
+        self.max_ends = [end + self.offset for end in self.max_ends]
+        self.offset = 0
+
+    def _covering(self, position):
+        """覆盖指定时间点（已减去偏移）的字幕的排序位置列表"""
+        result = []
+        pos = bisect_right(self.starts, position) - 1
+        # max_ends[pos] 小于当前时间时，更早的字幕都已结束
+        while pos >= 0 and self.max_ends[pos] >= position:
+            if self.ends[pos] >= position:
+                result.append(pos)
+            pos -= 1
+        return result
+
+    def find(self, position):
+        """查找指定时间点的字幕，有多条字幕覆盖时返回列表中靠前的一条
+
+        Returns:
+            字幕在原列表中的下标，没有字幕时返回-1
+        """
+        covering = self._covering(position - self.offset)
+        return min(self.order[pos] for pos in covering) if covering else -1
+
+    def active_text(self, position):
+        """指定时间点的字幕文本，没有字幕时返回None"""
+        index = self.find(position)
+        return self.subtitles[index].get('text', '') if index >= 0 else None
+
+    def next_boundary(self, position):
+        """指定时间点之后当前字幕可能变化的最早时间（下一条字幕开始或覆盖当前时间的字幕结束）
+
+        Returns:
+            时间点（毫秒，已包含偏移），之后不会再变化时返回None
+        """
+        if not self.order:
+            return None
+        position -= self.offset
+        pos = bisect_right(self.starts, position)
+        boundaries = [self.starts[pos]] if pos < len(self.starts) else []
+        # 结束时间本身仍显示该字幕，下一毫秒才变化
+        boundaries.extend(self.ends[k] + 1 for k in self._covering(position))
+        return min(boundaries) + self.offset if boundaries else None
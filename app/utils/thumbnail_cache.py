@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import time
+import shutil
+from PyQt6.QtCore import QThread, pyqtSignal, QRect
+from PyQt6.QtGui import QPixmap
+from app.config import Config
+from app.utils.logger import setup_logger
+from app.utils.ffmpeg_progress import run_ffmpeg
+from app.utils.media_cache import media_fingerprint, get_cache_dir
+from app.utils.proxy_generator import find_proxy, probe_video_stream
+
+logger = setup_logger(__name__)
+
+META_FILE = "meta.json"
+
+
+def get_thumbnail_dir(media_path):
+    """缩略图缓存目录（每个媒体文件一个子目录）"""
+    return str(get_cache_dir('thumbnails') / media_fingerprint(media_path))
+
+
+def find_thumbnails(media_path):
+    """返回已生成的缩略图目录，没有时返回None"""
+    try:
+        thumb_dir = get_thumbnail_dir(media_path)
+    except OSError:
+        return None
+    return thumb_dir if os.path.exists(os.path.join(thumb_dir, META_FILE)) else None
+
+
+def evict_thumbnail_cache(keep_dir=None):
+    """缓存总大小超过上限时，按最近使用时间删除最旧的缩略图目录"""
+    root = get_cache_dir('thumbnails')
+    entries = []
+    total_size = 0
+    for name in os.listdir(root):
+        path = os.path.join(root, name)
+        if not os.path.isdir(path):
+            continue
+        size = sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+        meta_path = os.path.join(path, META_FILE)
+        last_used = os.path.getmtime(meta_path) if os.path.exists(meta_path) else 0
+        entries.append((last_used, size, path))
+        total_size += size
+
+    max_size = Config.THUMBNAILS['max_cache_mb'] * 1024 * 1024
+    for last_used, size, path in sorted(entries):
+        if total_size <= max_size:
+            break
+        if path == keep_dir:
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+        total_size -= size
+        logger.info(f"缩略图缓存超出上限，已删除: {path}")
+
+
+class ThumbnailSprites:
+    """缩略图精灵图：每张图按行列排列固定间隔的缩略图"""
+
+    def __init__(self, thumb_dir):
+        """从缓存目录加载元数据，精灵图在首次使用时才读取"""
+        self.thumb_dir = thumb_dir
+        meta_path = os.path.join(thumb_dir, META_FILE)
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        self.interval_ms = meta['interval_ms']
+        self.columns = meta['columns']
+        self.rows = meta['rows']
+        self.tile_width = meta['tile_width']
+        self.tile_height = meta['tile_height']
+        self.sprite_files = meta['sprites']
+        self.count = meta['count']
+        self.sprites = {}  # {精灵图序号: QPixmap}
+
+        # 更新使用时间，供缓存淘汰参考
+        os.utime(meta_path)
+
+    def get_thumbnail(self, position_ms):
+        """获取指定时间点的缩略图，没有时返回None"""
+        index = min(max(int(position_ms // self.interval_ms), 0), self.count - 1)
+        if index < 0:
+            return None
+
+        per_sprite = self.columns * self.rows
+        sprite_index, tile_index = divmod(index, per_sprite)
+        if sprite_index >= len(self.sprite_files):
+            return None
+
+        sprite = self.sprites.get(sprite_index)
+        if sprite is None:
+            sprite = QPixmap(os.path.join(self.thumb_dir, self.sprite_files[sprite_index]))
+            if sprite.isNull():
+                return None
+            self.sprites[sprite_index] = sprite
+
+        row, column = divmod(tile_index, self.columns)
+        return sprite.copy(QRect(column * self.tile_width, row * self.tile_height,
+                                 self.tile_width, self.tile_height))
+
+
+class ThumbnailExtractThread(QThread):
+    """后台一次解码生成缩略图精灵图"""
+
+    # 定义信号
+    progress_signal = pyqtSignal(str, int)  # 媒体路径, 进度百分比
+    finished_signal = pyqtSignal(str, str)  # 媒体路径, 缩略图目录
+    error_signal = pyqtSignal(str, str)  # 媒体路径, 错误信息
+
+    def __init__(self, media_path):
+        """初始化缩略图生成线程"""
+        super().__init__()
+        self.media_path = media_path
+
+    def run(self):
+        """生成缩略图，先写入临时目录，完成后再改名"""
+        try:
+            thumb_dir = find_thumbnails(self.media_path)
+            if thumb_dir:
+                self.finished_signal.emit(self.media_path, thumb_dir)
+                return
+
+            stream_info = probe_video_stream(self.media_path)
+            if not stream_info or not stream_info['width']:
+                return
+
+            interval = Config.THUMBNAILS['interval_sec']
+            width = Config.THUMBNAILS['width']
+            columns = Config.THUMBNAILS['columns']
+            rows = Config.THUMBNAILS['rows']
+            # 缩略图尺寸按原始宽高比计算，高度取偶数
+            height = int(width * stream_info['height'] / stream_info['width']) // 2 * 2
+
+            thumb_dir = get_thumbnail_dir(self.media_path)
+            temp_dir = thumb_dir + ".part"
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            os.makedirs(temp_dir)
+
+            # 有代理文件时从代理解码，速度更快
+            source = find_proxy(self.media_path) or self.media_path
+            cmd = [
+                "ffmpeg",
+                "-y",
+                "-skip_frame", "nokey" if Config.THUMBNAILS['keyframes_only'] else "default",
+                "-i", source,
+                "-an",
+                "-vf", f"fps=1/{interval},scale={width}:{height},tile={columns}x{rows}",
+                "-q:v", "5",
+                os.path.join(temp_dir, "sprite_%04d.jpg")
+            ]
+
+            duration = stream_info['duration'] or 1
+
+            def on_progress(snapshot):
+                self.progress_signal.emit(self.media_path, min(99, snapshot['out_time_ms'] * 100 // duration))
+
+            logger.info(f"开始生成缩略图: {self.media_path}")
+            returncode, stderr = run_ffmpeg(cmd, on_progress)
+            if returncode != 0:
+                shutil.rmtree(temp_dir, ignore_errors=True)
+                logger.error(f"生成缩略图失败: {stderr}")
+                self.error_signal.emit(self.media_path, "生成缩略图失败")
+                return
+
+            sprites = sorted(name for name in os.listdir(temp_dir) if name.endswith('.jpg'))
+            meta = {
+                'interval_ms': interval * 1000,
+                'columns': columns,
+                'rows': rows,
+                'tile_width': width,
+                'tile_height': height,
+                'sprites': sprites,
+                'count': max(1, -(-duration // (interval * 1000))),
+                'created': time.time()
+            }
+            with open(os.path.join(temp_dir, META_FILE), 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+
+            shutil.rmtree(thumb_dir, ignore_errors=True)
+            os.replace(temp_dir, thumb_dir)
+            evict_thumbnail_cache(keep_dir=thumb_dir)
+
+            logger.info(f"缩略图已生成: {thumb_dir}")
+            self.progress_signal.emit(self.media_path, 100)
+            self.finished_signal.emit(self.media_path, thumb_dir)
+        except Exception as e:
+            logger.error(f"生成缩略图异常: {str(e)}")
+            self.error_signal.emit(self.media_path, str(e))
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from bisect import bisect_right
+
+
+class TimelineMap:
+    """原始时间轴到剪辑后时间轴的映射
+
+    保留片段按开始时间排序，并预先计算每个片段在输出中的起点，
+    单次映射只需一次二分查找。
+    """
+
+    def __init__(self, keep_segments):
+        """初始化
+
+        Args:
+            keep_segments: 保留的时间段列表，格式为[(start_time, end_time), ...]（毫秒，已排序且不重叠）
+        """
+        self.starts = [start for start, _ in keep_segments]
+        self.ends = [end for _, end in keep_segments]
+        self.offsets = []  # 每个保留片段在输出中的起点
+        total = 0
+        for start, end in keep_segments:
+            self.offsets.append(total)
+            total += end - start
+        self.duration = total
+
+    def map_time(self, time_ms):
+        """映射单个时间点，该时间点被删除时返回None"""
+        i = bisect_right(self.starts, time_ms) - 1
+        if i >= 0 and time_ms <= self.ends[i]:
+            return self.offsets[i] + time_ms - self.starts[i]
+        return None
+
+    def map_range(self, start_ms, end_ms):
+        """映射时间段，只保留其中未被删除的部分
+
+        Returns:
+            (输出开始时间, 输出结束时间)，整个时间段都被删除时返回None
+        """
+        # 开始时间：不早于 start_ms 的第一个保留时刻
+        i = bisect_right(self.starts, start_ms) - 1
+        if i >= 0 and start_ms < self.ends[i]:
+            out_start = self.offsets[i] + start_ms - self.starts[i]
+        elif i + 1 < len(self.starts) and self.starts[i + 1] < end_ms:
+            out_start = self.offsets[i + 1]
+        else:
+            return None
+
+        # 结束时间：不晚于 end_ms 的最后一个保留时刻
+        k = bisect_right(self.starts, end_ms) - 1
+        if k < 0:
+            return None
+        out_end = self.offsets[k] + min(end_ms, self.ends[k]) - self.starts[k]
+
+        if out_end <= out_start:
+            return None
+        return out_start, out_end
+
+
+def retime_subtitles(subtitles, keep_segments, min_duration=100):
+    """计算剪辑后的字幕时间
+
+    Args:
+        subtitles: 原始字幕列表，每项包含 start_time/end_time/text
+        keep_segments: 保留的时间段列表
+        min_duration: 剪辑后短于该时长（毫秒）的字幕将被丢弃
+
+    Returns:
+        新的字幕列表
+    """
+    timeline = TimelineMap(keep_segments)
+    retimed = []
+    for subtitle in subtitles:
+        mapped = timeline.map_range(subtitle.get('start_time', 0), subtitle.get('end_time', 0))
+        if mapped and mapped[1] - mapped[0] >= min_duration:
+            retimed.append({
+                'id': len(retimed) + 1,
+                'start_time': int(mapped[0]),
+                'end_time': int(mapped[1]),
+                'text': subtitle.get('text', '')
+            })
+    return retimed
@@ -3,25 +3,44 @@
 
 import os
 import json
+import time
 import tempfile
 import subprocess
 from pathlib import Path
 from PyQt6.QtCore import QObject, pyqtSignal
+from app.config import Config
 from app.utils.logger import setup_logger
+from app.utils.ffmpeg_progress import run_ffmpeg, open_ffmpeg, CREATE_NO_WINDOW
+from app.utils.audio_cutter import PCMCutter
+from app.utils.timeline_mapping import retime_subtitles
+from app.utils.subtitle_io import write_srt
+from app.utils.proxy_generator import probe_video_stream
+from app.utils.segment_cache import SegmentCache
+from app.utils.plan_optimizer import optimize_plan, probe_keyframes
 
 class VideoProcessor(QObject):
     """视频处理器类，用于处理视频剪辑和合并操作"""
     
     # 定义信号
     progress_updated = pyqtSignal(int, str)
+    progress_stats = pyqtSignal(dict)  # 详细进度：百分比、速度、吞吐量、剩余时间等
     process_completed = pyqtSignal(str)
     process_error = pyqtSignal(str)
+    plan_optimized = pyqtSignal(dict)  # 剪辑计划优化报告：减少的剪切点数、少处理的时长等
     
     def __init__(self):
         super().__init__()
         self.logger = setup_logger(__name__)
         self.temp_dir = None
         self.segment_files = []
+        self.segment_cache = None  # 本次导出使用的片段缓存
+        self.cache_markers = []  # 本次导出占用的缓存片段标记，合并完成后释放
+        
+        # 进度统计：所有FFmpeg阶段需要处理的媒体总时长（毫秒）及已完成部分
+        self._total_work_ms = 0
+        self._done_work_ms = 0
+        self._output_ms = 0
+        self._start_time = 0
     
     def _create_temp_dir(self):
         """创建临时目录"""
@@ -55,7 +74,7 @@ class VideoProcessor(QObject):
                                    stdout=subprocess.PIPE, 
                                    stderr=subprocess.PIPE,
                                    text=True,
-                                   creationflags=subprocess.CREATE_NO_WINDOW)
+                                   creationflags=CREATE_NO_WINDOW)
             if result.returncode == 0:
                 self.logger.info("FFmpeg可用")
                 return True
@@ -66,13 +85,178 @@ class VideoProcessor(QObject):
             self.logger.error(f"FFmpeg检查异常: {str(e)}")
             return False
     
-    def process_video(self, video_path, segments, output_path):
+    def is_audio_output(self, output_path):
+        """输出路径是否为音频格式"""
+        ext = os.path.splitext(output_path)[1].lower()
+        return ext in Config.AUDIO_EXPORT['codecs']
+    
+    def export(self, media_path, segments, output_path, subtitles=None):
+        """根据输出格式选择视频或音频导出
+        
+        Args:
+            media_path: 原始媒体路径
+            segments: 需要删除的时间段列表，格式为[(start_time, end_time), ...]
+            output_path: 输出路径
+            subtitles: 原始字幕列表，提供时同时输出与剪辑结果对齐的字幕
+        """
+        if self.is_audio_output(output_path):
+            self.process_audio(media_path, segments, output_path, subtitles=subtitles)
+        else:
+            self.process_video(media_path, segments, output_path, subtitles=subtitles)
+    
+    def process_audio(self, media_path, segments, output_path, fade_ms=None, subtitles=None):
+        """仅导出音频：一次解码为PCM，在内存流中裁剪拼接后直接编码输出
+        
+        Args:
+            media_path: 原始视频或音频路径
+            segments: 需要删除的时间段列表，格式为[(start_time, end_time), ...]
+            output_path: 输出音频路径，格式由扩展名决定（wav/flac/mp3/m4a/aac）
+            fade_ms: 剪切点淡入淡出时长（毫秒），默认使用配置
+            subtitles: 原始字幕列表，提供时在输出旁写入对齐后的SRT
+        """
+        if not self._check_ffmpeg():
+            self.process_error.emit("FFmpeg不可用，请确保已安装FFmpeg并添加到系统路径")
+            return
+        
+        if not os.path.exists(media_path):
+            self.process_error.emit(f"媒体文件不存在: {media_path}")
+            return
+        
+        ext = os.path.splitext(output_path)[1].lower()
+        codec_args = Config.AUDIO_EXPORT['codecs'].get(ext)
+        if codec_args is None:
+            self.process_error.emit(f"不支持的音频输出格式: {ext}")
+            return
+        
+        if fade_ms is None:
+            fade_ms = Config.AUDIO_EXPORT['fade_ms']
+        
+        try:
+            duration = self._get_video_duration(media_path)
+            if duration <= 0:
+                self.process_error.emit("无法获取媒体时长")
+                return
+            
+            sample_rate, channels = self._get_audio_format(media_path)
+            if not sample_rate:
+                self.process_error.emit("媒体文件中没有音频流")
+                return
+            
+            # 与视频导出使用相同的剪辑计划，保证切点一致
+            segments = self._optimize_segments(media_path, segments, duration)
+            keep_segments = self._calculate_keep_segments(segments, duration)
+            if not keep_segments:
+                self.process_error.emit("没有可保留的音频片段")
+                return
+            
+            self._write_retimed_subtitles(subtitles, keep_segments, output_path)
+            
+            keep_duration = sum(end - start for start, end in keep_segments)
+            # 解码需要读到最后一个保留片段结束为止
+            self._start_progress(keep_segments[-1][1], keep_duration)
+            
+            pcm_format = ["-f", "s16le", "-ar", str(sample_rate), "-ac", str(channels)]
+            decode_cmd = ["ffmpeg", "-v", "error", "-i", media_path, "-vn", "-acodec", "pcm_s16le"] + pcm_format + ["pipe:1"]
+            encode_cmd = ["ffmpeg", "-y", "-v", "error"] + pcm_format + ["-i", "pipe:0"] + codec_args + [output_path]
+            
+            self.logger.info(f"导出音频 {len(keep_segments)} 个保留片段到: {output_path}")
+            success = self._cut_audio_stream(decode_cmd, encode_cmd, keep_segments,
+                                             sample_rate, channels, fade_ms, duration)
+            if not success:
+                self.process_error.emit("音频导出失败")
+                return
+            
+            self.progress_updated.emit(100, "音频导出完成")
+            self.process_completed.emit(output_path)
+        except Exception as e:
+            self.logger.error(f"音频处理异常: {str(e)}")
+            self.process_error.emit(f"音频处理异常: {str(e)}")
+    
+    def _cut_audio_stream(self, decode_cmd, encode_cmd, keep_segments, sample_rate, channels, fade_ms, duration):
+        """解码进程 -> PCM裁剪 -> 编码进程 的流式处理
+        
+        Returns:
+            是否成功
+        """
+        cutter = PCMCutter(keep_segments, sample_rate, channels, fade_ms, duration)
+        bytes_per_ms = sample_rate * channels * 2 / 1000.0
+        chunk_size = Config.AUDIO_EXPORT['chunk_size']
+        
+        decoder, decoder_stderr = open_ffmpeg(decode_cmd, text=False)
+        encoder, encoder_stderr = open_ffmpeg(encode_cmd, stdin=subprocess.PIPE,
+                                              stdout=subprocess.DEVNULL, text=False)
+        
+        read_bytes = 0
+        try:
+            while not cutter.finished:
+                data = decoder.stdout.read(chunk_size)
+                if not data:
+                    break
+                read_bytes += len(data)
+                output = cutter.feed(data)
+                if output:
+                    try:
+                        encoder.stdin.write(output)
+                    except BrokenPipeError:
+                        # 编码进程已退出，错误信息在下面从其 stderr 输出
+                        break
+                self._report_progress(read_bytes / bytes_per_ms, "正在导出音频", {})
+        finally:
+            # 保留片段已全部输出时提前结束解码
+            if decoder.poll() is None:
+                decoder.kill()
+            decoder.stdout.close()
+            try:
+                encoder.stdin.close()
+            except OSError:
+                # 编码进程已退出时关闭管道会再次触发 BrokenPipeError
+                pass
+        
+        decoder.wait()
+        encoder_code = encoder.wait()
+        if encoder_code != 0:
+            self.logger.error(f"音频编码失败: {encoder_stderr()}")
+            return False
+        if not cutter.finished:
+            self.logger.error(f"音频解码提前结束: {decoder_stderr()}")
+            return False
+        return True
+    
+    def _get_audio_format(self, media_path):
+        """获取第一条音频流的采样率和声道数，没有音频流时返回 (0, 0)"""
+        try:
+            cmd = [
+                "ffprobe",
+                "-v", "error",
+                "-select_streams", "a:0",
+                "-show_entries", "stream=sample_rate,channels",
+                "-of", "json",
+                media_path
+            ]
+            
+            result = subprocess.run(cmd, 
+                                   stdout=subprocess.PIPE, 
+                                   stderr=subprocess.PIPE,
+                                   text=True,
+                                   creationflags=CREATE_NO_WINDOW)
+            
+            streams = json.loads(result.stdout).get('streams', []) if result.returncode == 0 else []
+            if not streams:
+                self.logger.error(f"获取音频格式失败: {result.stderr}")
+                return 0, 0
+            return int(streams[0]['sample_rate']), int(streams[0]['channels'])
+        except Exception as e:
+            self.logger.error(f"获取音频格式异常: {str(e)}")
+            return 0, 0
+    
+    def process_video(self, video_path, segments, output_path, subtitles=None):
         """处理视频，根据时间段剪辑并合并
         
         Args:
             video_path: 原始视频路径
             segments: 需要删除的时间段列表，格式为[(start_time, end_time), ...]
             output_path: 输出视频路径
+            subtitles: 原始字幕列表，提供时输出对齐后的SRT，并按配置在合并时封装为软字幕
         """
         if not self._check_ffmpeg():
             self.process_error.emit("FFmpeg不可用，请确保已安装FFmpeg并添加到系统路径")
@@ -93,19 +277,29 @@ class VideoProcessor(QObject):
                 return
             
             # 计算需要保留的片段
+            segments = self._optimize_segments(video_path, segments, duration)
             keep_segments = self._calculate_keep_segments(segments, duration)
             if not keep_segments:
                 self.process_error.emit("没有可保留的视频片段")
                 return
             
-            # 切割视频片段
-            self.segment_files = self._cut_video_segments(video_path, keep_segments)
-            if not self.segment_files:
+            # 字幕按保留片段重新计时
+            subtitle_path = self._write_retimed_subtitles(subtitles, keep_segments, output_path)
+            if not Config.EXPORT['mux_subtitles']:
+                subtitle_path = None
+            
+            # 切割和合并各需处理一遍保留片段的总时长
+            keep_duration = sum(end - start for start, end in keep_segments)
+            self._start_progress(keep_duration * 2, keep_duration)
+            
+            # 切割视频片段（边界未变的片段直接使用缓存）
+            segment_paths = self._cut_video_segments(video_path, keep_segments)
+            if not segment_paths:
                 self.process_error.emit("视频切割失败")
                 return
             
             # 合并视频片段
-            success = self._merge_video_segments(self.segment_files, output_path)
+            success = self._merge_video_segments(segment_paths, output_path, subtitle_path)
             if not success:
                 self.process_error.emit("视频合并失败")
                 return
@@ -115,9 +309,143 @@ class VideoProcessor(QObject):
             self.logger.error(f"视频处理异常: {str(e)}")
             self.process_error.emit(f"视频处理异常: {str(e)}")
         finally:
+            # 合并结束后才释放缓存片段并淘汰，避免淘汰正在使用的片段
+            self._release_segment_cache()
             # 清理临时文件
             self._cleanup_temp_files()
     
+    def _release_segment_cache(self):
+        """释放本次导出占用的缓存片段，缓存超出上限时淘汰未被使用的片段"""
+        if not self.segment_cache:
+            return
+        self.segment_cache.release(self.cache_markers)
+        self.cache_markers = []
+        try:
+            self.segment_cache.evict()
+        except OSError as e:
+            self.logger.warning(f"片段缓存淘汰失败: {str(e)}")
+        self.segment_cache = None
+    
+    def get_rendition_paths(self, output_base, profile_names=None):
+        """多版本导出时每个版本的输出路径
+        
+        Returns:
+            [(配置名, 输出路径), ...]
+        """
+        base = os.path.splitext(output_base)[0]
+        names = profile_names or Config.EXPORT['default_profiles']
+        return [(name, f"{base}{Config.EXPORT_PROFILES[name]['suffix']}{Config.EXPORT_PROFILES[name]['ext']}")
+                for name in names]
+    
+    def export_renditions(self, media_path, segments, output_base, profile_names=None, subtitles=None):
+        """一次解码同时输出多个版本（如1080p、720p和仅音频）
+        
+        保留片段通过 select/aselect 滤镜在解码后筛选，再用 split/asplit 分给各个版本分别缩放和编码，
+        整个过程只有一个FFmpeg进程，源文件只解码一次，进度按输出时长统一上报。
+        
+        Args:
+            media_path: 原始媒体路径
+            segments: 需要删除的时间段列表，格式为[(start_time, end_time), ...]
+            output_base: 输出路径，各版本在文件名后追加配置中的后缀
+            profile_names: 导出配置名列表（见 Config.EXPORT_PROFILES），默认使用 Config.EXPORT['default_profiles']
+            subtitles: 原始字幕列表，提供时输出对齐后的SRT
+        """
+        if not self._check_ffmpeg():
+            self.process_error.emit("FFmpeg不可用，请确保已安装FFmpeg并添加到系统路径")
+            return
+        
+        if not os.path.exists(media_path):
+            self.process_error.emit(f"媒体文件不存在: {media_path}")
+            return
+        
+        self._create_temp_dir()
+        
+        try:
+            duration = self._get_video_duration(media_path)
+            if duration <= 0:
+                self.process_error.emit("无法获取媒体时长")
+                return
+            
+            segments = self._optimize_segments(media_path, segments, duration)
+            keep_segments = self._calculate_keep_segments(segments, duration)
+            if not keep_segments:
+                self.process_error.emit("没有可保留的片段")
+                return
+            
+            # 按源文件实际包含的流筛选版本
+            has_video = probe_video_stream(media_path) is not None
+            has_audio = self._get_audio_format(media_path)[0] > 0
+            renditions = []
+            for name, output_path in self.get_rendition_paths(output_base, profile_names):
+                profile = Config.EXPORT_PROFILES[name]
+                is_video = profile.get('height') is not None
+                if (is_video and not has_video) or (not is_video and not has_audio):
+                    self.logger.warning(f"源文件缺少所需的流，跳过版本: {name}")
+                    continue
+                renditions.append((name, profile, output_path))
+            if not renditions:
+                self.process_error.emit("没有可输出的版本")
+                return
+            
+            self._write_retimed_subtitles(subtitles, keep_segments, output_base)
+            
+            script_path = self._write_rendition_filter(keep_segments, renditions, has_audio)
+            cmd = ["ffmpeg", "-y", "-i", media_path, "-filter_complex_script", script_path]
+            video_index = 0
+            for audio_index, (name, profile, output_path) in enumerate(renditions):
+                if profile.get('height') is not None:
+                    cmd += ["-map", f"[vout{video_index}]"] + profile['video']
+                    video_index += 1
+                if has_audio:
+                    cmd += ["-map", f"[aout{audio_index}]"] + profile['audio']
+                cmd.append(output_path)
+            
+            # 所有版本在同一进程中输出，进度以保留片段总时长计
+            keep_duration = sum(end - start for start, end in keep_segments)
+            self._start_progress(keep_duration, keep_duration)
+            self.logger.info(f"一次解码导出 {len(renditions)} 个版本: {[name for name, _, _ in renditions]}")
+            returncode, stderr = self._run_ffmpeg(cmd, keep_duration, f"正在导出 {len(renditions)} 个版本")
+            if returncode != 0:
+                self.logger.error(f"多版本导出失败: {stderr}")
+                self.process_error.emit("多版本导出失败")
+                return
+            
+            self.progress_updated.emit(100, "多版本导出完成")
+            self.process_completed.emit("\n".join(output_path for _, _, output_path in renditions))
+        except Exception as e:
+            self.logger.error(f"多版本导出异常: {str(e)}")
+            self.process_error.emit(f"多版本导出异常: {str(e)}")
+        finally:
+            self._cleanup_temp_files()
+    
+    def _write_rendition_filter(self, keep_segments, renditions, has_audio):
+        """生成多版本导出的滤镜脚本，片段较多时滤镜表达式很长，写入文件避免命令行过长
+        
+        Returns:
+            滤镜脚本路径
+        """
+        selection = "+".join(f"between(t,{start / 1000.0:.3f},{end / 1000.0:.3f})"
+                             for start, end in keep_segments)
+        heights = [profile['height'] for _, profile, _ in renditions if profile.get('height') is not None]
+        
+        chains = []
+        if heights:
+            labels = "".join(f"[v{i}]" for i in range(len(heights)))
+            chains.append(f"[0:v]select='{selection}',setpts=N/FRAME_RATE/TB,split={len(heights)}{labels}")
+            # 不放大低于目标高度的源
+            for i, height in enumerate(heights):
+                chains.append(f"[v{i}]scale=-2:'min(ih,{height})'[vout{i}]")
+        if has_audio:
+            labels = "".join(f"[aout{i}]" for i in range(len(renditions)))
+            chains.append(f"[0:a]aselect='{selection}',asetpts=N/SR/TB,asplit={len(renditions)}{labels}")
+        
+        script_path = os.path.join(self.temp_dir, "renditions.filter")
+        with open(script_path, "w", encoding="utf-8") as f:
+            f.write(";\n".join(chains))
+        # 随切割片段一起清理
+        self.segment_files.append(script_path)
+        return script_path
+    
     def _get_video_duration(self, video_path):
         """获取视频时长（毫秒）"""
         try:
@@ -133,7 +461,7 @@ class VideoProcessor(QObject):
                                    stdout=subprocess.PIPE, 
                                    stderr=subprocess.PIPE,
                                    text=True,
-                                   creationflags=subprocess.CREATE_NO_WINDOW)
+                                   creationflags=CREATE_NO_WINDOW)
             
             if result.returncode == 0:
                 data = json.loads(result.stdout)
@@ -148,6 +476,23 @@ class VideoProcessor(QObject):
             self.logger.error(f"获取视频时长异常: {str(e)}")
             return 0
     
+    def _optimize_segments(self, media_path, segments, duration):
+        """渲染前优化剪辑计划，减少剪切点
+        
+        Returns:
+            优化后的删除片段列表
+        """
+        if not Config.PLAN_OPTIMIZER['enabled']:
+            return segments
+        
+        keyframes = probe_keyframes(media_path) if Config.PLAN_OPTIMIZER['snap_to_keyframes'] else None
+        optimized, report = optimize_plan(segments, duration, keyframes)
+        self.logger.info(f"剪辑计划优化: 剪切点 {report['cuts_before']} -> {report['cuts_after']}，"
+                         f"吸附关键帧 {report['snapped']} 处，少处理 {report['reencode_ms_saved'] / 1000.0:.2f} 秒，"
+                         f"多删除内容 {report['removed_ms'] / 1000.0:.2f} 秒")
+        self.plan_optimized.emit(report)
+        return optimized
+    
     def _calculate_keep_segments(self, delete_segments, duration):
         """计算需要保留的视频片段
         
@@ -181,6 +526,8 @@ class VideoProcessor(QObject):
     def _cut_video_segments(self, video_path, segments):
         """切割视频片段
         
+        启用片段缓存时，片段按 (源文件, 开始, 结束, 编码参数) 缓存，重新导出时只切割边界变化的片段。
+        
         Args:
             video_path: 原始视频路径
             segments: 需要保留的时间段列表，格式为[(start_time, end_time), ...]
@@ -188,17 +535,33 @@ class VideoProcessor(QObject):
         Returns:
             切割后的视频片段文件路径列表
         """
-        segment_files = []
+        segment_paths = []
         total_segments = len(segments)
+        codec_args = ["-c", "copy"]  # 复制编解码器（不重新编码）
+        cache = SegmentCache() if Config.SEGMENT_CACHE['enabled'] else None
+        self.segment_cache = cache
+        reused = 0
         
         for i, (start, end) in enumerate(segments):
             # 计算时长（秒）
             start_sec = start / 1000.0
             duration_sec = (end - start) / 1000.0
             
-            # 输出文件路径
-            output_file = os.path.join(self.temp_dir, f"segment_{i:03d}.mp4")
-            segment_files.append(output_file)
+            # 命中缓存时直接复用，按已处理计入进度
+            if cache:
+                key = cache.make_key(video_path, start, end, codec_args)
+                # 先登记占用再查找，合并完成前其他任务不会淘汰该片段
+                self.cache_markers.append(cache.acquire(key))
+                cached_path = cache.lookup(key)
+                if cached_path:
+                    segment_paths.append(cached_path)
+                    self._done_work_ms += end - start
+                    reused += 1
+                    continue
+                output_file = cache.temp_path(key)
+            else:
+                output_file = os.path.join(self.temp_dir, f"segment_{i:03d}.mp4")
+                self.segment_files.append(output_file)
             
             # 构建FFmpeg命令
             cmd = [
@@ -207,38 +570,40 @@ class VideoProcessor(QObject):
                 "-ss", f"{start_sec:.3f}",  # 开始时间
                 "-i", video_path,  # 输入文件
                 "-t", f"{duration_sec:.3f}",  # 持续时间
-                "-c", "copy",  # 复制编解码器（不重新编码）
+            ] + codec_args + [
                 output_file  # 输出文件
             ]
             
-            # 更新进度
-            progress_percent = int((i / total_segments) * 50)  # 切割占总进度的50%
-            self.progress_updated.emit(progress_percent, f"正在切割视频片段 {i+1}/{total_segments}")
-            
             # 执行命令
             try:
                 self.logger.info(f"切割视频片段 {i+1}/{total_segments}: {start_sec:.3f}s - {start_sec+duration_sec:.3f}s")
-                result = subprocess.run(cmd, 
-                                       stdout=subprocess.PIPE, 
-                                       stderr=subprocess.PIPE,
-                                       text=True,
-                                       creationflags=subprocess.CREATE_NO_WINDOW)
+                returncode, stderr = self._run_ffmpeg(cmd, end - start,
+                                                      f"正在切割视频片段 {i+1}/{total_segments}")
                 
-                if result.returncode != 0:
-                    self.logger.error(f"切割视频片段失败: {result.stderr}")
+                if returncode != 0:
+                    self.logger.error(f"切割视频片段失败: {stderr}")
+                    if cache and os.path.exists(output_file):
+                        os.remove(output_file)
                     return []
             except Exception as e:
                 self.logger.error(f"切割视频片段异常: {str(e)}")
+                if cache and os.path.exists(output_file):
+                    os.remove(output_file)
                 return []
+            
+            segment_paths.append(cache.commit(output_file, key) if cache else output_file)
         
-        return segment_files
+        if cache:
+            self.logger.info(f"复用缓存片段 {reused}/{total_segments} 个")
+        return segment_paths
     
-    def _merge_video_segments(self, segment_files, output_path):
+    def _merge_video_segments(self, segment_files, output_path, subtitle_path=None):
         """合并视频片段
         
         Args:
             segment_files: 视频片段文件路径列表
             output_path: 输出视频路径
+            subtitle_path: 需要同时封装为软字幕轨的SRT文件
             
         Returns:
             是否成功
@@ -250,7 +615,9 @@ class VideoProcessor(QObject):
         list_file = os.path.join(self.temp_dir, "segments.txt")
         with open(list_file, "w", encoding="utf-8") as f:
             for file in segment_files:
-                f.write(f"file '{file.replace('\\', '/')}\n")
+                path = file.replace('\\', '/')
+                f.write(f"file '{path}'\n")
+        self.segment_files.append(list_file)
         
         # 构建FFmpeg命令
         cmd = [
@@ -259,29 +626,127 @@ class VideoProcessor(QObject):
             "-f", "concat",  # 使用concat协议
             "-safe", "0",  # 允许绝对路径
             "-i", list_file,  # 输入文件列表
-            "-c", "copy",  # 复制编解码器（不重新编码）
-            output_path  # 输出文件
         ]
         
-        # 更新进度
-        self.progress_updated.emit(75, "正在合并视频片段")
+        # 在同一次合并中封装软字幕
+        subtitle_codec = self._subtitle_codec(output_path) if subtitle_path else None
+        if subtitle_codec:
+            cmd += ["-i", subtitle_path, "-map", "0:v?", "-map", "0:a?", "-map", "1:0",
+                    "-c", "copy", "-c:s", subtitle_codec]
+        else:
+            cmd += ["-c", "copy"]  # 复制编解码器（不重新编码）
+        cmd.append(output_path)  # 输出文件
         
         # 执行命令
         try:
             self.logger.info(f"合并 {len(segment_files)} 个视频片段到: {output_path}")
-            result = subprocess.run(cmd, 
-                                   stdout=subprocess.PIPE, 
-                                   stderr=subprocess.PIPE,
-                                   text=True,
-                                   creationflags=subprocess.CREATE_NO_WINDOW)
+            merge_duration = self._total_work_ms - self._done_work_ms
+            returncode, stderr = self._run_ffmpeg(cmd, merge_duration, "正在合并视频片段")
             
-            if result.returncode == 0:
+            if returncode == 0:
                 self.logger.info("视频合并成功")
                 self.progress_updated.emit(100, "视频处理完成")
                 return True
             else:
-                self.logger.error(f"视频合并失败: {result.stderr}")
+                self.logger.error(f"视频合并失败: {stderr}")
                 return False
         except Exception as e:
             self.logger.error(f"视频合并异常: {str(e)}")
-            return False
\ No newline at end of file
+            return False
+    
+    def _write_retimed_subtitles(self, subtitles, keep_segments, output_path):
+        """将字幕按保留片段重新计时，写入与输出同名的SRT文件
+        
+        Returns:
+            SRT文件路径，没有字幕时返回None
+        """
+        if not subtitles:
+            return None
+        
+        retimed = retime_subtitles(subtitles, keep_segments)
+        subtitle_path = os.path.splitext(output_path)[0] + ".srt"
+        write_srt(retimed, subtitle_path)
+        self.logger.info(f"已输出重新计时的字幕 {len(retimed)} 条: {subtitle_path}")
+        return subtitle_path
+    
+    def _subtitle_codec(self, output_path):
+        """根据输出容器选择软字幕编码，不支持软字幕的容器返回None"""
+        ext = os.path.splitext(output_path)[1].lower()
+        if ext in (".mp4", ".mov", ".m4v"):
+            return "mov_text"
+        if ext == ".mkv":
+            return "srt"
+        self.logger.warning(f"输出格式 {ext} 不支持封装软字幕，只输出SRT文件")
+        return None
+    
+    def _start_progress(self, total_work_ms, output_ms):
+        """开始统计进度
+        
+        Args:
+            total_work_ms: 本次处理所有FFmpeg阶段需要处理的媒体总时长（毫秒）
+            output_ms: 输出文件的时长（毫秒）
+        """
+        self._total_work_ms = max(total_work_ms, 1)
+        self._output_ms = output_ms
+        self._done_work_ms = 0
+        self._start_time = time.monotonic()
+    
+    def _run_ffmpeg(self, cmd, stage_duration_ms, message):
+        """执行一个FFmpeg阶段，并根据实际输出时长上报进度
+        
+        Args:
+            cmd: FFmpeg命令列表
+            stage_duration_ms: 该阶段需要处理的媒体时长（毫秒）
+            message: 进度描述
+            
+        Returns:
+            (返回码, stderr输出)
+        """
+        self._report_progress(self._done_work_ms, message, {})
+        
+        def on_progress(snapshot):
+            stage_done = min(snapshot['out_time_ms'], stage_duration_ms)
+            self._report_progress(self._done_work_ms + stage_done, message, snapshot)
+        
+        returncode, stderr = run_ffmpeg(cmd, on_progress)
+        if returncode == 0:
+            self._done_work_ms += stage_duration_ms
+        return returncode, stderr
+    
+    def _report_progress(self, done_ms, message, snapshot):
+        """根据已处理的媒体时长计算百分比、吞吐量和剩余时间并发送信号"""
+        fraction = min(done_ms / self._total_work_ms, 1.0) if self._total_work_ms else 0.0
+        elapsed = time.monotonic() - self._start_time
+        
+        # 吞吐量：每秒处理的媒体秒数（实时倍数）
+        throughput = (done_ms / 1000.0) / elapsed if elapsed > 0 else 0.0
+        speed = snapshot.get('speed') or throughput
+        eta = elapsed * (1 - fraction) / fraction if fraction > 0 else -1
+        
+        stats = {
+            'percent': int(fraction * 100),
+            'speed': speed,
+            'throughput': throughput,
+            'eta': eta,
+            'elapsed': elapsed,
+            'total_size': snapshot.get('total_size', 0),
+            'output_ms': self._output_ms,
+            'stage': message
+        }
+        self.progress_stats.emit(stats)
+        
+        detail = f"{message} ({speed:.1f}x"
+        if eta >= 0:
+            detail += f", 剩余 {self._format_eta(eta)}"
+        detail += ")"
+        # 100% 留给处理完成时发送
+        self.progress_updated.emit(min(stats['percent'], 99), detail)
+    
+    def _format_eta(self, seconds):
+        """格式化剩余时间（秒转为 分:秒 或 时:分:秒）"""
+        seconds = int(seconds)
+        minutes, seconds = divmod(seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+        if hours > 0:
+            return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+        return f"{minutes:02d}:{seconds:02d}"
@@ -0,0 +1,239 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import struct
+import numpy as np
+from PyQt6.QtCore import QThread, pyqtSignal
+from app.config import Config
+from app.utils.logger import setup_logger
+from app.utils.ffmpeg_progress import open_ffmpeg
+from app.utils.media_cache import media_fingerprint, get_cache_dir
+
+logger = setup_logger(__name__)
+
+# 缓存文件头：魔数、版本、采样率、最底层每个峰值的采样数、层间倍数、层数
+HEADER = struct.Struct('<4sHIIHH')
+MAGIC = b'SWPK'
+VERSION = 1
+
+
+class WaveformPeaks:
+    """多分辨率波形峰值金字塔
+
+    第0层每 base_spp 个采样保存一对 (min, max)，之后每层把上一层 factor 个峰值合并为一个。
+    查询时选择不比像素更细的最粗一层，只处理可见范围内的峰值。
+    """
+
+    def __init__(self, sample_rate, base_spp, factor, levels):
+        """初始化
+
+        Args:
+            sample_rate: 解码采样率
+            base_spp: 第0层每个峰值对应的采样数
+            factor: 相邻两层的倍数
+            levels: [(mins, maxs), ...]，int16数组，从细到粗
+        """
+        self.sample_rate = sample_rate
+        self.base_spp = base_spp
+        self.factor = factor
+        self.levels = levels
+
+    @property
+    def duration_ms(self):
+        """波形覆盖的时长（毫秒）"""
+        if not self.levels:
+            return 0
+        return len(self.levels[0][0]) * self.base_spp * 1000 // self.sample_rate
+
+    def samples_per_peak(self, level):
+        """指定层每个峰值对应的采样数"""
+        return self.base_spp * self.factor ** level
+
+    @classmethod
+    def build(cls, mins, maxs, sample_rate, base_spp, factor):
+        """由第0层峰值逐层合并生成金字塔"""
+        levels = [(mins, maxs)]
+        while len(mins) > factor:
+            usable = len(mins) - len(mins) % factor
+            # 末尾不足 factor 个的峰值单独合并，保证覆盖完整时长
+            next_mins = mins[:usable].reshape(-1, factor).min(axis=1)
+            next_maxs = maxs[:usable].reshape(-1, factor).max(axis=1)
+            if usable < len(mins):
+                next_mins = np.append(next_mins, mins[usable:].min())
+                next_maxs = np.append(next_maxs, maxs[usable:].max())
+            mins, maxs = next_mins.astype(np.int16), next_maxs.astype(np.int16)
+            levels.append((mins, maxs))
+        return cls(sample_rate, base_spp, factor, levels)
+
+    def query(self, start_ms, end_ms, pixels):
+        """获取可见范围内每个像素列的峰值
+
+        Args:
+            start_ms: 可见范围开始（毫秒）
+            end_ms: 可见范围结束（毫秒）
+            pixels: 像素列数
+
+        Returns:
+            (mins, maxs)，长度为 pixels 的 float32 数组，取值范围 [-1, 1]；超出音频范围的列为0
+        """
+        pixels = int(pixels)
+        result_mins = np.zeros(pixels, dtype=np.float32)
+        result_maxs = np.zeros(pixels, dtype=np.float32)
+        if pixels <= 0 or end_ms <= start_ms or not self.levels:
+            return result_mins, result_maxs
+
+        # 每个像素对应的采样数，选择峰值不比像素更细的最粗一层
+        samples_per_pixel = (end_ms - start_ms) * self.sample_rate / 1000.0 / pixels
+        level = 0
+        while (level + 1 < len(self.levels) and
+               self.samples_per_peak(level + 1) <= samples_per_pixel):
+            level += 1
+        mins, maxs = self.levels[level]
+        spp = self.samples_per_peak(level)
+
+        # 每个像素列覆盖的峰值下标范围 [first, last)
+        start_sample = start_ms * self.sample_rate / 1000.0
+        bounds = np.floor((start_sample + np.arange(pixels + 1) * samples_per_pixel) / spp).astype(np.int64)
+        first = bounds[:-1]
+        last = np.maximum(bounds[1:], first + 1)
+
+        valid = (first >= 0) & (first < len(mins))
+        if not valid.any():
+            return result_mins, result_maxs
+
+        lo = int(first[valid][0])
+        hi = int(min(last[valid][-1], len(mins)))
+        window_mins = mins[lo:hi]
+        window_maxs = maxs[lo:hi]
+        offsets = first[valid] - lo
+        result_mins[valid] = np.minimum.reduceat(window_mins, offsets) / 32768.0
+        result_maxs[valid] = np.maximum.reduceat(window_maxs, offsets) / 32768.0
+        return result_mins, result_maxs
+
+    def save(self, path):
+        """保存为紧凑的二进制缓存文件"""
+        temp_path = path + ".part"
+        with open(temp_path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.sample_rate, self.base_spp,
+                                self.factor, len(self.levels)))
+            f.write(struct.pack(f'<{len(self.levels)}Q', *[len(mins) for mins, _ in self.levels]))
+            for mins, maxs in self.levels:
+                # 每层交错保存 min/max
+                pairs = np.empty(len(mins) * 2, dtype='<i2')
+                pairs[0::2] = mins
+                pairs[1::2] = maxs
+                pairs.tofile(f)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """从缓存文件加载（内存映射，不复制数据）"""
+        with open(path, 'rb') as f:
+            magic, version, sample_rate, base_spp, factor, level_count = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"波形缓存格式不匹配: {path}")
+            lengths = struct.unpack(f'<{level_count}Q', f.read(8 * level_count))
+
+        data_offset = HEADER.size + 8 * level_count
+        data = np.memmap(path, dtype='<i2', mode='r', offset=data_offset)
+
+        levels = []
+        offset = 0
+        for length in lengths:
+            pairs = data[offset:offset + length * 2]
+            levels.append((pairs[0::2], pairs[1::2]))
+            offset += length * 2
+        return cls(sample_rate, base_spp, factor, levels)
+
+
+def get_waveform_cache_path(media_path):
+    """波形缓存文件路径"""
+    return str(get_cache_dir('waveform') / f"{media_fingerprint(media_path)}.peaks")
+
+
+def compute_waveform(media_path, on_progress=None):
+    """一次流式解码音频并计算波形金字塔
+
+    Args:
+        media_path: 媒体路径
+        on_progress: 进度回调，参数为已处理的媒体时长（毫秒）
+
+    Returns:
+        WaveformPeaks
+    """
+    sample_rate = Config.WAVEFORM['sample_rate']
+    base_spp = Config.WAVEFORM['samples_per_peak']
+    factor = Config.WAVEFORM['level_factor']
+
+    cmd = ["ffmpeg", "-v", "error", "-i", media_path, "-vn",
+           "-ac", "1", "-ar", str(sample_rate), "-f", "s16le", "pipe:1"]
+    process, get_stderr = open_ffmpeg(cmd, text=False)
+
+    # 每次读取整数个峰值的采样，只保留第0层峰值，不保留原始采样
+    chunk_bytes = base_spp * 2 * 1024
+    mins_chunks, maxs_chunks = [], []
+    pending = b''
+    processed = 0
+    for data in iter(lambda: process.stdout.read(chunk_bytes), b''):
+        data = pending + data
+        usable = len(data) - len(data) % (base_spp * 2)
+        pending = data[usable:]
+        if usable:
+            samples = np.frombuffer(data[:usable], dtype='<i2').reshape(-1, base_spp)
+            mins_chunks.append(samples.min(axis=1))
+            maxs_chunks.append(samples.max(axis=1))
+            processed += usable // 2
+            if on_progress:
+                on_progress(processed * 1000 // sample_rate)
+
+    if len(pending) >= 2:
+        samples = np.frombuffer(pending[:len(pending) - len(pending) % 2], dtype='<i2')
+        mins_chunks.append(samples.min(keepdims=True))
+        maxs_chunks.append(samples.max(keepdims=True))
+
+    if process.wait() != 0:
+        raise RuntimeError(f"解码音频失败: {get_stderr()}")
+
+    mins = np.concatenate(mins_chunks).astype(np.int16) if mins_chunks else np.zeros(0, dtype=np.int16)
+    maxs = np.concatenate(maxs_chunks).astype(np.int16) if maxs_chunks else np.zeros(0, dtype=np.int16)
+    return WaveformPeaks.build(mins, maxs, sample_rate, base_spp, factor)
+
+
+def load_waveform(media_path, on_progress=None):
+    """读取波形缓存，没有缓存时计算并写入缓存"""
+    cache_path = get_waveform_cache_path(media_path)
+    if os.path.exists(cache_path):
+        try:
+            return WaveformPeaks.load(cache_path)
+        except (ValueError, OSError) as e:
+            logger.warning(f"波形缓存无效，重新计算: {str(e)}")
+
+    peaks = compute_waveform(media_path, on_progress)
+    peaks.save(cache_path)
+    logger.info(f"波形缓存已保存: {cache_path}")
+    return peaks
+
+
+class WaveformLoadThread(QThread):
+    """后台加载或计算波形"""
+
+    # 定义信号
+    progress_signal = pyqtSignal(str, int)  # 媒体路径, 已处理时长（毫秒）
+    finished_signal = pyqtSignal(str, object)  # 媒体路径, WaveformPeaks
+    error_signal = pyqtSignal(str, str)  # 媒体路径, 错误信息
+
+    def __init__(self, media_path):
+        """初始化波形加载线程"""
+        super().__init__()
+        self.media_path = media_path
+
+    def run(self):
+        """加载波形"""
+        try:
+            peaks = load_waveform(self.media_path,
+                                  lambda ms: self.progress_signal.emit(self.media_path, ms))
+            self.finished_signal.emit(self.media_path, peaks)
+        except Exception as e:
+            logger.error(f"计算波形失败: {str(e)}")
+            self.error_signal.emit(self.media_path, str(e))
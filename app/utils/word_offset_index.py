@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+
+
+class WordOffsetIndex:
+    """逐字稿字符位置索引
+
+    offsets[i] 为第 i 个字在编辑器文本中的起始字符位置（前缀和），offsets[-1] 为文本总长度。
+    字符位置与字下标之间的换算都通过二分查找完成。
+    """
+
+    def __init__(self, words):
+        """初始化
+
+        Args:
+            words: 逐字时间戳列表（字典列表，包含 word）
+        """
+        self.words = words
+        self.offsets = [0] + list(accumulate(len(word['word']) for word in words or []))
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @property
+    def text_length(self):
+        """文本总长度"""
+        return self.offsets[-1]
+
+    def word_start(self, index):
+        """第 index 个字的起始字符位置"""
+        return self.offsets[index]
+
+    def word_end(self, index):
+        """第 index 个字的结束字符位置（不含）"""
+        return self.offsets[index + 1]
+
+    def word_at(self, char_pos):
+        """包含指定字符位置的字下标，超出文本范围时返回-1"""
+        index = bisect_right(self.offsets, char_pos) - 1
+        if 0 <= index < len(self) and char_pos < self.offsets[index + 1]:
+            return index
+        return -1
+
+    def words_in_range(self, start, end):
+        """与字符范围 [start, end) 有重叠的字下标范围"""
+        first = max(0, bisect_right(self.offsets, start) - 1)
+        last = min(len(self), bisect_left(self.offsets, end))
+        return range(first, max(first, last))
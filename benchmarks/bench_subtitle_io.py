@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""字幕和逐字稿读写基准测试
+
+对比原来的写法（逐行写SRT、indent=2 的逐字稿JSON、pysrt解析）与 app.utils.subtitle_io。
+用法: python benchmarks/bench_subtitle_io.py [-n 字幕条数] [-w 逐字数] [-r 重复次数]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.subtitle_io import write_srt, read_srt, write_words, read_words, ms_to_srt_time
+
+
+def make_data(subtitle_count, word_count):
+    """生成测试用的字幕和逐字时间戳"""
+    rng = random.Random(0)
+    chars = "的一是在不了有和人这中大为上个国我以要他时来用们生到作地于出就分对成会可主发年动同工也能下过子说产种面而方后多定行学法所民得经"
+    words = []
+    position = 0
+    for _ in range(word_count):
+        duration = rng.randint(80, 400)
+        words.append({'word': rng.choice(chars), 'start': position, 'end': position + duration})
+        position += duration + rng.randint(0, 50)
+    subtitles = []
+    per_subtitle = max(1, word_count // max(1, subtitle_count))
+    for i in range(0, word_count, per_subtitle):
+        group = words[i:i + per_subtitle]
+        subtitles.append({
+            'start_time': group[0]['start'],
+            'end_time': group[-1]['end'],
+            'text': ''.join(word['word'] for word in group)
+        })
+    return subtitles, words
+
+
+def old_write(subtitles, words, srt_path, words_path):
+    """原来的写法：ASR服务和主窗口各写一次SRT（每条字幕逐次 write），逐字稿 indent=2"""
+    for _ in range(2):
+        with open(srt_path, 'w', encoding='utf-8') as f:
+            for i, subtitle in enumerate(subtitles, 1):
+                f.write(f"{i}\n{ms_to_srt_time(subtitle['start_time'])} --> {ms_to_srt_time(subtitle['end_time'])}\n{subtitle['text']}\n\n")
+    with open(words_path, 'w', encoding='utf-8') as f:
+        json.dump(words, f, ensure_ascii=False, indent=2)
+
+
+def old_read_srt(srt_path):
+    """原来的读法：pysrt 解析"""
+    import pysrt
+    subtitles = []
+    for sub in pysrt.open(srt_path, encoding='utf-8'):
+        start_time = (sub.start.hours * 3600 + sub.start.minutes * 60 + sub.start.seconds) * 1000 + sub.start.milliseconds
+        end_time = (sub.end.hours * 3600 + sub.end.minutes * 60 + sub.end.seconds) * 1000 + sub.end.milliseconds
+        subtitles.append({'text': sub.text, 'start_time': start_time, 'end_time': end_time})
+    return subtitles
+
+
+def new_write(subtitles, words, srt_path, words_path):
+    write_srt(subtitles, srt_path)
+    write_words(words, words_path)
+
+
+def best_of(repeat, func, *args):
+    """重复执行取最短耗时（秒）"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="字幕和逐字稿读写基准测试")
+    parser.add_argument("-n", "--subtitles", type=int, default=20000, help="字幕条数，默认 20000")
+    parser.add_argument("-w", "--words", type=int, default=500000, help="逐字数，默认 500000")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="重复次数（取最短耗时），默认 3")
+    args = parser.parse_args(argv)
+
+    subtitles, words = make_data(args.subtitles, args.words)
+    print(f"字幕 {len(subtitles)} 条，逐字 {len(words)} 个")
+
+    try:
+        import pysrt  # noqa: F401
+        has_pysrt = True
+    except ImportError:
+        has_pysrt = False
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        old_srt, old_words = os.path.join(temp_dir, 'old.srt'), os.path.join(temp_dir, 'old.words.json')
+        new_srt, new_words = os.path.join(temp_dir, 'new.srt'), os.path.join(temp_dir, 'new.words.json')
+
+        old_time = best_of(args.repeat, old_write, subtitles, words, old_srt, old_words)
+        new_time = best_of(args.repeat, new_write, subtitles, words, new_srt, new_words)
+        old_size = os.path.getsize(old_srt) + os.path.getsize(old_words)
+        new_size = os.path.getsize(new_srt) + os.path.getsize(new_words)
+        print(f"写入: 原 {old_time * 1000:.0f} ms / {old_size / 1e6:.1f} MB，"
+              f"新 {new_time * 1000:.0f} ms / {new_size / 1e6:.1f} MB，加速 {old_time / new_time:.1f}x")
+
+        # 新的解析结果必须与写入的数据一致
+        assert read_srt(new_srt) == subtitles and read_words(new_words) == words, "读写结果不一致"
+
+        new_time = best_of(args.repeat, read_srt, new_srt)
+        if has_pysrt:
+            old_time = best_of(args.repeat, old_read_srt, old_srt)
+            print(f"解析SRT: pysrt {old_time * 1000:.0f} ms，新 {new_time * 1000:.0f} ms，加速 {old_time / new_time:.1f}x")
+        else:
+            print(f"解析SRT: 新 {new_time * 1000:.0f} ms（未安装 pysrt，跳过对比）")
+
+        old_time = best_of(args.repeat, read_words, old_words)
+        new_time = best_of(args.repeat, read_words, new_words)
+        print(f"读取逐字稿: 原 {old_time * 1000:.0f} ms，新 {new_time * 1000:.0f} ms，加速 {old_time / new_time:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
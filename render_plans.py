@@ -0,0 +1,10 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import sys
+
+from app.utils.plan_renderer import main
+
+
+if __name__ == "__main__":
+    sys.exit(main())